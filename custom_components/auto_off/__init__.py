@@ -1,6 +1,7 @@
 """Auto Off integration for Home Assistant."""
 
 import logging
+from functools import partial
 from typing import Any
 
 import voluptuous as vol
@@ -14,19 +15,26 @@ from pydantic import ValidationError
 from .auto_off import GroupConfig
 from .const import (
     CONF_DELAY,
+    CONF_DELETE,
+    CONF_DOMAIN_TURN_OFF_RATES,
     CONF_GROUP_NAME,
     CONF_GROUPS,
+    CONF_REPLACE,
     CONF_SENSOR_TEMPLATES,
     CONF_SENSORS,
     CONF_TARGETS,
+    CONF_TURN_OFF_RATE,
+    DEFAULT_TURN_OFF_RATE,
     DOMAIN,
     PLATFORMS,
+    SERVICE_APPLY_GROUPS,
     SERVICE_DELETE_GROUP,
     SERVICE_DUMP_GROUP,
     SERVICE_SET_GROUP,
     VERSION,
 )
 from .integration_manager import IntegrationManager
+from .storage import DeadlineStore, GroupStore, async_load_group_store
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -52,10 +60,111 @@ SERVICE_DUMP_GROUP_SCHEMA = vol.Schema(
     }
 )
 
+SERVICE_APPLY_GROUPS_SCHEMA = vol.Schema(
+    {
+        vol.Optional(CONF_GROUPS, default=list): vol.All(cv.ensure_list, [SERVICE_SET_GROUP_SCHEMA]),
+        vol.Optional(CONF_DELETE, default=list): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(CONF_REPLACE, default=False): cv.boolean,
+    }
+)
+
+
+def _group_config_dict(data: dict[str, Any]) -> dict[str, Any]:
+    """Build the stored group dict from ``set_group``-shaped service data."""
+    return {
+        CONF_TARGETS: list(data[CONF_TARGETS]),
+        CONF_SENSORS: list(data.get(CONF_SENSORS, [])),
+        CONF_SENSOR_TEMPLATES: list(data.get(CONF_SENSOR_TEMPLATES, [])),
+        CONF_DELAY: data.get(CONF_DELAY, 0),
+    }
+
+
+def _validate_apply_groups(data: dict[str, Any]) -> tuple[dict[str, dict], dict[str, GroupConfig], set[str]]:
+    """Validate an ``apply_groups`` call; return desired, validated and deleted groups.
+
+    Raises ServiceValidationError listing every problem, so a request
+    with any invalid group applies nothing.
+    """
+    desired: dict[str, dict] = {}
+    validated: dict[str, GroupConfig] = {}
+    errors: list[str] = []
+    for item in data.get(CONF_GROUPS, []):
+        group_name = item[CONF_GROUP_NAME]
+        if group_name in desired:
+            errors.append(f"'{group_name}' is listed more than once")
+            continue
+        config_dict = _group_config_dict(item)
+        try:
+            validated[group_name] = GroupConfig.model_validate(config_dict)
+        except ValidationError as err:
+            errors.append(f"'{group_name}': {'; '.join(e['msg'] for e in err.errors())}")
+        desired[group_name] = config_dict
+
+    to_delete = set(data.get(CONF_DELETE, []))
+    for group_name in sorted(to_delete & desired.keys()):
+        errors.append(f"'{group_name}' is both set and deleted")
+
+    if errors:
+        raise ServiceValidationError(
+            f"Invalid apply_groups request: {', '.join(errors)}",
+            translation_domain=DOMAIN,
+            translation_key="apply_groups_invalid",
+            translation_placeholders={"errors": ", ".join(errors)},
+        )
+    return desired, validated, to_delete
+
+
+async def _async_handle_apply_groups(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Create, update and delete many groups in one commit.
+
+    Every group is validated up front; if any is invalid nothing is
+    applied. Only groups whose stored config actually changed are
+    rebuilt, and the group store writes them in one delayed save. With
+    ``replace: true`` every existing group missing from ``groups`` is
+    deleted as well.
+    """
+    data = call.data
+    desired, validated, to_delete = _validate_apply_groups(data)
+
+    manager = hass.data.get(DOMAIN)
+    if manager is None:
+        _LOGGER.error("Integration manager not found")
+        return {}
+
+    current_groups = manager.groups_data
+    if data.get(CONF_REPLACE, False):
+        to_delete |= current_groups.keys() - desired.keys()
+    deleted = sorted(name for name in to_delete if name in current_groups)
+    created = [name for name in desired if name not in current_groups]
+    updated = [name for name in desired if name in current_groups and current_groups[name] != desired[name]]
+    summary: dict[str, Any] = {
+        "created": created,
+        "updated": updated,
+        "deleted": deleted,
+        "unchanged": len(desired) - len(created) - len(updated),
+        "failed": [],
+    }
+    if not (created or updated or deleted):
+        return summary
+
+    changed = {name: desired[name] for name in (*created, *updated)}
+    summary["failed"] = await manager.apply_groups(changed, deleted, configs=validated)
+    _LOGGER.info(
+        "apply_groups: %d created, %d updated, %d deleted, %d unchanged",
+        len(created),
+        len(updated),
+        len(deleted),
+        summary["unchanged"],
+    )
+    return summary
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Auto Off from a config entry."""
-    manager = IntegrationManager(hass, entry)
+    store = await async_load_group_store(hass, entry)
+    deadline_store = DeadlineStore(hass)
+    await deadline_store.async_load()
+    manager = IntegrationManager(hass, entry, store, deadline_store)
     hass.data[DOMAIN] = manager
     await manager.async_initialize()
 
@@ -84,6 +193,7 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.services.async_remove(DOMAIN, SERVICE_SET_GROUP)
         hass.services.async_remove(DOMAIN, SERVICE_DELETE_GROUP)
         hass.services.async_remove(DOMAIN, SERVICE_DUMP_GROUP)
+        hass.services.async_remove(DOMAIN, SERVICE_APPLY_GROUPS)
 
         manager = hass.data.pop(DOMAIN, None)
         if manager is not None:
@@ -92,6 +202,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the group and deadline stores when the config entry is removed."""
+    await GroupStore(hass).async_remove()
+    await DeadlineStore(hass).async_remove()
+
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle config entry migration for auto_off.
 
@@ -102,8 +218,26 @@ async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     back to module-level constants (``ENSURE_WINDOW_SEC`` /
     ``ENSURE_INTERVAL_SEC``). GroupConfig now forbids extra fields,
     so old entries must shed them before they reach validation.
+    v4 → v5: move ``entry.data[CONF_GROUPS]`` into the dedicated
+    ``auto_off.groups`` store (see storage.py) so group edits stop
+    rewriting ``core.config_entries``.
+    v5 → v6: add the turn-off rate limit options (``turn_off_rate``,
+    ``domain_turn_off_rates``) with their unlimited defaults.
     """
-    if entry.version >= 4:
+    if entry.version >= 6:
+        return True
+
+    if entry.version == 5:
+        _LOGGER.info("Migrating auto_off config entry from version 5 to 6: adding turn-off rate limit options")
+        new_data = dict(entry.data)
+        new_data.setdefault(CONF_TURN_OFF_RATE, DEFAULT_TURN_OFF_RATE)
+        new_data.setdefault(CONF_DOMAIN_TURN_OFF_RATES, {})
+        hass.config_entries.async_update_entry(entry, data=new_data, version=6)
+        return True
+
+    if entry.version == 4:
+        _LOGGER.info("Migrating auto_off config entry from version 4 to 5: moving groups to dedicated storage")
+        await async_load_group_store(hass, entry, version=5)
         return True
 
     if entry.version == 3:
@@ -141,54 +275,36 @@ async def _async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> N
     async def handle_set_group(call: ServiceCall) -> None:
         """Create or update an auto-off group from structured service data."""
         group_name = call.data[CONF_GROUP_NAME]
-        config_dict = {
-            CONF_TARGETS: list(call.data[CONF_TARGETS]),
-            CONF_SENSORS: list(call.data.get(CONF_SENSORS, [])),
-            CONF_SENSOR_TEMPLATES: list(call.data.get(CONF_SENSOR_TEMPLATES, [])),
-            CONF_DELAY: call.data.get(CONF_DELAY, 0),
-        }
+        config_dict = _group_config_dict(call.data)
 
         try:
-            GroupConfig.model_validate(config_dict)
+            group_config = GroupConfig.model_validate(config_dict)
         except ValidationError as err:
             _LOGGER.error("Invalid config for group '%s': %s", group_name, err.errors())
             return
 
-        current_groups = dict(entry.data.get(CONF_GROUPS, {}))
-        is_new_group = group_name not in current_groups
-        current_groups[group_name] = config_dict
-
-        new_data = dict(entry.data)
-        new_data[CONF_GROUPS] = current_groups
-        hass.config_entries.async_update_entry(entry, data=new_data)
-
         manager = hass.data.get(DOMAIN)
         if manager is None:
             _LOGGER.error("Integration manager not found")
             return
 
-        await manager.set_group(group_name, config_dict, is_new_group)
+        is_new_group = group_name not in manager.groups_data
+        await manager.set_group(group_name, config_dict, is_new_group, group_config=group_config)
         _LOGGER.info("Group '%s' %s", group_name, "created" if is_new_group else "updated")
 
     async def handle_delete_group(call: ServiceCall) -> None:
         """Delete an auto-off group."""
         group_name = call.data[CONF_GROUP_NAME]
 
-        current_groups = dict(entry.data.get(CONF_GROUPS, {}))
-        if group_name not in current_groups:
-            _LOGGER.warning("Group '%s' does not exist", group_name)
-            return
-
-        del current_groups[group_name]
-        new_data = dict(entry.data)
-        new_data[CONF_GROUPS] = current_groups
-        hass.config_entries.async_update_entry(entry, data=new_data)
-
         manager = hass.data.get(DOMAIN)
         if manager is None:
             _LOGGER.error("Integration manager not found")
             return
 
+        if group_name not in manager.groups_data:
+            _LOGGER.warning("Group '%s' does not exist", group_name)
+            return
+
         await manager.delete_group(group_name)
         _LOGGER.info("Group '%s' deleted", group_name)
 
@@ -215,7 +331,8 @@ async def _async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> N
         can edit any single field without having to remember the rest.
         """
         group_name = call.data[CONF_GROUP_NAME]
-        groups = entry.data.get(CONF_GROUPS, {})
+        manager = hass.data.get(DOMAIN)
+        groups = manager.groups_data if manager is not None else {}
 
         if group_name not in groups:
             raise ServiceValidationError(
@@ -252,6 +369,13 @@ async def _async_register_services(hass: HomeAssistant, entry: ConfigEntry) -> N
         schema=SERVICE_DUMP_GROUP_SCHEMA,
         supports_response=SupportsResponse.ONLY,
     )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_GROUPS,
+        partial(_async_handle_apply_groups, hass),
+        schema=SERVICE_APPLY_GROUPS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
 
 
 async def async_remove_config_entry_device(
@@ -270,26 +394,14 @@ async def async_remove_config_entry_device(
         return False
 
     try:
-        # Get current groups from config entry
-        current_groups = dict(config_entry.data.get(CONF_GROUPS, {}))
-
-        if group_name not in current_groups:
+        manager = hass.data.get(DOMAIN)
+        if manager is None or group_name not in manager.groups_data:
             _LOGGER.warning(f"Group '{group_name}' not found in config")
             return True  # Device can be removed anyway
 
-        # Remove group from config
-        del current_groups[group_name]
-
-        # Update config entry
-        new_data = dict(config_entry.data)
-        new_data[CONF_GROUPS] = current_groups
-        hass.config_entries.async_update_entry(config_entry, data=new_data)
-
-        # Get manager and remove group
-        manager = hass.data.get(DOMAIN)
-        if manager:
-            await manager.delete_group(group_name)
-            _LOGGER.info(f"Group '{group_name}' deleted via UI")
+        # Removes the group from the group store as well
+        await manager.delete_group(group_name)
+        _LOGGER.info(f"Group '{group_name}' deleted via UI")
 
         return True
 
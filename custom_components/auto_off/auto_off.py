@@ -1,17 +1,30 @@
 import asyncio
 import datetime
+import heapq
+import itertools
 import logging
+import time
+import zlib
 from collections.abc import Callable
 from typing import Any
 
 from homeassistant.core import CoreState, HomeAssistant, State, valid_entity_id
+from homeassistant.exceptions import TemplateError
 from homeassistant.helpers.event import (
+    TrackTemplate,
+    TrackTemplateResult,
     async_track_state_change_event,
-    async_track_template,
+    async_track_template_result,
 )
 from homeassistant.helpers.template import Template
 from pydantic import BaseModel, field_validator, model_validator
 
+from .dispatcher import ROLE_SENSOR, ROLE_TARGET, StateChangeDispatcher
+from .expansion import ExpansionGraph
+from .latency import TurnOffLatency
+from .rate_limit import TurnOffRateLimiter
+from .turn_off_batch import TurnOffAggregator, async_turn_off_entities
+
 # Local import to avoid a top-level cycle through __init__ → integration_manager.
 # group_entities only imports from .const, so this is safe.
 from .group_entities import expand_group_targets  # noqa: E402
@@ -25,6 +38,38 @@ _LOGGER = logging.getLogger(__name__)
 ENSURE_WINDOW_SEC = 60
 ENSURE_INTERVAL_SEC = 10
 
+# Upper bound on turn_off service calls one group has in flight at a
+# time, for the initial dispatch and for every ensure-off retry pass.
+TURN_OFF_CONCURRENCY = 8
+
+# Manager-wide turn_off rate (commands per second across every group,
+# None for unlimited) and the burst served without waiting. Off by
+# default; IntegrationManager passes the config entry's turn_off_rate /
+# domain_turn_off_rates options (set in the options flow) instead.
+TURN_OFF_RATE_PER_SEC: float | None = None
+TURN_OFF_BURST = 20
+
+# Turn-off intents of every group arriving within this window are sent
+# as one <domain>.turn_off per domain with de-duplicated entity ids.
+# None disables cross-group batching; a group still turns its own
+# fallback targets off with one call per domain.
+TURN_OFF_BATCH_WINDOW_SEC: float | None = 0.1
+
+# Default coalescing window for group evaluations. Member events only
+# mark their group dirty; one drain per window evaluates every dirty
+# group once, so a 30-bulb turn-off burst costs one evaluation instead
+# of 30 queued on the group lock. 0 drains on the next loop iteration;
+# None disables coalescing (evaluate inline per event).
+COALESCE_WINDOW_SEC = 0.05
+
+# Periodic sweep fan-out: at most SWEEP_CONCURRENCY groups are evaluated
+# at once, and a group that takes longer than SWEEP_GROUP_TIMEOUT_SEC
+# (e.g. blocked on its lock) is abandoned for this tick so it cannot
+# hold the worker. Its generation stays unswept and it is retried on
+# the next round.
+SWEEP_CONCURRENCY = 8
+SWEEP_GROUP_TIMEOUT_SEC = 10
+
 
 def _missing_entity_log_level(hass: HomeAssistant) -> int:
     """Choose log level for "entity not in state machine" events.
@@ -39,6 +84,48 @@ def _missing_entity_log_level(hass: HomeAssistant) -> int:
     return logging.WARNING
 
 
+def sweep_slot(group_id: str, shards: int) -> int:
+    """Stable sweep slot of a group among ``shards`` (see periodic_worker)."""
+    if shards <= 1:
+        return 0
+    return zlib.crc32(group_id.encode()) % shards
+
+
+def _compile_template(hass: HomeAssistant, raw: Any) -> Template:
+    """Build a Template and compile it up front.
+
+    Compilation errors are logged, not raised: the Template object is
+    still returned so rendering reports the error the same way it did
+    before templates were cached.
+    """
+    template = Template(str(raw), hass)
+    try:
+        template.ensure_valid()
+    except TemplateError as err:
+        _LOGGER.error("Template '%s' is invalid: %s", raw, err)
+    return template
+
+
+def _track_entity(
+    hass: HomeAssistant,
+    dispatcher: StateChangeDispatcher | None,
+    group_id: str | None,
+    role: str,
+    entity_id: str,
+    action,
+):
+    """Subscribe ``action`` to state changes of ``entity_id``.
+
+    Goes through the manager-wide dispatcher when one is available so
+    every tracked entity shares a single bus listener. Members built
+    outside a manager (unit tests, ad-hoc groups) fall back to their own
+    ``async_track_state_change_event`` subscription.
+    """
+    if dispatcher is not None:
+        return dispatcher.async_subscribe(entity_id, group_id or "", role, action)
+    return async_track_state_change_event(hass, [entity_id], action)
+
+
 class GroupConfig(BaseModel):
     """Configuration for a single auto-off group.
 
@@ -56,9 +143,11 @@ class GroupConfig(BaseModel):
         """Reject unknown fields so a stale ``ensure_window`` /
         ``ensure_interval`` in an old service payload surfaces as a
         validation error rather than silently being stored on the
-        config entry."""
+        config entry. Frozen: validated configs are cached and shared
+        (IntegrationManager._group_configs, SensorGroup._config)."""
 
         extra = "forbid"
+        frozen = True
 
     @field_validator("targets")
     @classmethod
@@ -92,11 +181,24 @@ class Sensor:
         raw: str,
         kind: str,
         on_state_change_callback,
+        *,
+        dispatcher: StateChangeDispatcher | None = None,
+        group_id: str | None = None,
+        on_known_state_change: Callable[[Any, bool | None, bool | None], None] | None = None,
+        on_invalid_state: Callable[[], None] | None = None,
     ):
         """Create a sensor wrapper.
 
         kind: one of "entity" or "template". Determines the tracking path
         and how is_on() resolves.
+        dispatcher / group_id: route entity tracking through the
+        manager's shared dispatcher instead of a private subscription.
+        on_known_state_change: synchronous hook fired on every change of
+        ``_last_known_good_state`` (baseline included) so the owning
+        group can keep its on-counter in step without rescanning.
+        on_invalid_state: synchronous hook fired for every ignored
+        ``unknown``/``unavailable`` event, so the owning group knows its
+        next sweep has drift to repair.
         """
         if kind not in ("entity", "template"):
             raise ValueError(f"Unsupported sensor kind: {kind!r}")
@@ -104,8 +206,25 @@ class Sensor:
         self.raw = raw
         self._is_template = kind == "template"
         self._on_change_callback = on_state_change_callback
+        self._dispatcher = dispatcher
+        self._group_id = group_id
+        self._on_known_state_change = on_known_state_change
+        self._on_invalid_state = on_invalid_state
         self._unsub = None
         self._last_known_good_state: bool | None = None
+        # Compiled once per Sensor (i.e. at set_group time) and reused
+        # by the baseline render and the template tracker.
+        self._template: Template | None = None
+        if self._is_template:
+            self._template = _compile_template(self.hass, self.raw)
+
+    def _remember_state(self, value: bool | None) -> bool | None:
+        """Store ``value`` as the last known good state; return the old one."""
+        old = self._last_known_good_state
+        self._last_known_good_state = value
+        if self._on_known_state_change is not None and old != value:
+            self._on_known_state_change(self, old, value)
+        return old
 
     async def start_tracking(self):
         """Subscribes to its own state changes"""
@@ -121,10 +240,14 @@ class Sensor:
         """Subscribes to template changes"""
         try:
             # Initialize last valid state
-            self._last_known_good_state = await self._check_template_state()
+            self._remember_state(await self._check_template_state())
 
-            template = Template(str(self.raw), self.hass)
-            self._unsub = async_track_template(self.hass, template, self._handle_template_change)
+            info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(self._template, None)],
+                self._handle_template_result,
+            )
+            self._unsub = info.async_remove
             _LOGGER.debug(
                 f"Sensor template '{self.raw}' started tracking, initial state: {self._last_known_good_state}"
             )
@@ -154,14 +277,21 @@ class Sensor:
             # the first valid event populate it.
             entity_present = self.hass.states.get(entity_id) is not None
             if entity_present:
-                self._last_known_good_state = await self._check_entity_state()
+                self._remember_state(await self._check_entity_state())
             else:
                 _LOGGER.info(
                     "Sensor entity %s does not exist yet, subscribing for later registration",
                     entity_id,
                 )
 
-            self._unsub = async_track_state_change_event(self.hass, [entity_id], self._handle_entity_change)
+            self._unsub = _track_entity(
+                self.hass,
+                self._dispatcher,
+                self._group_id,
+                ROLE_SENSOR,
+                entity_id,
+                self._handle_entity_change,
+            )
             _LOGGER.debug(f"Sensor entity '{entity_id}' started tracking, initial state: {self._last_known_good_state}")
         except Exception as e:
             _LOGGER.error(f"Failed to track sensor entity '{entity_id}': {e}")
@@ -176,6 +306,8 @@ class Sensor:
             _LOGGER.debug(
                 f"Sensor entity {entity_id} state is invalid ({new_state.state if new_state else 'None'}), ignoring"
             )
+            if self._on_invalid_state is not None:
+                self._on_invalid_state()
             return
 
         # Get current valid sensor state
@@ -195,21 +327,19 @@ class Sensor:
         _LOGGER.info(f"Sensor entity {entity_id} state changed: {old_state_str} -> {current_sensor_state}")
 
         # Update last valid state
-        old_known_state = self._last_known_good_state
-        self._last_known_good_state = current_sensor_state
+        old_known_state = self._remember_state(current_sensor_state)
 
         # Notify group about real change
         if self._on_change_callback:
             await self._on_change_callback(self, old_known_state, current_sensor_state)
 
-    async def _handle_template_change(self, entity_id, from_state, to_state):
-        """Handles template changes"""
-        # Get current valid template state
-        try:
-            current_sensor_state = await self._check_template_state()
-        except Exception as e:
-            _LOGGER.error(f"Failed to check template sensor '{self.raw}' state: {e}")
-            return
+    async def _handle_template_result(self, event, updates: list[TrackTemplateResult]):
+        """Handles template changes.
+
+        The tracker has already rendered the template; its result is
+        used as-is instead of rendering a second time.
+        """
+        current_sensor_state = self._result_to_state(updates[-1].result)
 
         # Compare with last known state
         if self._last_known_good_state == current_sensor_state:
@@ -221,8 +351,7 @@ class Sensor:
         _LOGGER.info(f"Sensor template '{self.raw}' changed: {old_state_str} -> {current_sensor_state}")
 
         # Update last valid state
-        old_known_state = self._last_known_good_state
-        self._last_known_good_state = current_sensor_state
+        old_known_state = self._remember_state(current_sensor_state)
 
         # Notify group about real change
         if self._on_change_callback:
@@ -231,18 +360,30 @@ class Sensor:
     async def is_on(self):
         """Checks if sensor is on"""
         if self._is_template:
+            # While tracked, the template tracker keeps the last rendered
+            # result current; no need to render again.
+            if self._unsub is not None and self._last_known_good_state is not None:
+                return self._last_known_good_state
             return await self._check_template_state()
         else:
             return await self._check_entity_state()
 
+    def _result_to_state(self, rendered: Any) -> bool:
+        """Map a rendered template result to the sensor state."""
+        if isinstance(rendered, TemplateError):
+            _LOGGER.error(f"Template sensor '{self.raw}' failed to render: {rendered}")
+            return False
+        if isinstance(rendered, bool):
+            _LOGGER.debug(f"Template sensor '{self.raw}' rendered to: {rendered}")
+            return rendered
+        return False
+
     async def _check_template_state(self) -> bool:
         """Checks template state"""
+        if self._template is None:
+            return False
         try:
-            tpl = Template(str(self.raw), self.hass)
-            rendered = tpl.async_render()
-            if isinstance(rendered, bool):
-                _LOGGER.debug(f"Template sensor '{self.raw}' rendered to: {rendered}")
-                return rendered
+            return self._result_to_state(self._template.async_render())
         except Exception as e:
             _LOGGER.error(f"Template sensor '{self.raw}' failed to render: {e}")
         return False
@@ -295,13 +436,44 @@ class Target:
         hass: HomeAssistant,
         entity_id: str,
         on_state_change_callback,
+        *,
+        dispatcher: StateChangeDispatcher | None = None,
+        group_id: str | None = None,
+        on_known_state_change: Callable[[Any, bool | None, bool | None], None] | None = None,
+        on_invalid_state: Callable[[], None] | None = None,
+        rate_limiter: TurnOffRateLimiter | None = None,
+        aggregator: TurnOffAggregator | None = None,
     ):
         self.hass = hass
         self.entity_id = entity_id
         self._on_change_callback = on_state_change_callback
+        self._dispatcher = dispatcher
+        self._group_id = group_id
+        self._on_known_state_change = on_known_state_change
+        self._on_invalid_state = on_invalid_state
+        self._rate_limiter = rate_limiter
+        self._aggregator = aggregator
         self._unsub = None
         self._last_known_good_state: bool | None = None
         self._skip = not valid_entity_id(entity_id)
+        # Futures of async_wait_off callers, resolved by the tracker as
+        # soon as an event reports the entity off.
+        self._off_waiters: list[asyncio.Future[None]] = []
+        self.latency = TurnOffLatency(horizon=ENSURE_WINDOW_SEC)
+
+    def _remember_state(self, value: bool | None) -> bool | None:
+        """Store ``value`` as the last known good state; return the old one."""
+        old = self._last_known_good_state
+        self._last_known_good_state = value
+        if value is False:
+            if old:
+                self.latency.confirm(time.monotonic())
+            for waiter in self._off_waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+        if self._on_known_state_change is not None and old != value:
+            self._on_known_state_change(self, old, value)
+        return old
 
     async def start_tracking(self):
         """Subscribe to state changes for this single entity.
@@ -321,14 +493,21 @@ class Target:
         try:
             entity_present = self.hass.states.get(self.entity_id) is not None
             if entity_present:
-                self._last_known_good_state = await self.is_on()
+                self._remember_state(await self.is_on())
             else:
                 _LOGGER.info(
                     "Target %s does not exist yet, subscribing for later registration",
                     self.entity_id,
                 )
 
-            self._unsub = async_track_state_change_event(self.hass, [self.entity_id], self._handle_my_changes)
+            self._unsub = _track_entity(
+                self.hass,
+                self._dispatcher,
+                self._group_id,
+                ROLE_TARGET,
+                self.entity_id,
+                self._handle_my_changes,
+            )
             _LOGGER.debug(
                 "Target '%s' started tracking, initial state: %s",
                 self.entity_id,
@@ -345,6 +524,8 @@ class Target:
                 self.entity_id,
                 new_state.state if new_state else "None",
             )
+            if self._on_invalid_state is not None:
+                self._on_invalid_state()
             return
 
         current = await self.is_on()
@@ -352,9 +533,8 @@ class Target:
             _LOGGER.debug("Target '%s' state unchanged (%s), ignoring", self.entity_id, current)
             return
 
-        old = self._last_known_good_state
+        old = self._remember_state(current)
         _LOGGER.info("Target '%s' state changed: %s -> %s", self.entity_id, old, current)
-        self._last_known_good_state = current
         if self._on_change_callback:
             await self._on_change_callback(self, old, current)
 
@@ -366,23 +546,70 @@ class Target:
             return False
         return state.state not in ("unavailable", "unknown", "off")
 
-    async def turn_off(self):
+    def can_turn_off(self) -> bool:
+        """Whether a turn_off call can address this target right now."""
         if self._skip:
-            return
-        state = self.hass.states.get(self.entity_id)
-        if state is None:
+            return False
+        if self.hass.states.get(self.entity_id) is None:
             _LOGGER.warning(
                 "Target %s not found in state machine, skipping turn_off",
                 self.entity_id,
             )
+            return False
+        return True
+
+    def log_turn_off_result(self, error: Exception | None) -> None:
+        if error is None:
+            _LOGGER.info("Target '%s' turned OFF", self.entity_id)
+        else:
+            _LOGGER.error("Failed to turn off target '%s': %s", self.entity_id, error)
+
+    async def turn_off(self):
+        if not self.can_turn_off():
             return
 
         domain = self.entity_id.split(".")[0]
         try:
-            await self.hass.services.async_call(domain, "turn_off", {"entity_id": self.entity_id}, blocking=True)
-            _LOGGER.info("Target '%s' turned OFF", self.entity_id)
+            if self._aggregator is not None:
+                await self._aggregator.turn_off(self.entity_id, on_sent=self.note_turn_off_requested)
+            else:
+                if self._rate_limiter is not None:
+                    await self._rate_limiter.acquire(domain)
+                self.note_turn_off_requested()
+                await self.hass.services.async_call(domain, "turn_off", {"entity_id": self.entity_id}, blocking=True)
         except Exception as e:
-            _LOGGER.error("Failed to turn off target '%s': %s", self.entity_id, e)
+            self.log_turn_off_result(e)
+        else:
+            self.log_turn_off_result(None)
+
+    def note_turn_off_requested(self) -> None:
+        """Start timing a turn-off of this target if it is known to be on."""
+        if self._last_known_good_state:
+            self.latency.request(time.monotonic())
+
+    def stuck_after(self) -> float:
+        """Seconds without an off confirmation after which a retry is due."""
+        return self.latency.stuck_after(ENSURE_INTERVAL_SEC, ENSURE_WINDOW_SEC)
+
+    async def async_wait_off(self, timeout: float) -> bool:
+        """Wait up to ``timeout`` seconds for this target to report off.
+
+        Returns as soon as a state-change event shows the entity off.
+        If no such event arrives in time the state machine is read once
+        more, so a target that went off without us seeing the event is
+        still confirmed.
+        """
+        if not await self.is_on():
+            return True
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._off_waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, max(timeout, 0))
+        except TimeoutError:
+            return not await self.is_on()
+        finally:
+            self._off_waiters.remove(waiter)
+        return True
 
     async def stop_tracking(self):
         if self._unsub:
@@ -405,24 +632,75 @@ class SensorGroup:
         on_deadline_change: Callable[[str, str | None], None] | None = None,
         *,
         manager: "Any | None" = None,
+        dispatcher: StateChangeDispatcher | None = None,
+        coalescer: "GroupEvaluationCoalescer | None" = None,
+        expansion: ExpansionGraph | None = None,
+        scheduler: "DeadlineScheduler | None" = None,
+        rate_limiter: TurnOffRateLimiter | None = None,
+        aggregator: TurnOffAggregator | None = None,
     ):
         self.hass = hass
         self.group_id = group_id
         self._config = config  # immutable
         self._on_deadline_change = on_deadline_change
         self._manager = manager
+        # Shared state-change dispatcher owned by AutoOffManager. None
+        # when the group is built standalone; members then subscribe
+        # on their own.
+        self._dispatcher = dispatcher
+        # Manager-wide dirty-set evaluator. None means member events
+        # evaluate the group inline, one evaluation per event.
+        self._coalescer = coalescer
+        # Manager-wide cached target expansion. None means every
+        # expansion walks hass.states (standalone group).
+        self._expansion = expansion
+        # Manager-wide deadline heap with a single armed loop timer. None
+        # means the group arms its own call_later handle.
+        self._scheduler = scheduler
+        # Manager-wide turn_off token buckets. None means no rate limit.
+        self._rate_limiter = rate_limiter
+        # Manager-wide batching of turn_off calls across groups (applies
+        # the rate limit itself). None means one call per entity.
+        self._aggregator = aggregator
         self._sensors: list[Sensor] = []
         self._targets: list[Target] = []
-        self._timer: asyncio.TimerHandle | None = None
+        # Number of members whose last known good state is ``on``. Kept
+        # in step by the members' ``on_known_state_change`` hook so a
+        # single event costs O(1) instead of a scan over every member.
+        # ``_counts_synced`` stays False until the first full rescan;
+        # the periodic safety sweep rescans again and corrects drift.
+        self.sensors_on_count = 0
+        self.targets_on_count = 0
+        self._counts_synced = False
+        # Event generation: bumped on every member event (ignored
+        # unknown/unavailable ones included) and reconfigure.
+        # The periodic sweep remembers the generation it last evaluated
+        # and skips the group while nothing happened since (see
+        # async_sweep); None means never swept.
+        self.generation = 0
+        self._swept_generation: int | None = None
+        # Startup barrier (AutoOffManager.hold_evaluations): member events
+        # only update baselines and counters until the manager releases
+        # the hold and evaluates every group once.
+        self._evaluation_held = False
+        self._timer: "asyncio.TimerHandle | ScheduledDeadline | None" = None
         self._timer_deadline: float | None = None  # timestamp when timer fires
+        # True while the running deadline was only derived from a lost
+        # timer (see _set_deadline_from_delay), not from real activity.
+        self._deadline_from_lost_timer = False
         self._last_all_sensors_off: bool | None = None
         # Critical section for race condition protection
         self._lock = asyncio.Lock()
         # Tracking previous states for transition detection
         self._last_any_target_on: bool | None = None
-        # Post-deadline retry loop handle. See _ensure_off_loop and the
-        # design spec (2026-05-16-ensure-off-loop-design.md).
+        # Handle of the running turn-off phase (initial dispatch +
+        # ensure-off loop, see _turn_off_targets and the design spec
+        # 2026-05-16-ensure-off-loop-design.md). A sensor reporting
+        # presence cancels it right away.
         self._ensure_task: asyncio.Task | None = None
+        # Set when an evaluation was skipped because the turn-off phase
+        # held the lock; it runs as soon as the phase ends.
+        self._reevaluate_pending = False
         # Held during the entire turn-off phase (initial dispatch +
         # ensure-off retry loop). External consumers
         # (check_and_set_deadline reentries via state-change callbacks,
@@ -433,46 +711,237 @@ class SensorGroup:
         # cancel the in-flight ensure-loop and push the remaining
         # leaves out by another full ``delay``.
         self._turn_off_lock = asyncio.Lock()
+        # Bounds this group's in-flight turn_off calls, shared by the
+        # initial dispatch and every per-target retry.
+        self._turn_off_slots = asyncio.Semaphore(TURN_OFF_CONCURRENCY)
+        # Delay in seconds, kept hot so scheduling never renders. Plain
+        # integers are converted once; template delays are compiled once
+        # and tracked, and every re-render refreshes the cached value
+        # (see _handle_delay_result for the reschedule policy).
+        self._delay_template: Template | None = None
+        self._delay_seconds: int | None = None
+        self._unsub_delay = None
+        self._set_delay_source(config.delay)
+        self.setup_seconds: float | None = None
         self._init_from_config()
 
     def _init_from_config(self):
+        """Build member objects; tracking starts in ``async_start``."""
         self._sensors = []
         self._targets = []
-        for sensor_id in self._config.sensors:
-            try:
-                sensor_obj = Sensor(
-                    self.hass,
-                    sensor_id,
-                    kind="entity",
-                    on_state_change_callback=self._on_sensor_state_change,
-                )
+        for kind, raw in self._sensor_defs(self._config):
+            sensor_obj = self._make_sensor(kind, raw)
+            if sensor_obj is not None:
                 self._sensors.append(sensor_obj)
-                asyncio.create_task(sensor_obj.start_tracking())
-            except Exception as e:
-                _LOGGER.error(f"Sensor entity '{sensor_id}' is invalid and will be ignored: {e}")
-        for template_str in self._config.sensor_templates:
-            try:
-                sensor_obj = Sensor(
-                    self.hass,
-                    template_str,
-                    kind="template",
-                    on_state_change_callback=self._on_sensor_state_change,
-                )
-                self._sensors.append(sensor_obj)
-                asyncio.create_task(sensor_obj.start_tracking())
-            except Exception as e:
-                _LOGGER.error(f"Sensor template '{template_str}' is invalid and will be ignored: {e}")
         # Expand any group-like targets to their leaves before building
         # Target objects. Auto_off must drive the actual end devices so
         # the ensure-off retry loop can tell precisely which leaves did
         # not switch off. The raw config (``self._config.targets``) is
         # left untouched so ``dump_group`` reports the user's intent
         # rather than the expanded form.
-        expanded_targets = expand_group_targets(self.hass, list(self._config.targets))
-        for target_def in expanded_targets:
-            target = Target(self.hass, target_def, self._on_target_state_change)
-            self._targets.append(target)
-            asyncio.create_task(target.start_tracking())
+        for target_def in self._expand_targets():
+            self._targets.append(self._make_target(target_def))
+
+    async def async_start(self) -> float:
+        """Start tracking every member, and the delay template, as one batch.
+
+        Returns the seconds it took (also kept in ``setup_seconds``). A
+        member that fails to start is logged and skipped.
+        """
+        started = time.monotonic()
+        members = [*self._sensors, *self._targets]
+        results = await asyncio.gather(*(member.start_tracking() for member in members), return_exceptions=True)
+        for member, result in zip(members, results):
+            if isinstance(result, Exception):
+                _LOGGER.error(
+                    "[Group %s] Failed to start tracking %s: %s",
+                    self.group_id,
+                    getattr(member, "raw", "?"),
+                    result,
+                )
+        if self._delay_template is not None:
+            try:
+                await self._start_delay_tracking()
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.error("[Group %s] Failed to track delay template: %s", self.group_id, exc)
+        self.setup_seconds = time.monotonic() - started
+        return self.setup_seconds
+
+    def _expand_targets(self) -> list[str]:
+        """Leaf entity_ids of the configured targets."""
+        if self._expansion is not None:
+            return self._expansion.expand(self.group_id, list(self._config.targets))
+        return expand_group_targets(self.hass, list(self._config.targets))
+
+    @staticmethod
+    def _sensor_defs(config: GroupConfig) -> list[tuple[str, str]]:
+        """``(kind, raw)`` for every sensor in ``config``, in config order."""
+        return [("entity", s) for s in config.sensors] + [("template", t) for t in config.sensor_templates]
+
+    def _make_sensor(self, kind: str, raw: str) -> "Sensor | None":
+        try:
+            return Sensor(
+                self.hass,
+                raw,
+                kind=kind,
+                on_state_change_callback=self._on_sensor_state_change,
+                dispatcher=self._dispatcher,
+                group_id=self.group_id,
+                on_known_state_change=self._on_sensor_known_state,
+                on_invalid_state=self._on_member_invalid_state,
+            )
+        except Exception as e:
+            _LOGGER.error(f"Sensor {kind} '{raw}' is invalid and will be ignored: {e}")
+            return None
+
+    def _make_target(self, entity_id: str) -> "Target":
+        return Target(
+            self.hass,
+            entity_id,
+            self._on_target_state_change,
+            dispatcher=self._dispatcher,
+            group_id=self.group_id,
+            on_known_state_change=self._on_target_known_state,
+            on_invalid_state=self._on_member_invalid_state,
+            rate_limiter=self._rate_limiter,
+            aggregator=self._aggregator,
+        )
+
+    def _set_delay_source(self, delay: int | str) -> None:
+        """Install ``delay`` as the delay source (cached seconds or template)."""
+        if isinstance(delay, int):
+            self._delay_template = None
+            self._delay_seconds = delay * 60
+        else:
+            self._delay_template = _compile_template(self.hass, delay)
+            self._delay_seconds = None
+
+    async def async_reconfigure(self, config: GroupConfig) -> None:
+        """Apply ``config`` in place as a minimal diff.
+
+        Sensors and target leaves present in both configs keep their
+        objects, subscriptions and baseline state; only added members
+        start tracking and only removed ones stop. A changed delay
+        swaps the delay source and moves a running deadline by the
+        difference (same policy as ``_handle_delay_result``). The group
+        is re-evaluated afterwards only if its members changed.
+        """
+        old_config = self._config
+        async with self._lock:
+            self._config = config
+            members_changed = await self._apply_member_diff()
+            self.generation += 1
+            if config.delay != old_config.delay:
+                await self._swap_delay_source(config.delay)
+        _LOGGER.info(f"[Group {self.group_id}] Reconfigured in place (members changed: {members_changed})")
+        if members_changed:
+            await self.check_and_set_deadline()
+
+    async def _apply_member_diff(self) -> bool:
+        """Add/remove sensors and target leaves to match ``self._config``."""
+        changed = False
+
+        # Keyed to a list of objects: a sensor listed twice has two
+        # Sensor objects, and each must be matched or dropped on its own.
+        current_sensors: dict[tuple[str, str], list[Sensor]] = {}
+        for s in self._sensors:
+            current_sensors.setdefault(("template" if s._is_template else "entity", s.raw), []).append(s)
+        sensors: list[Sensor] = []
+        for key in self._sensor_defs(self._config):
+            matches = current_sensors.get(key)
+            sensor_obj = matches.pop(0) if matches else None
+            if sensor_obj is None:
+                sensor_obj = self._make_sensor(*key)
+                if sensor_obj is None:
+                    continue
+                await sensor_obj.start_tracking()
+                changed = True
+            sensors.append(sensor_obj)
+        for sensor_obj in itertools.chain.from_iterable(current_sensors.values()):
+            await self._drop_member(sensor_obj)
+            changed = True
+        self._sensors = sensors
+
+        current_targets = {t.entity_id: t for t in self._targets}
+        targets: list[Target] = []
+        for entity_id in self._expand_targets():
+            target = current_targets.pop(entity_id, None)
+            if target is None:
+                target = self._make_target(entity_id)
+                await target.start_tracking()
+                changed = True
+            targets.append(target)
+        for target in current_targets.values():
+            await self._drop_member(target)
+            changed = True
+        self._targets = targets
+        return changed
+
+    @staticmethod
+    async def _drop_member(member: "Sensor | Target") -> None:
+        await member.stop_tracking()
+        # Clearing the baseline releases the member's share of the
+        # group's on-counter.
+        member._remember_state(None)
+
+    async def _swap_delay_source(self, delay: int | str) -> None:
+        old_seconds = self._delay_seconds
+        if self._unsub_delay is not None:
+            self._unsub_delay()
+            self._unsub_delay = None
+        self._set_delay_source(delay)
+        if self._delay_template is not None:
+            await self._start_delay_tracking()
+        self._reschedule_for_delay(old_seconds, self._delay_seconds)
+
+    def _on_sensor_known_state(self, sensor: Sensor, old: bool | None, new: bool | None) -> None:
+        self.sensors_on_count += (new is True) - (old is True)
+
+    def _on_target_known_state(self, target: Target, old: bool | None, new: bool | None) -> None:
+        self.targets_on_count += (new is True) - (old is True)
+
+    def _on_member_invalid_state(self) -> None:
+        # The event path ignores unknown/unavailable states, so a member
+        # that was on may now be counted wrongly; let the next sweep
+        # rescan even though no evaluation was requested.
+        self.generation += 1
+
+    async def _rescan_counts(self) -> None:
+        """Recompute the on-counters from live member state.
+
+        O(members): runs on the first evaluation and on the periodic
+        safety sweep only. Members whose remembered state disagrees with
+        the live one (e.g. a sensor that went ``unavailable`` while on,
+        which the event path deliberately ignores) are resynchronised
+        through their own ``_remember_state`` so the counters and the
+        members' baselines agree again; any correction is logged as
+        drift.
+        """
+        before = (self.sensors_on_count, self.targets_on_count)
+        for member in (*self._sensors, *self._targets):
+            try:
+                live = bool(await member.is_on())
+            except Exception as exc:  # noqa: BLE001 - never die mid-sweep
+                _LOGGER.warning(
+                    "[Group %s] rescan: is_on check on %s failed: %s",
+                    self.group_id,
+                    getattr(member, "raw", "?"),
+                    exc,
+                )
+                continue
+            if bool(member._last_known_good_state) != live:
+                member._remember_state(live)
+        after = (self.sensors_on_count, self.targets_on_count)
+        if self._counts_synced and after != before:
+            _LOGGER.warning(
+                "[Group %s] On-counter drift corrected: sensors_on %d -> %d, targets_on %d -> %d",
+                self.group_id,
+                before[0],
+                after[0],
+                before[1],
+                after[1],
+            )
+        self._counts_synced = True
 
     async def all_sensors_off(self):
         sensors_on = []
@@ -493,16 +962,93 @@ class SensorGroup:
         return False
 
     async def get_delay(self) -> int:
-        tpl = Template(str(self._config.delay), self.hass)
-        rendered = tpl.async_render()
+        """Return the delay in seconds.
+
+        O(1) once the delay is known: template delays are rendered by
+        their tracker, not here. Only a template delay whose tracker has
+        not produced a value yet is rendered inline (and cached).
+        """
+        if self._delay_seconds is None:
+            self._delay_seconds = self._delay_to_seconds(self._delay_template.async_render())
+        return self._delay_seconds
+
+    def _delay_to_seconds(self, rendered: Any) -> int:
         try:
             return int(rendered) * 60
         except Exception as err:
             raise ValueError(f"Failed to render delay template: {self._config.delay}, result: {rendered}") from err
 
-    async def check_and_set_deadline(self):
+    async def _start_delay_tracking(self):
+        """Track the delay template so the cached value follows its inputs."""
+        if self._unsub_delay is not None:
+            return
+        try:
+            try:
+                await self.get_delay()
+            except ValueError as e:
+                _LOGGER.error(f"[Group {self.group_id}] {e}")
+            info = async_track_template_result(
+                self.hass,
+                [TrackTemplate(self._delay_template, None)],
+                self._handle_delay_result,
+            )
+            self._unsub_delay = info.async_remove
+            _LOGGER.debug(f"[Group {self.group_id}] Delay template tracking started, delay: {self._delay_seconds}s")
+        except Exception as e:
+            _LOGGER.error(f"[Group {self.group_id}] Failed to track delay template '{self._config.delay}': {e}")
+
+    async def _handle_delay_result(self, event, updates: list[TrackTemplateResult]):
+        """Refresh the cached delay and reschedule a running deadline.
+
+        Policy: a running deadline keeps its start point and moves by
+        the change in delay (``deadline += new - old``), i.e. it behaves
+        as if the new delay had been in force when the countdown began.
+        If the moved deadline is already in the past, targets are turned
+        off now. No deadline running, or a turn-off phase in progress:
+        only the cached value changes. A render error or non-numeric
+        result keeps the previous delay.
+        """
+        result = updates[-1].result
+        try:
+            if isinstance(result, TemplateError):
+                raise ValueError(f"Failed to render delay template: {self._config.delay}, result: {result}")
+            new_delay = self._delay_to_seconds(result)
+        except ValueError as e:
+            _LOGGER.error(f"[Group {self.group_id}] {e}; keeping delay {self._delay_seconds}s")
+            return
+
+        old_delay = self._delay_seconds
+        if new_delay == old_delay:
+            return
+        self._delay_seconds = new_delay
+        _LOGGER.info(f"[Group {self.group_id}] Delay changed: {old_delay}s -> {new_delay}s")
+
+        async with self._lock:
+            self._reschedule_for_delay(old_delay, new_delay)
+
+    def _reschedule_for_delay(self, old_delay: int | None, new_delay: int | None) -> None:
+        """Move a running deadline by ``new_delay - old_delay``.
+
+        Must be called under ``self._lock``. No-op when either delay is
+        unknown, no deadline is running or a turn-off is in progress.
+        """
+        if old_delay is None or new_delay is None or old_delay == new_delay:
+            return
+        if self._turn_off_lock.locked() or self._timer is None or self._timer_deadline is None:
+            return
+        new_deadline = self._timer_deadline + (new_delay - old_delay)
+        _LOGGER.info(
+            f"[Group {self.group_id}] Deadline rescheduled by delay change: {self._timer_deadline} -> {new_deadline}"
+        )
+        self._start_deadline(force_deadline=new_deadline)
+
+    async def check_and_set_deadline(self, rescan: bool = False):
         """Main method for checking and setting deadline.
 
+        Reads the O(1) on-counters. ``rescan=True`` (periodic safety
+        sweep) first recomputes them from live member state; the very
+        first evaluation always does.
+
         While ``self._turn_off_lock`` is held, the group is in the
         middle of its turn-off / ensure-off phase. External callbacks
         that would otherwise re-enter this method (e.g. a late
@@ -512,17 +1058,22 @@ class SensorGroup:
         and route through ``_check_expired_deadlines``, which cancels
         the in-flight ensure-loop and pushes the remaining leaves out
         by another full ``delay``. Skipping cleanly is the right
-        answer; the post-turn-off re-evaluation at the tail of
-        ``_turn_off_targets`` picks up any genuine state change.
+        answer; the skipped evaluation is remembered and runs once when
+        ``_turn_off_targets`` ends, which picks up any genuine state
+        change.
         """
         if self._turn_off_lock.locked():
             _LOGGER.debug(
-                "[Group %s] check_and_set_deadline skipped: turn-off phase in progress",
+                "[Group %s] check_and_set_deadline deferred: turn-off phase in progress",
                 self.group_id,
             )
+            self._reevaluate_pending = True
             return
 
         async with self._lock:
+            if rescan or not self._counts_synced:
+                await self._rescan_counts()
+
             # Collect current state
             current_state = await self._collect_current_state()
 
@@ -543,14 +1094,53 @@ class SensorGroup:
             # Save current state as previous
             self._update_last_states(current_state)
 
-    async def _collect_current_state(self) -> dict:
-        """Collects current state of sensors and targets"""
-        target_on = await self.any_target_on()
-        all_sensors_off = await self.all_sensors_off()
+    async def async_sweep(self, full: bool = False) -> bool:
+        """Periodic consistency check: rescan members and re-evaluate.
+
+        Member events already evaluate the group, so the sweep only
+        catches what the event path cannot see (e.g. a sensor that went
+        ``unavailable`` while on). A group with no event since its last
+        sweep is skipped unless ``full`` is set; idle groups are then
+        only rescanned by the low-frequency full sweep. Returns whether
+        the group was evaluated.
+        """
+        generation = self.generation
+        if not full and generation == self._swept_generation:
+            return False
+        await self.check_and_set_deadline(rescan=True)
+        self._swept_generation = generation
+        return True
+
+    async def async_resume_deadline(self, deadline: float) -> bool:
+        """Resume a deadline persisted before a restart (loop time, may be past).
+
+        Applied only while targets are on and every sensor is off, and
+        only if the group has no deadline yet or just the one its first
+        run derived from the lost timer; activity since the restart wins.
+        A deadline in the past turns the targets off right away. Returns
+        whether the deadline was resumed.
+        """
+        if self._turn_off_lock.locked():
+            return False
+        async with self._lock:
+            if not self._counts_synced:
+                await self._rescan_counts()
+            state = await self._collect_current_state()
+            if not state["target_on"] or not state["all_sensors_off"]:
+                return False
+            if self._timer is not None and not self._deadline_from_lost_timer:
+                return False
+            self._start_deadline(force_deadline=deadline)
+            self._deadline_from_lost_timer = False
+            self._update_last_states(state)
+        _LOGGER.info(f"[Group {self.group_id}] Deadline resumed after restart: {self._get_human_deadline()}")
+        return True
 
+    async def _collect_current_state(self) -> dict:
+        """Collects current state of sensors and targets from the on-counters"""
         return {
-            "target_on": target_on,
-            "all_sensors_off": all_sensors_off,
+            "target_on": self.targets_on_count > 0,
+            "all_sensors_off": self.sensors_on_count == 0,
             "human_deadline": self._get_human_deadline(),
         }
 
@@ -599,14 +1189,23 @@ class SensorGroup:
         # At startup just set deadline if needed
         # Expired deadlines check will be in periodic worker
         if state["target_on"] and state["all_sensors_off"] and self._timer_deadline is None:
-            asyncio.create_task(self._set_deadline_from_delay("startup"))
+            asyncio.create_task(self._set_deadline_from_delay("startup", lost_timer=True))
 
-    async def _set_deadline_from_delay(self, reason: str):
-        """Sets deadline based on delay from config"""
+    async def _set_deadline_from_delay(self, reason: str, *, lost_timer: bool = False):
+        """Sets deadline based on delay from config.
+
+        ``lost_timer`` marks a deadline derived only because no timer
+        exists (startup, restart); a persisted deadline resumed by
+        ``async_resume_deadline`` may replace it, and it is skipped if a
+        timer was armed in the meantime.
+        """
+        if lost_timer and self._timer is not None:
+            return
         delay = await self.get_delay()
         now = self.hass.loop.time()
         new_deadline = now + delay
         self._start_deadline(force_deadline=new_deadline)
+        self._deadline_from_lost_timer = lost_timer
 
         now_real = datetime.datetime.now().astimezone()
         human_deadline = (now_real + datetime.timedelta(seconds=delay)).isoformat()
@@ -616,6 +1215,10 @@ class SensorGroup:
 
     async def _log_state_transitions(self, state: dict):
         """Log current sensor and target states."""
+        # Per-member is_on() below is O(members); skip it unless someone
+        # is actually reading debug output.
+        if not _LOGGER.isEnabledFor(logging.DEBUG):
+            return
         sensor_statuses = []
         for s in self._sensors:
             try:
@@ -667,7 +1270,7 @@ class SensorGroup:
         After HA restart timers are lost — recalculate deadline from delay.
         """
         _LOGGER.debug("[Group %s] No active timer, setting new deadline", self.group_id)
-        await self._set_deadline_from_delay("no timer (recalculated)")
+        await self._set_deadline_from_delay("no timer (recalculated)", lost_timer=True)
 
     def _analyze_state_transitions(self, state: dict) -> dict:
         """Analyzes state transitions"""
@@ -692,16 +1295,27 @@ class SensorGroup:
             now = loop.time()
             delay = max(0, force_deadline - now)
         if delay > 0:
-            self._timer = loop.call_later(delay, lambda: asyncio.create_task(self._turn_off_targets()))
-            self._timer_deadline = loop.time() + delay
+            deadline = loop.time() + delay
+            if self._scheduler is not None:
+                self._timer = self._scheduler.schedule(self.group_id, deadline, self._fire_deadline)
+            else:
+                self._timer = loop.call_later(delay, self._fire_deadline)
+            self._timer_deadline = deadline
             _LOGGER.info(f"[{self.group_id}] All sensors are off/false. Deadline delay started.")
         else:
-            asyncio.create_task(self._turn_off_targets())
+            self._launch_turn_off()
             self._timer_deadline = None
             _LOGGER.info(f"[{self.group_id}] All sensors are off/false. Turning off targets immediately.")
 
         self._notify_deadline_change()
 
+    def _fire_deadline(self) -> None:
+        self._launch_turn_off()
+
+    def _launch_turn_off(self) -> None:
+        """Run the turn-off phase as a task the sensor path can cancel."""
+        self._ensure_task = asyncio.create_task(self._turn_off_targets())
+
     def _cancel_deadline(self) -> bool:
         # This method is only called from check_and_set_deadline, which is already under lock
         had_timer = self._timer is not None
@@ -709,6 +1323,7 @@ class SensorGroup:
             self._timer.cancel()
             self._timer = None
         self._timer_deadline = None  # Always clear deadline when cancelling
+        self._deadline_from_lost_timer = False
         # Also cancel any active post-deadline retry loop; the new state
         # (sensor on, target off, or new cycle) supersedes the previous
         # turn-off attempt.
@@ -728,12 +1343,24 @@ class SensorGroup:
         cancel us and push the slow leaves out by another full
         ``delay``.
 
-        After the lock is released we re-evaluate state exactly once so
-        any genuine change observed during the turn-off phase
-        (e.g. a sensor flipped back on, a user turned a target on
-        again) lands in the deadline state machine without further
-        prodding.
+        After the lock is released we re-evaluate state exactly once if
+        any evaluation was skipped meanwhile, so a genuine change
+        observed during the turn-off phase (e.g. a sensor flipped back
+        on, a user turned a target on again) lands in the deadline
+        state machine without waiting for the next poll tick. The same
+        happens when the phase is cancelled because presence returned.
         """
+        try:
+            await self._run_turn_off_phase()
+        except asyncio.CancelledError:
+            _LOGGER.info("[Group %s] Turn-off phase aborted", self.group_id)
+            raise
+        finally:
+            if self._ensure_task is asyncio.current_task():
+                self._ensure_task = None
+            self._flush_pending_evaluation()
+
+    async def _run_turn_off_phase(self) -> None:
         async with self._turn_off_lock:
             # Clear timer state BEFORE turning off - timer has fired
             self._timer = None
@@ -746,34 +1373,31 @@ class SensorGroup:
             # prediction because ``name=None`` + ``translation_key``
             # changes the slugify output).
             dispatched_domains: set[str] = set()
+            # Direct calls share the group's turn-off slots; intents for
+            # the shared aggregator do not (see _gather_turn_off).
+            calls, batched = [], []
             if self._manager is not None:
                 for entity_id in self._manager.get_group_member_group_entity_ids(
                     self.group_id
                 ):
-                    domain = entity_id.split(".", 1)[0]
-                    dispatched_domains.add(domain)
-                    try:
-                        await self.hass.services.async_call(
-                            domain,
-                            "turn_off",
-                            {"entity_id": entity_id},
-                            blocking=False,
-                        )
-                    except Exception as exc:  # noqa: BLE001
-                        _LOGGER.warning(
-                            "[Group %s] Group turn_off on %s failed: %s",
-                            self.group_id,
-                            entity_id,
-                            exc,
-                        )
+                    dispatched_domains.add(entity_id.split(".", 1)[0])
+                    if self._aggregator is not None:
+                        batched.append(self._turn_off_group_entity(entity_id))
+                    else:
+                        calls.append(self._turn_off_group_entity(entity_id))
 
             # Fallback: for every target whose domain was NOT
             # dispatched via a live group entity, issue an individual
             # turn_off. Covers non-groupable domains (scene,
             # input_boolean, ...) AND the case where a group entity
             # exists in our bookkeeping but has no entity_id assigned
-            # yet.
-            tasks = []
+            # yet. Group-entity and fallback calls go out together, so
+            # a mixed-domain room waits for its slowest integration
+            # rather than the sum of all of them. Fallback targets are
+            # turned off with one call per domain: directly, or as
+            # intents queued together with the shared aggregator, which
+            # merges them into that one call.
+            fallback: dict[str, list[Target]] = {}
             for target in self._targets:
                 entity_id = getattr(target, "entity_id", "")
                 if "." not in entity_id:
@@ -781,26 +1405,94 @@ class SensorGroup:
                 domain = entity_id.split(".", 1)[0]
                 if domain in dispatched_domains:
                     continue  # handled by group turn_off above
-                tasks.append(target.turn_off())
-            if tasks:
-                await asyncio.gather(*tasks)
+                fallback.setdefault(domain, []).append(target)
+            for domain, targets in fallback.items():
+                if self._aggregator is not None:
+                    batched.extend(target.turn_off() for target in targets)
+                else:
+                    calls.append(self._turn_off_domain(domain, targets))
+            await self._gather_turn_off(calls, batched)
             _LOGGER.info("All targets turned off after deadline.")
 
             # Run the ensure-off retry loop INLINE so it inherits the
             # turn-off lock and external callbacks remain suppressed
-            # until every retry pass is done. No external code should
-            # cancel it - cancellation now flows through the lock
-            # release after the loop finishes naturally.
+            # until every retry pass is done. Presence ends it early: a
+            # sensor turning on makes _on_sensor_state_change cancel this
+            # whole phase task (_cancel_ensure_task), the lock is
+            # released on the way out and the skipped evaluation runs.
+            # Unloading the group cancels it the same way.
             await self._ensure_off_loop()
 
-        # Lock released here. Pending events (state-change callbacks
-        # for targets that took longer to ack, periodic rescan ticks)
-        # naturally re-fire ``check_and_set_deadline`` on their own
-        # schedule and pick up any state change that happened during
-        # the turn-off phase. No explicit post-call needed.
+    def _flush_pending_evaluation(self) -> None:
+        """Run the evaluation deferred while the turn-off lock was held."""
+        if not self._reevaluate_pending:
+            return
+        self._reevaluate_pending = False
+        asyncio.create_task(self._request_evaluation())
+
+    async def _turn_off_group_entity(self, entity_id: str) -> None:
+        domain = entity_id.split(".", 1)[0]
+        # The group entity switches every leaf of its domain; each is a
+        # radio command of its own as far as the rate limit goes.
+        members = [target for target in self._targets if target.entity_id.startswith(f"{domain}.")]
+
+        def _sent() -> None:
+            for target in members:
+                target.note_turn_off_requested()
+
+        try:
+            if self._aggregator is not None:
+                await self._aggregator.turn_off(entity_id, on_sent=_sent, cost=len(members), blocking=False)
+                return
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(domain, len(members))
+            _sent()
+            await self.hass.services.async_call(
+                domain,
+                "turn_off",
+                {"entity_id": entity_id},
+                blocking=False,
+            )
+        except Exception as exc:  # noqa: BLE001
+            _LOGGER.warning(
+                "[Group %s] Group turn_off on %s failed: %s",
+                self.group_id,
+                entity_id,
+                exc,
+            )
+
+    async def _turn_off_domain(self, domain: str, targets: list[Target]) -> None:
+        """Turn ``targets`` of one domain off with a single multi-entity call."""
+        targets = [target for target in targets if target.can_turn_off()]
+        if not targets:
+            return
+        if self._rate_limiter is not None:
+            await self._rate_limiter.acquire(domain, len(targets))
+        for target in targets:
+            target.note_turn_off_requested()
+        results = await async_turn_off_entities(self.hass, domain, [target.entity_id for target in targets])
+        for target in targets:
+            target.log_turn_off_result(results[target.entity_id])
+
+    async def _gather_turn_off(self, calls: list, batched: list | None = None) -> list:
+        """Run turn-off coroutines concurrently, at most ``TURN_OFF_CONCURRENCY`` at once.
+
+        ``batched`` coroutines only queue an intent with the shared
+        aggregator, which sends one call per domain for all of them, so
+        they take no slot: holding one across the batch window would
+        split them into sequential batches of ``TURN_OFF_CONCURRENCY``.
+        Exceptions are returned in place of results so one failing
+        call never abandons the others.
+        """
+
+        async def _bounded(call):
+            async with self._turn_off_slots:
+                return await call
+
+        return await asyncio.gather(*(_bounded(call) for call in calls), *(batched or ()), return_exceptions=True)
 
     def _cancel_ensure_task(self) -> None:
-        """Cancel an active ensure-off loop, if any. Idempotent."""
+        """Cancel an active turn-off phase, if any. Idempotent."""
         task = self._ensure_task
         if task is None or task.done():
             self._ensure_task = None
@@ -809,92 +1501,129 @@ class SensorGroup:
         self._ensure_task = None
 
     async def _ensure_off_loop(self) -> None:
-        """Retry per-target ``turn_off`` until every target is off.
+        """Confirm every target went off, retrying per-target ``turn_off``.
 
         Runs after the initial dispatch in :meth:`_turn_off_targets`.
-        Stops as soon as one of these is true:
-
-        * Every target reports ``is_on() == False`` (success).
+        Every target is followed independently: it waits for its
+        state-change event to confirm ``off`` for as long as that
+        target usually takes (``Target.stuck_after``, learned from its
+        past turn-offs, ``ENSURE_INTERVAL_SEC`` until enough are
+        known) and is retried each time that runs out. Stops as soon
+        as one of these is true:
+
+        * Every target is confirmed off (success).
         * ``all_sensors_off()`` returns ``False`` (presence reclaimed).
         * ``ensure_window`` seconds have elapsed (window expired).
         * The task is cancelled from outside (new deadline, deadline
           cancelled, or group unload).
 
-        The retry loop NEVER re-dispatches to a group entity; it iterates
-        the individual targets that are still on and calls ``turn_off``
-        on each. This avoids spamming a whole group when only one member
-        failed to switch.
+        The retry loop NEVER re-dispatches to a group entity; it retries
+        only the individual targets that look stuck, so a whole group
+        is not spammed when only one member failed to switch.
         """
-        import time
-
         window = ENSURE_WINDOW_SEC
-        interval = ENSURE_INTERVAL_SEC
         if window <= 0:
             return
 
         deadline = time.monotonic() + window
-        while time.monotonic() < deadline:
-            await asyncio.sleep(interval)
-
-            if not await self.all_sensors_off():
-                _LOGGER.info(
-                    "[%s] ensure: sensors back on, abort",
-                    self.group_id,
-                )
-                return
+        outcomes = await asyncio.gather(
+            *(self._ensure_target_off(target, deadline) for target in self._targets)
+        )
 
-            still_on = []
-            for target in self._targets:
-                try:
-                    if await target.is_on():
-                        still_on.append(target)
-                except Exception as exc:  # noqa: BLE001 - never die mid-loop
-                    _LOGGER.warning(
-                        "[%s] ensure: is_on check on %s failed: %s",
-                        self.group_id,
-                        getattr(target, "entity_id", "?"),
-                        exc,
-                    )
-
-            if not still_on:
-                _LOGGER.info(
-                    "[%s] ensure: all targets off",
-                    self.group_id,
-                )
-                return
+        if None in outcomes:
+            _LOGGER.info(
+                "[%s] ensure: sensors back on, abort",
+                self.group_id,
+            )
+            return
 
+        if all(outcomes):
             _LOGGER.info(
-                "[%s] ensure: %d target(s) still on, retrying",
+                "[%s] ensure: all targets off",
                 self.group_id,
-                len(still_on),
             )
-            for target in still_on:
-                try:
-                    await target.turn_off()
-                except Exception as exc:  # noqa: BLE001
-                    _LOGGER.warning(
-                        "[%s] ensure: retry of %s failed: %s",
-                        self.group_id,
-                        getattr(target, "entity_id", "?"),
-                        exc,
-                    )
+            return
 
         # Window expired with at least one target still on.
-        try:
-            remaining = sum(1 for t in self._targets if await t.is_on())
-        except Exception:
-            remaining = -1
         _LOGGER.warning(
             "[%s] ensure: window expired, %d target(s) still on",
             self.group_id,
-            remaining,
+            outcomes.count(False),
         )
 
+    async def _ensure_target_off(self, target, deadline: float) -> bool | None:
+        """Follow one target until it is off, retrying it whenever it looks stuck.
+
+        Returns True once the target is off (or cannot be read, which
+        is never retried), False if the window ran out first and None
+        if sensors came back on.
+        """
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                if await target.async_wait_off(min(target.stuck_after(), remaining)):
+                    return True
+            except Exception as exc:  # noqa: BLE001 - never die mid-loop
+                _LOGGER.warning(
+                    "[%s] ensure: off confirmation of %s failed: %s",
+                    self.group_id,
+                    getattr(target, "entity_id", "?"),
+                    exc,
+                )
+                return True
+
+            if not await self.all_sensors_off():
+                return None
+
+            _LOGGER.info(
+                "[%s] ensure: %s still on, retrying",
+                self.group_id,
+                getattr(target, "entity_id", "?"),
+            )
+            try:
+                await self._retry_turn_off(target)
+            except Exception as exc:  # noqa: BLE001
+                _LOGGER.warning(
+                    "[%s] ensure: retry of %s failed: %s",
+                    self.group_id,
+                    getattr(target, "entity_id", "?"),
+                    exc,
+                )
+
+    async def _retry_turn_off(self, target) -> None:
+        if self._aggregator is not None:
+            # Batched with every other retry due now; see _gather_turn_off.
+            await target.turn_off()
+            return
+        async with self._turn_off_slots:
+            await target.turn_off()
+
+    @property
+    def turning_off(self) -> bool:
+        """Whether the group is in its turn-off phase (ensure loop included)."""
+        return self._turn_off_lock.locked()
+
+    def latency_stats(self) -> dict[str, dict[str, Any]]:
+        """Turn-off latency statistics of every target with samples."""
+        return {
+            target.entity_id: target.latency.stats(ENSURE_INTERVAL_SEC, ENSURE_WINDOW_SEC)
+            for target in self._targets
+            if target.latency.samples
+        }
+
     async def async_unload(self):
         """Cleans up group resources"""
         async with self._lock:
-            # Cancel timer
+            # Cancel timer and any running turn-off phase; nothing is
+            # evaluated for a group that is going away.
             self._cancel_deadline()
+            self._reevaluate_pending = False
+
+            if self._unsub_delay is not None:
+                self._unsub_delay()
+                self._unsub_delay = None
 
             # Sensors unsubscribe from their own events
             for sensor in self._sensors:
@@ -904,6 +1633,13 @@ class SensorGroup:
             for target in self._targets:
                 await target.stop_tracking()
 
+            # Drop any route a member failed to release (e.g. a tracking
+            # task that was still pending when the group was unloaded).
+            if self._dispatcher is not None:
+                self._dispatcher.async_remove_group(self.group_id)
+            if self._coalescer is not None:
+                self._coalescer.discard(self)
+
             _LOGGER.info(f"[Group {self.group_id}] Unloaded successfully")
 
     async def _on_target_state_change(self, target: Target, old_state: bool | None, new_state: bool | None):
@@ -912,7 +1648,7 @@ class SensorGroup:
         # It is only called when a REAL state change occurs for target
         # (old_state != new_state), ignoring intermediate unknown/unavailable states
         _LOGGER.debug(f"Target {getattr(target, 'entity_id', 'unknown')} state change: {old_state} -> {new_state}")
-        await self.check_and_set_deadline()
+        await self._request_evaluation()
 
     async def _on_sensor_state_change(self, sensor: Sensor, old_state: bool | None, new_state: bool | None):
         """Handler for sensor state changes, passed to Sensor"""
@@ -920,9 +1656,206 @@ class SensorGroup:
         # It is only called when a REAL state change occurs for sensor
         # (old_state != new_state), ignoring intermediate unknown/unavailable states
         _LOGGER.debug(f"Sensor {getattr(sensor, 'raw', 'unknown')} state change: {old_state} -> {new_state}")
+        if new_state and self._turn_off_lock.locked():
+            # Presence returned mid turn-off: stop now instead of at the
+            # ensure loop's next wake-up. The skipped evaluation below
+            # runs as soon as the phase has unwound.
+            _LOGGER.info(
+                "[Group %s] Sensor %s on during turn-off, aborting it",
+                self.group_id,
+                getattr(sensor, "raw", "unknown"),
+            )
+            self._reevaluate_pending = True
+            self._cancel_ensure_task()
+        await self._request_evaluation()
+
+    async def _request_evaluation(self):
+        """Evaluate the group after a member change.
+
+        With a coalescer the group is only marked dirty and evaluated
+        once by the next drain, collapsing bursts of member events.
+        """
+        self.generation += 1
+        if self._evaluation_held:
+            return
+        if self._coalescer is not None:
+            self._coalescer.mark_dirty(self)
+            return
         await self.check_and_set_deadline()
 
 
+class GroupEvaluationCoalescer:
+    """Collapse bursts of member events into one evaluation per group.
+
+    Events mark their group dirty; a single drain, scheduled ``window``
+    seconds after the first mark (next loop iteration for 0), runs
+    ``check_and_set_deadline`` once for every dirty group. Groups marked
+    while a drain is in flight are picked up by the same drain.
+    """
+
+    def __init__(self, hass: HomeAssistant, window: float = COALESCE_WINDOW_SEC) -> None:
+        self.hass = hass
+        self.window = window
+        self._dirty: dict[str, SensorGroup] = {}
+        self._handle: asyncio.Handle | None = None
+        self._drain_task: asyncio.Task | None = None
+
+    def mark_dirty(self, group: SensorGroup) -> None:
+        self._dirty[group.group_id] = group
+        if self._handle is not None or self._drain_task is not None:
+            return
+        if self.window > 0:
+            self._handle = self.hass.loop.call_later(self.window, self._start_drain)
+        else:
+            self._handle = self.hass.loop.call_soon(self._start_drain)
+
+    def discard(self, group: SensorGroup) -> None:
+        """Forget a pending evaluation for an unloaded group."""
+        if self._dirty.get(group.group_id) is group:
+            del self._dirty[group.group_id]
+
+    def _start_drain(self) -> None:
+        self._handle = None
+        self._drain_task = self.hass.async_create_task(self._drain())
+
+    async def _drain(self) -> None:
+        try:
+            while self._dirty:
+                batch = list(self._dirty.values())
+                self._dirty.clear()
+                results = await asyncio.gather(
+                    *(group.check_and_set_deadline() for group in batch),
+                    return_exceptions=True,
+                )
+                for group, result in zip(batch, results):
+                    if isinstance(result, Exception):
+                        _LOGGER.error(
+                            "[Group %s] Coalesced evaluation failed: %s",
+                            group.group_id,
+                            result,
+                        )
+        finally:
+            self._drain_task = None
+
+    def shutdown(self) -> None:
+        """Cancel any scheduled or running drain."""
+        self._dirty.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._drain_task is not None and not self._drain_task.done():
+            self._drain_task.cancel()
+        self._drain_task = None
+
+
+class ScheduledDeadline:
+    """Handle of one ``DeadlineScheduler`` entry; ``cancel`` only bumps a version."""
+
+    __slots__ = ("_scheduler", "group_id", "version")
+
+    def __init__(self, scheduler: "DeadlineScheduler", group_id: str, version: int) -> None:
+        self._scheduler = scheduler
+        self.group_id = group_id
+        self.version = version
+
+    def cancel(self) -> None:
+        self._scheduler.cancel(self.group_id, self.version)
+
+
+class DeadlineScheduler:
+    """One deadline heap for every group, with a single armed loop timer.
+
+    ``schedule`` pushes ``(deadline, version, group_id)`` and only re-arms
+    the loop timer when the new deadline is earlier than the armed one.
+    Rescheduling or cancelling never touches the heap: the group's
+    version is bumped and the stale entry is discarded lazily when it
+    reaches the top. When the timer fires, every group whose current
+    deadline has passed is dispatched and the timer is re-armed for the
+    next live entry, so the loop's own timer heap holds one handle for
+    the whole manager instead of one per group.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._heap: list[tuple[float, int, str]] = []
+        # group_id -> (version, callback) of its live entry.
+        self._live: dict[str, tuple[int, Callable[[], None]]] = {}
+        self._versions = itertools.count(1)
+        self._handle: asyncio.TimerHandle | None = None
+        self._armed_at: float | None = None
+
+    def schedule(self, group_id: str, deadline: float, action: Callable[[], None]) -> ScheduledDeadline:
+        """Run ``action`` at loop time ``deadline``, replacing ``group_id``'s previous deadline."""
+        version = next(self._versions)
+        self._live[group_id] = (version, action)
+        heapq.heappush(self._heap, (deadline, version, group_id))
+        if self._armed_at is None or deadline < self._armed_at:
+            self._arm(deadline)
+        self._compact()
+        return ScheduledDeadline(self, group_id, version)
+
+    def cancel(self, group_id: str, version: int) -> None:
+        """Drop ``group_id``'s deadline if ``version`` is still the live one."""
+        live = self._live.get(group_id)
+        if live is not None and live[0] == version:
+            del self._live[group_id]
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {"scheduled": len(self._live), "heap_size": len(self._heap), "armed_at": self._armed_at}
+
+    def shutdown(self) -> None:
+        self._live.clear()
+        self._heap.clear()
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = None
+        self._armed_at = None
+
+    def _arm(self, when: float) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+        self._handle = self.hass.loop.call_at(when, self._fire)
+        self._armed_at = when
+
+    def _fire(self) -> None:
+        self._handle = None
+        self._armed_at = None
+        now = self.hass.loop.time()
+        due: list[tuple[str, Callable[[], None]]] = []
+        while self._heap and self._heap[0][0] <= now:
+            _, version, group_id = heapq.heappop(self._heap)
+            live = self._live.get(group_id)
+            if live is not None and live[0] == version:
+                del self._live[group_id]
+                due.append((group_id, live[1]))
+        self._drop_stale_top()
+        if self._heap:
+            self._arm(self._heap[0][0])
+        for group_id, action in due:
+            try:
+                action()
+            except Exception as exc:  # noqa: BLE001 - one group must not starve the rest
+                _LOGGER.error("[Group %s] Deadline dispatch failed: %s", group_id, exc)
+
+    def _drop_stale_top(self) -> None:
+        while self._heap:
+            _, version, group_id = self._heap[0]
+            live = self._live.get(group_id)
+            if live is not None and live[0] == version:
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        """Rebuild the heap once stale entries dominate (reschedule churn)."""
+        if len(self._heap) <= 2 * len(self._live) + 64:
+            return
+        self._heap = [
+            entry for entry in self._heap if self._live.get(entry[2], (None,))[0] == entry[1]
+        ]
+        heapq.heapify(self._heap)
+
+
 class AutoOffManager:
     """
     Manager for automatic device turn-off by events and timeout.
@@ -935,6 +1868,14 @@ class AutoOffManager:
         *,
         on_deadline_change: Callable[[str, str | None], None] | None = None,
         integration_manager: "Any | None" = None,
+        coalesce_window: float | None = COALESCE_WINDOW_SEC,
+        sweep_concurrency: int = SWEEP_CONCURRENCY,
+        sweep_timeout: float = SWEEP_GROUP_TIMEOUT_SEC,
+        on_expansion_change: Callable[[str, tuple[str, ...]], None] | None = None,
+        turn_off_rate: float | None = TURN_OFF_RATE_PER_SEC,
+        turn_off_burst: float = TURN_OFF_BURST,
+        domain_turn_off_rates: dict[str, float] | None = None,
+        turn_off_batch_window: float | None = TURN_OFF_BATCH_WINDOW_SEC,
     ) -> None:
         self.hass = hass
         self.config = config
@@ -942,6 +1883,68 @@ class AutoOffManager:
         self._integration_manager = integration_manager
         self._groups: dict[str, SensorGroup] = {}
         self._tasks: list[Any] = []
+        # One state_changed listener for the union of every sensor and
+        # target entity_id, with an entity_id -> (group, role) index.
+        self._dispatcher = StateChangeDispatcher(hass)
+        self._coalescer = None if coalesce_window is None else GroupEvaluationCoalescer(hass, coalesce_window)
+        # Cached group-target expansion, refreshed by membership events
+        # of the intermediate groups (see expansion.py).
+        self.expansion = ExpansionGraph(hass, self._dispatcher, on_change=on_expansion_change)
+        self.deadlines = DeadlineScheduler(hass)
+        # Every group's turn_off and retry calls draw from these buckets,
+        # so a mass expiry is spread out instead of flooding the radios.
+        self.rate_limiter = (
+            None
+            if turn_off_rate is None and not domain_turn_off_rates
+            else TurnOffRateLimiter(turn_off_rate, turn_off_burst, domain_turn_off_rates)
+        )
+        self.turn_offs = (
+            None
+            if turn_off_batch_window is None
+            else TurnOffAggregator(hass, turn_off_batch_window, rate_limiter=self.rate_limiter)
+        )
+        self._evaluations_held = False
+        # Member setup figures of the last async_init_groups.
+        self.setup_stats: dict[str, float] = {}
+        self._sweep_concurrency = max(1, sweep_concurrency)
+        self._sweep_timeout = sweep_timeout
+
+    def _new_group(self, group_id: str, group_config: GroupConfig) -> SensorGroup:
+        """Build a SensorGroup wired to this manager's shared plumbing."""
+        group = SensorGroup(
+            self.hass,
+            group_id,
+            group_config,
+            on_deadline_change=self._on_deadline_change,
+            manager=self._integration_manager,
+            dispatcher=self._dispatcher,
+            coalescer=self._coalescer,
+            expansion=self.expansion,
+            scheduler=self.deadlines,
+            rate_limiter=self.rate_limiter,
+            aggregator=self.turn_offs,
+        )
+        group._evaluation_held = self._evaluations_held
+        return group
+
+    def hold_evaluations(self) -> None:
+        """Enter the startup barrier: member events stop evaluating groups."""
+        self._evaluations_held = True
+        for group in self._groups.values():
+            group._evaluation_held = True
+
+    async def async_release_evaluations(self) -> None:
+        """Leave the startup barrier and evaluate every group once, concurrently."""
+        self._evaluations_held = False
+        groups = list(self._groups.values())
+        for group in groups:
+            group._evaluation_held = False
+        started = time.monotonic()
+        results = await asyncio.gather(*(group.check_and_set_deadline() for group in groups), return_exceptions=True)
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("[Group %s] Startup evaluation failed: %s", group.group_id, result)
+        _LOGGER.info("Startup evaluation of %d groups took %.3fs", len(groups), time.monotonic() - started)
 
     async def async_init_groups(self):
         """Initialize sensor groups from configuration. Awaits unload of old groups."""
@@ -952,15 +1955,10 @@ class AutoOffManager:
                 _LOGGER.error("Error unloading group: %s", e)
 
         self._groups.clear()
+        self.expansion.prune(set(self.config))
         for group_id, group_config in self.config.items():
             try:
-                self._groups[group_id] = SensorGroup(
-                    self.hass,
-                    group_id,
-                    group_config,
-                    on_deadline_change=self._on_deadline_change,
-                    manager=self._integration_manager,
-                )
+                self._groups[group_id] = self._new_group(group_id, group_config)
                 _LOGGER.info(
                     "Initialized auto-off group '%s' with %d sensors and %d targets",
                     group_id,
@@ -969,15 +1967,152 @@ class AutoOffManager:
                 )
             except Exception as e:
                 _LOGGER.error("Failed to initialize auto-off group '%s': %s", group_id, e)
+        await self._async_start_groups(list(self._groups.values()))
+
+    async def _async_start_groups(self, groups: list[SensorGroup]) -> None:
+        """Start member tracking of ``groups`` concurrently and record timing.
+
+        When this returns every subscription exists, so the manager is
+        live; ``setup_stats`` keeps the figures for diagnostics.
+        """
+        started = time.monotonic()
+        results = await asyncio.gather(*(group.async_start() for group in groups), return_exceptions=True)
+        for group, result in zip(groups, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("[Group %s] Member setup failed: %s", group.group_id, result)
+        elapsed = time.monotonic() - started
+        members = sum(len(group._sensors) + len(group._targets) for group in groups)
+        slowest = max((r for r in results if isinstance(r, float)), default=0.0)
+        self.setup_stats = {
+            "groups": len(groups),
+            "members": members,
+            "seconds": elapsed,
+            "slowest_group_seconds": slowest,
+        }
+        _LOGGER.info("Auto-off live: %d groups, %d members tracked in %.3fs", len(groups), members, elapsed)
+
+    def latency_stats(self) -> dict[str, dict[str, dict[str, Any]]]:
+        """Per-group, per-target turn-off latency statistics, for diagnostics."""
+        stats = {group_id: group.latency_stats() for group_id, group in self._groups.items()}
+        return {group_id: targets for group_id, targets in stats.items() if targets}
+
+    async def async_set_group(self, group_id: str, group_config: GroupConfig) -> SensorGroup:
+        """Create or update one group, leaving every other group alone.
+
+        Unlike ``async_init_groups`` this only touches the group being
+        set, so unrelated groups keep their timers, ensure-loops and
+        subscriptions. O(1) in the number of groups. An existing group
+        is reconfigured in place (see ``SensorGroup.async_reconfigure``)
+        unless it is mid turn-off, in which case it is rebuilt.
+        """
+        self.config[group_id] = group_config
+        existing = self._groups.get(group_id)
+        if existing is not None and not existing.turning_off:
+            try:
+                await existing.async_reconfigure(group_config)
+                return existing
+            except Exception as e:
+                _LOGGER.error("In-place update of group '%s' failed, rebuilding: %s", group_id, e)
+        await self._unload_group(group_id)
+        group = self._new_group(group_id, group_config)
+        self._groups[group_id] = group
+        await group.async_start()
+        _LOGGER.info(
+            "Initialized auto-off group '%s' with %d sensors and %d targets",
+            group_id,
+            len(group_config.sensors),
+            len(group_config.targets),
+        )
+        return group
 
-    async def periodic_worker(self):
-        _LOGGER.debug("Periodic worker tick.")
+    async def async_remove_group(self, group_id: str) -> None:
+        """Unload and forget one group."""
+        await self._unload_group(group_id)
+        self.config.pop(group_id, None)
+        self.expansion.remove(group_id)
+
+    async def _unload_group(self, group_id: str) -> None:
+        group = self._groups.pop(group_id, None)
+        if group is None:
+            return
         try:
-            for group in self._groups.values():
-                # Check states and set deadlines
-                await group.check_and_set_deadline()
+            await group.async_unload()
         except Exception as e:
-            _LOGGER.error(f"Scheduled config reload failed: {e}")
+            _LOGGER.error("Error unloading group '%s': %s", group_id, e)
+
+    async def async_restore_deadlines(self, saved: dict[str, datetime.datetime]) -> int:
+        """Resume persisted wall-clock deadlines in one batched pass.
+
+        Every group with a saved deadline is resumed concurrently;
+        deadlines that expired while Home Assistant was down turn their
+        targets off in this same pass. Returns the number resumed.
+        """
+        now_wall = datetime.datetime.now(datetime.UTC)
+        now = self.hass.loop.time()
+        pending = [
+            (group, now + (deadline - now_wall).total_seconds())
+            for group_id, deadline in saved.items()
+            if (group := self._groups.get(group_id)) is not None
+        ]
+        results = await asyncio.gather(
+            *(group.async_resume_deadline(deadline) for group, deadline in pending),
+            return_exceptions=True,
+        )
+        resumed = expired = 0
+        for (group, deadline), result in zip(pending, results):
+            if isinstance(result, Exception):
+                _LOGGER.error("[Group %s] Resuming deadline failed: %s", group.group_id, result)
+            elif result:
+                resumed += 1
+                expired += deadline <= now
+        _LOGGER.info(
+            "Resumed %d of %d persisted deadlines (%d expired, turned off now)",
+            resumed,
+            len(saved),
+            expired,
+        )
+        return resumed
+
+    async def periodic_worker(self, *, full: bool = False, shard: int = 0, shards: int = 1) -> int:
+        """Consistency sweep over the groups that saw events since the
+        last tick (every group when ``full``). Deadlines themselves are
+        event-driven and fire from their own timers. With ``shards`` > 1
+        only groups whose ``sweep_slot`` equals ``shard`` are visited.
+
+        Groups are swept concurrently, at most ``sweep_concurrency`` at
+        a time, each bounded by ``sweep_timeout``; a failing or stuck
+        group is logged and does not affect the others. Returns the
+        number of groups evaluated.
+        """
+        groups = [g for gid, g in self._groups.items() if sweep_slot(gid, shards) == shard]
+        semaphore = asyncio.Semaphore(self._sweep_concurrency)
+
+        async def _sweep(group: SensorGroup) -> bool:
+            async with semaphore:
+                return await asyncio.wait_for(group.async_sweep(full=full), self._sweep_timeout)
+
+        results = await asyncio.gather(*(_sweep(group) for group in groups), return_exceptions=True)
+        swept = 0
+        for group, result in zip(groups, results):
+            if isinstance(result, TimeoutError):
+                _LOGGER.warning(
+                    "[Group %s] Periodic sweep timed out after %ss, retrying next round",
+                    group.group_id,
+                    self._sweep_timeout,
+                )
+            elif isinstance(result, Exception):
+                _LOGGER.error("[Group %s] Periodic sweep failed: %s", group.group_id, result)
+            elif result:
+                swept += 1
+        _LOGGER.debug(
+            "Periodic worker tick: shard %d/%d, %d/%d groups swept (full=%s)",
+            shard,
+            shards,
+            swept,
+            len(groups),
+            full,
+        )
+        return swept
 
     async def async_unload(self):
         """Clean up resources."""
@@ -985,3 +2120,10 @@ class AutoOffManager:
             await group.async_unload()
         self._groups.clear()
         self._tasks.clear()
+        self.expansion.clear()
+        self.deadlines.shutdown()
+        if self.turn_offs is not None:
+            self.turn_offs.shutdown()
+        self._dispatcher.async_shutdown()
+        if self._coalescer is not None:
+            self._coalescer.shutdown()
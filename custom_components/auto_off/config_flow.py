@@ -6,17 +6,49 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 
-from .const import CONF_GROUPS, CONF_POLL_INTERVAL, DOMAIN
+from .const import (
+    CONF_DOMAIN_TURN_OFF_RATES,
+    CONF_POLL_INTERVAL,
+    CONF_TURN_OFF_RATE,
+    DEFAULT_TURN_OFF_RATE,
+    DOMAIN,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_POLL_INTERVAL = 15
 
 
+def parse_domain_rates(text: str) -> dict[str, float]:
+    """Parse ``"light: 5, switch: 2"`` into ``{"light": 5.0, "switch": 2.0}``.
+
+    Raises vol.Invalid on a malformed entry or a rate that is not positive.
+    """
+    rates: dict[str, float] = {}
+    for item in text.split(","):
+        if not item.strip():
+            continue
+        domain, sep, rate = item.partition(":")
+        domain = domain.strip()
+        try:
+            value = float(rate)
+        except ValueError:
+            value = 0.0
+        if not sep or not domain or value <= 0:
+            raise vol.Invalid(f"Invalid domain rate: {item.strip()!r}")
+        rates[domain] = value
+    return rates
+
+
+def format_domain_rates(rates: dict[str, float]) -> str:
+    """Inverse of :func:`parse_domain_rates`, for the options form default."""
+    return ", ".join(f"{domain}: {rate:g}" for domain, rate in rates.items())
+
+
 class AutoOffConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Auto Off."""
 
-    VERSION = 4
+    VERSION = 6
 
     async def async_step_user(self, user_input=None):
         """Handle the initial step - just create the integration."""
@@ -27,9 +59,11 @@ class AutoOffConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             return self.async_create_entry(
                 title="Auto Off",
+                # Groups live in their own store (storage.py), not here.
                 data={
                     CONF_POLL_INTERVAL: user_input.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL),
-                    CONF_GROUPS: {},
+                    CONF_TURN_OFF_RATE: DEFAULT_TURN_OFF_RATE,
+                    CONF_DOMAIN_TURN_OFF_RATES: {},
                 },
             )
 
@@ -56,14 +90,25 @@ class AutoOffOptionsFlow(config_entries.OptionsFlow):
 
     async def async_step_init(self, user_input=None):
         """Manage the options."""
+        errors: dict[str, str] = {}
         if user_input is not None:
-            # Update the config entry data with new poll_interval
-            new_data = dict(self.config_entry.data)
-            new_data[CONF_POLL_INTERVAL] = user_input[CONF_POLL_INTERVAL]
-            self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
-            return self.async_create_entry(title="", data={})
-
-        current_poll_interval = self.config_entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+            try:
+                domain_rates = parse_domain_rates(user_input.get(CONF_DOMAIN_TURN_OFF_RATES, ""))
+            except vol.Invalid:
+                errors[CONF_DOMAIN_TURN_OFF_RATES] = "invalid_domain_rates"
+            else:
+                # Update the config entry data with the new settings
+                new_data = dict(self.config_entry.data)
+                new_data[CONF_POLL_INTERVAL] = user_input[CONF_POLL_INTERVAL]
+                new_data[CONF_TURN_OFF_RATE] = user_input[CONF_TURN_OFF_RATE]
+                new_data[CONF_DOMAIN_TURN_OFF_RATES] = domain_rates
+                self.hass.config_entries.async_update_entry(self.config_entry, data=new_data)
+                return self.async_create_entry(title="", data={})
+
+        data = self.config_entry.data
+        current_poll_interval = data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+        current_rate = data.get(CONF_TURN_OFF_RATE, DEFAULT_TURN_OFF_RATE)
+        current_domain_rates = format_domain_rates(data.get(CONF_DOMAIN_TURN_OFF_RATES, {}))
 
         return self.async_show_form(
             step_id="init",
@@ -72,6 +117,12 @@ class AutoOffOptionsFlow(config_entries.OptionsFlow):
                     vol.Optional(CONF_POLL_INTERVAL, default=current_poll_interval): vol.All(
                         vol.Coerce(int), vol.Range(min=5, max=300)
                     ),
+                    # 0 = unlimited.
+                    vol.Optional(CONF_TURN_OFF_RATE, default=current_rate): vol.All(
+                        vol.Coerce(float), vol.Range(min=0, max=1000)
+                    ),
+                    vol.Optional(CONF_DOMAIN_TURN_OFF_RATES, default=current_domain_rates): str,
                 }
             ),
+            errors=errors,
         )
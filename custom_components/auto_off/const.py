@@ -25,16 +25,24 @@ VERSION = _read_manifest_version()
 # Config entry storage keys
 CONF_GROUPS = "groups"
 CONF_POLL_INTERVAL = "poll_interval"
+# Manager-wide turn_off rate limit (commands per second, 0 = unlimited)
+# and tighter per-domain rates ({"light": 5}), see rate_limit.py.
+CONF_TURN_OFF_RATE = "turn_off_rate"
+CONF_DOMAIN_TURN_OFF_RATES = "domain_turn_off_rates"
+DEFAULT_TURN_OFF_RATE = 0
 
 # Service names and field names
 SERVICE_SET_GROUP = "set_group"
 SERVICE_DELETE_GROUP = "delete_group"
 SERVICE_DUMP_GROUP = "dump_group"
+SERVICE_APPLY_GROUPS = "apply_groups"
 CONF_GROUP_NAME = "group_name"
 CONF_TARGETS = "targets"
 CONF_SENSORS = "sensors"
 CONF_SENSOR_TEMPLATES = "sensor_templates"
 CONF_DELAY = "delay"
+CONF_DELETE = "delete"
+CONF_REPLACE = "replace"
 
 # Platforms forwarded by async_setup_entry.
 # - sensor: deadline sensor (existing)
@@ -69,11 +77,14 @@ __all__ = [
     "SERVICE_SET_GROUP",
     "SERVICE_DELETE_GROUP",
     "SERVICE_DUMP_GROUP",
+    "SERVICE_APPLY_GROUPS",
     "CONF_GROUP_NAME",
     "CONF_TARGETS",
     "CONF_SENSORS",
     "CONF_SENSOR_TEMPLATES",
     "CONF_DELAY",
+    "CONF_DELETE",
+    "CONF_REPLACE",
     "PLATFORMS",
     "GROUPABLE_DOMAINS",
 ]
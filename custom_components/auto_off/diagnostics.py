@@ -0,0 +1,26 @@
+"""Diagnostics support for Auto Off."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Return runtime counters of the integration manager."""
+    manager = hass.data.get(DOMAIN)
+    if manager is None:
+        return {}
+    return {
+        "groups": len(manager.groups_data),
+        "sweep": manager.sweep_stats,
+        "deadlines": manager.auto_off.deadlines.stats,
+        "setup": manager.auto_off.setup_stats,
+        "turn_off_latency": manager.auto_off.latency_stats(),
+        "turn_off_rate": None if manager.auto_off.rate_limiter is None else manager.auto_off.rate_limiter.stats,
+        "turn_off_batches": None if manager.auto_off.turn_offs is None else manager.auto_off.turn_offs.stats,
+    }
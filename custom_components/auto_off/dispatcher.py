@@ -0,0 +1,155 @@
+"""Shared state-change dispatcher for auto_off sensors and targets.
+
+Every ``Sensor`` and ``Target`` used to install its own
+``async_track_state_change_event`` subscription, so an entity that
+appears in five groups got five listeners and five coroutine
+invocations per event. ``AutoOffManager`` now owns one
+:class:`StateChangeDispatcher`: a single ``state_changed`` bus listener
+whose filter is an O(1) lookup into an ``entity_id -> [route]`` reverse
+index. Each route remembers which group and role (sensor or target)
+asked for the entity, so an event reaches only the groups that care.
+The ``ExpansionGraph`` registers its group-membership nodes here too,
+under the ``expansion`` role.
+
+The index is maintained incrementally: members add a route when they
+start tracking and drop it when they stop, so ``set_group`` /
+``delete_group`` only touch the routes of the affected group.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Coroutine
+from typing import Any, NamedTuple
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    EventStateChangedData,
+    HomeAssistant,
+    callback,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+ROLE_SENSOR = "sensor"
+ROLE_TARGET = "target"
+ROLE_EXPANSION = "expansion"
+
+StateChangeAction = Callable[[Event[EventStateChangedData]], Coroutine[Any, Any, None]]
+
+
+class _Route(NamedTuple):
+    """One (group, role) interest in an entity_id."""
+
+    group_id: str
+    role: str
+    action: StateChangeAction
+
+
+class StateChangeDispatcher:
+    """Single ``state_changed`` listener routing events to auto_off groups.
+
+    The bus listener is installed lazily on the first subscription and
+    removed again when the index becomes empty, so an install without
+    groups costs nothing on the event bus.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self.hass = hass
+        self._routes: dict[str, list[_Route]] = {}
+        self._unsub_bus: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_subscribe(
+        self,
+        entity_id: str,
+        group_id: str,
+        role: str,
+        action: StateChangeAction,
+    ) -> CALLBACK_TYPE:
+        """Route state changes of ``entity_id`` to ``action``.
+
+        Returns the unsubscribe callable, mirroring
+        ``async_track_state_change_event`` so callers can store it on
+        their ``_unsub`` slot unchanged.
+        """
+        route = _Route(group_id, role, action)
+        self._routes.setdefault(entity_id, []).append(route)
+        self._ensure_listening()
+
+        @callback
+        def _unsubscribe() -> None:
+            self._remove_route(entity_id, route)
+
+        return _unsubscribe
+
+    @callback
+    def async_remove_group(self, group_id: str) -> None:
+        """Drop every route registered by ``group_id``."""
+        for entity_id in list(self._routes):
+            routes = [r for r in self._routes[entity_id] if r.group_id != group_id]
+            if routes:
+                self._routes[entity_id] = routes
+            else:
+                del self._routes[entity_id]
+        self._stop_listening_if_idle()
+
+    def routes_for(self, entity_id: str) -> list[tuple[str, str]]:
+        """Return ``[(group_id, role), ...]`` interested in ``entity_id``."""
+        return [(r.group_id, r.role) for r in self._routes.get(entity_id, ())]
+
+    @property
+    def entity_ids(self) -> set[str]:
+        """Union of every tracked sensor and target entity_id."""
+        return set(self._routes)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Remove the bus listener and forget every route."""
+        self._routes.clear()
+        self._stop_listening_if_idle()
+
+    def _remove_route(self, entity_id: str, route: _Route) -> None:
+        routes = self._routes.get(entity_id)
+        if not routes:
+            return
+        try:
+            routes.remove(route)
+        except ValueError:
+            return
+        if not routes:
+            del self._routes[entity_id]
+        self._stop_listening_if_idle()
+
+    def _ensure_listening(self) -> None:
+        if self._unsub_bus is not None:
+            return
+        self._unsub_bus = self.hass.bus.async_listen(
+            EVENT_STATE_CHANGED,
+            self._async_handle_event,
+            event_filter=self._async_filter,
+        )
+        _LOGGER.debug("State-change dispatcher listening")
+
+    def _stop_listening_if_idle(self) -> None:
+        if self._routes or self._unsub_bus is None:
+            return
+        self._unsub_bus()
+        self._unsub_bus = None
+        _LOGGER.debug("State-change dispatcher idle, listener removed")
+
+    @callback
+    def _async_filter(self, event_data: EventStateChangedData) -> bool:
+        """Drop events for entities no group tracks before any job is created."""
+        return event_data["entity_id"] in self._routes
+
+    @callback
+    def _async_handle_event(self, event: Event[EventStateChangedData]) -> None:
+        routes = self._routes.get(event.data["entity_id"])
+        if not routes:
+            return
+        # Copy: a handler may unsubscribe (group rebuild) while we iterate.
+        for route in list(routes):
+            self.hass.async_create_task(route.action(event))
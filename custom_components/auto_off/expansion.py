@@ -0,0 +1,230 @@
+"""Indexed, event-driven expansion of group-like targets.
+
+``expand_group_targets`` walks ``hass.states`` recursively, reading the
+``entity_id`` attribute of every intermediate group. The periodic
+worker used to repeat that walk for every auto_off group on every tick
+to notice late-registered groups or changed area membership.
+
+:class:`ExpansionGraph` keeps the walk's result instead: a
+``node -> children`` map for every entity visited while expanding an
+auto_off group, plus the reverse ``node -> auto_off groups`` index.
+Visited nodes that are groups, or not loaded yet (missing, or the
+``unavailable`` placeholder restored at startup: a late-loaded entity
+may turn out to be a group), are routed through the shared
+:class:`~.dispatcher.StateChangeDispatcher`; plain leaves are not, since
+their own target routes already carry every event of theirs and a
+second route would double the per-event task fan-out. An unloaded node
+that loads as a plain leaf drops its route. When an event shows that a
+node's ``entity_id`` attribute changed, only the auto_off groups that
+depend on that node are re-expanded from the cached map, and the owner
+is told about each group whose leaves actually changed.
+
+Sub-expansions are memoized per node as well, so an intermediate group
+shared by several auto_off groups (``light.floor_1`` under every room
+and the whole-house group) is resolved once rather than re-walked for
+each of them. The memo is dropped whenever a membership event arrives
+or a node is released.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable
+
+from homeassistant.core import CALLBACK_TYPE, Event, EventStateChangedData, HomeAssistant
+
+from .dispatcher import ROLE_EXPANSION, StateChangeDispatcher
+from .group_entities import group_children
+
+_LOGGER = logging.getLogger(__name__)
+
+# Dispatcher group_id of the graph's routes. Distinct from every
+# auto_off group so that unloading a group never drops a shared node.
+EXPANSION_ROUTE_OWNER = "__expansion__"
+
+
+def _may_have_members(state) -> bool:
+    """Whether membership events of this node can change an expansion.
+
+    True for group-like states (an ``entity_id`` attribute, even an empty
+    one) and for nodes not loaded yet: no state at all, or the
+    ``unavailable`` placeholder restored at startup, which carries no
+    ``entity_id`` attribute even for a group.
+    """
+    if state is None:
+        return True
+    attributes = getattr(state, "attributes", None) or {}
+    if "entity_id" in attributes or attributes.get("restored"):
+        return True
+    return state.state in ("unavailable", "unknown")
+
+
+class ExpansionGraph:
+    """Cached target expansion per auto_off group, kept current by events."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        dispatcher: StateChangeDispatcher,
+        on_change: Callable[[str, tuple[str, ...]], None] | None = None,
+    ) -> None:
+        self.hass = hass
+        self._dispatcher = dispatcher
+        self._on_change = on_change
+        # node -> member ids (() for a leaf). Subscribed nodes are kept
+        # fresh by their events; loaded plain leaves are cached without a
+        # route, since a loaded leaf does not grow members.
+        self._children: dict[str, tuple[str, ...]] = {}
+        # node -> auto_off groups whose expansion visited it, and back.
+        self._dependents: dict[str, set[str]] = {}
+        self._nodes: dict[str, set[str]] = {}
+        self._roots: dict[str, tuple[str, ...]] = {}
+        self._expanded: dict[str, tuple[str, ...]] = {}
+        self._unsubs: dict[str, CALLBACK_TYPE] = {}
+        # node -> (leaves, visited nodes) of its subtree, shared by every
+        # group whose expansion passes through it.
+        self._memo: dict[str, tuple[tuple[str, ...], frozenset[str]]] = {}
+
+    def expand(self, group_id: str, entity_ids: list[str]) -> list[str]:
+        """Leaves of ``entity_ids`` for ``group_id``, from cache when unchanged."""
+        roots = tuple(entity_ids)
+        if self._roots.get(group_id) == roots:
+            return list(self._expanded[group_id])
+        return list(self._rebuild(group_id, roots))
+
+    def expanded(self, group_id: str) -> tuple[str, ...] | None:
+        """Last expansion computed for ``group_id`` (None if never expanded)."""
+        return self._expanded.get(group_id)
+
+    def dependents(self, entity_id: str) -> set[str]:
+        """Auto_off groups whose expansion passes through ``entity_id``."""
+        return set(self._dependents.get(entity_id, ()))
+
+    def remove(self, group_id: str) -> None:
+        """Forget ``group_id``; nodes no other group uses are unsubscribed."""
+        for node in self._nodes.pop(group_id, set()):
+            self._release(node, group_id)
+        self._roots.pop(group_id, None)
+        self._expanded.pop(group_id, None)
+
+    def prune(self, keep: set[str]) -> None:
+        """Forget every group not in ``keep``."""
+        for group_id in set(self._nodes) - keep:
+            self.remove(group_id)
+
+    def clear(self) -> None:
+        self.prune(set())
+
+    def _rebuild(self, group_id: str, roots: tuple[str, ...]) -> tuple[str, ...]:
+        leaves, visited = self._walk(roots)
+        previous = self._nodes.get(group_id, set())
+        for node in visited - previous:
+            self._retain(node, group_id)
+        for node in previous - visited:
+            self._release(node, group_id)
+        self._nodes[group_id] = visited
+        self._roots[group_id] = roots
+        self._expanded[group_id] = tuple(leaves)
+        return self._expanded[group_id]
+
+    def _walk(self, roots: tuple[str, ...]) -> tuple[list[str], set[str]]:
+        """Same result as ``walk_group_targets``, built from memoized subtrees."""
+        leaves: list[str] = []
+        seen: set[str] = set()
+        visited: set[str] = set()
+        for root in roots:
+            sub_leaves, sub_nodes, _ = self._subtree(root, set())
+            visited |= sub_nodes
+            for leaf in sub_leaves:
+                if leaf not in seen:
+                    seen.add(leaf)
+                    leaves.append(leaf)
+        return leaves, visited
+
+    def _subtree(self, node: str, path: set[str]) -> tuple[tuple[str, ...], frozenset[str], bool]:
+        """Leaves and nodes under ``node``; the flag is False if a cycle was cut.
+
+        ``path`` holds the ancestors being expanded. A subtree whose walk
+        hit one of them depends on where it was entered from, so it is
+        not memoized.
+        """
+        memo = self._memo.get(node)
+        if memo is not None:
+            return (*memo, True)
+        if node in path:
+            return (), frozenset(), False
+        children = self._children_of(node)
+        if not children:
+            self._memo[node] = ((node,), frozenset((node,)))
+            return (*self._memo[node], True)
+
+        path.add(node)
+        leaves: list[str] = []
+        seen: set[str] = set()
+        nodes = {node}
+        complete = True
+        for child in children:
+            sub_leaves, sub_nodes, sub_complete = self._subtree(child, path)
+            complete = complete and sub_complete
+            nodes |= sub_nodes
+            for leaf in sub_leaves:
+                if leaf not in seen:
+                    seen.add(leaf)
+                    leaves.append(leaf)
+        path.discard(node)
+
+        result = (tuple(leaves), frozenset(nodes))
+        if complete:
+            self._memo[node] = result
+        return (*result, complete)
+
+    def _children_of(self, node: str) -> tuple[str, ...]:
+        children = self._children.get(node)
+        if children is None:
+            children = group_children(self.hass.states.get(node))
+            self._children[node] = children
+        return children
+
+    def _retain(self, node: str, group_id: str) -> None:
+        self._dependents.setdefault(node, set()).add(group_id)
+        if node not in self._unsubs and _may_have_members(self.hass.states.get(node)):
+            self._unsubs[node] = self._dispatcher.async_subscribe(
+                node, EXPANSION_ROUTE_OWNER, ROLE_EXPANSION, self._handle_node_change
+            )
+
+    def _unsubscribe(self, node: str) -> None:
+        unsub = self._unsubs.pop(node, None)
+        if unsub is not None:
+            unsub()
+
+    def _release(self, node: str, group_id: str) -> None:
+        dependents = self._dependents.get(node)
+        if dependents is None:
+            return
+        dependents.discard(group_id)
+        if dependents:
+            return
+        del self._dependents[node]
+        self._children.pop(node, None)
+        self._memo.clear()
+        self._unsubscribe(node)
+
+    async def _handle_node_change(self, event: Event[EventStateChangedData]) -> None:
+        node = event.data["entity_id"]
+        if node not in self._dependents:
+            return
+        new_state = event.data.get("new_state")
+        if not _may_have_members(new_state):
+            # Loaded as a plain leaf: its target route covers it from now on.
+            self._unsubscribe(node)
+        children = group_children(new_state)
+        if children == self._children.get(node):
+            return
+        _LOGGER.debug("Expansion node %s members changed: %s", node, list(children))
+        self._children[node] = children
+        self._memo.clear()
+        for group_id in sorted(self._dependents.get(node, ())):
+            old = self._expanded.get(group_id)
+            new = self._rebuild(group_id, self._roots[group_id])
+            if new != old and self._on_change is not None:
+                self._on_change(group_id, new)
@@ -245,6 +245,30 @@ def expand_group_targets(hass, entity_ids: list[str]) -> list[str]:
     drive their members individually so that its ensure-off retry loop
     can tell exactly which leaves failed to switch off.
     """
+    leaves, _ = walk_group_targets(entity_ids, lambda eid: group_children(hass.states.get(eid)))
+    return leaves
+
+
+def group_children(state) -> tuple[str, ...]:
+    """Member ids of a group-like state (its list ``entity_id`` attribute), else ()."""
+    if state is None:
+        return ()
+    attr = getattr(state, "attributes", {}) or {}
+    raw = attr.get("entity_id")
+    if isinstance(raw, list) and raw:
+        return tuple(c for c in raw if isinstance(c, str))
+    return ()
+
+
+def walk_group_targets(
+    entity_ids: list[str], children_of: Callable[[str], tuple[str, ...]]
+) -> tuple[list[str], set[str]]:
+    """Expand ``entity_ids`` to leaves using ``children_of`` for lookups.
+
+    Shared walk behind ``expand_group_targets`` and the cached
+    ``ExpansionGraph``. Returns the de-duplicated leaves in first-seen
+    order and every node visited on the way (groups and leaves).
+    """
     seen: list[str] = []
     seen_set: set[str] = set()
     visited: set[str] = set()
@@ -254,14 +278,7 @@ def expand_group_targets(hass, entity_ids: list[str]) -> list[str]:
             return
         visited.add(eid)
 
-        state = hass.states.get(eid)
-        children: list[str] | None = None
-        if state is not None:
-            attr = getattr(state, "attributes", {}) or {}
-            raw = attr.get("entity_id")
-            if isinstance(raw, list) and raw:
-                children = [c for c in raw if isinstance(c, str)]
-
+        children = children_of(eid)
         if not children:
             # Leaf (or late-loaded entity treated as a leaf).
             if eid not in seen_set:
@@ -274,7 +291,7 @@ def expand_group_targets(hass, entity_ids: list[str]) -> list[str]:
 
     for entity_id in entity_ids:
         _walk(entity_id)
-    return seen
+    return seen, visited
 
 
 def split_targets_by_domain(targets: list[str]) -> dict[str, list[str]]:
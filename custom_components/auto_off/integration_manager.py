@@ -2,27 +2,42 @@
 
 import asyncio
 import logging
+import time
 from datetime import timedelta
 from typing import Any
 
+from homeassistant.core import CoreState
 from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.start import async_at_started
 
-from .auto_off import AutoOffManager, GroupConfig
-from .const import CONF_GROUPS, CONF_POLL_INTERVAL, DOMAIN
+from .auto_off import AutoOffManager, GroupConfig, sweep_slot
+from .const import CONF_DOMAIN_TURN_OFF_RATES, CONF_POLL_INTERVAL, CONF_TURN_OFF_RATE, DOMAIN
 from .group_entities import (
     TARGET_GROUP_ENTITY_CLASSES,
     AutoOffSensorsGroup,
-    expand_group_targets,
     split_targets_by_domain,
 )
+from .storage import DeadlineStore, GroupStore
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_POLL_INTERVAL = 15
 
+# Interval of the full consistency sweep. Regular ticks only sweep
+# groups that saw member events since the previous tick; every group
+# (and its deadline sensor) is rescanned at most this often. None
+# disables full sweeps.
+CONSISTENCY_SWEEP_SEC: int | None = 600
+
+# The periodic sweep is spread over the poll interval: the worker runs
+# SWEEP_SHARDS times per interval and each run only visits the groups
+# whose sweep_slot matches, so one run costs ~1/SWEEP_SHARDS of a full
+# pass instead of one burst every poll_interval.
+SWEEP_SHARDS = 4
+
 
 def parse_group_configs(groups_data: dict[str, dict]) -> dict[str, GroupConfig]:
     """Parse structured dicts into GroupConfig objects."""
@@ -39,9 +54,27 @@ def parse_group_configs(groups_data: dict[str, dict]) -> dict[str, GroupConfig]:
 class IntegrationManager:
     """Manages the Auto Off integration."""
 
-    def __init__(self, hass, entry):
+    def __init__(
+        self,
+        hass,
+        entry,
+        store: GroupStore | None = None,
+        deadline_store: DeadlineStore | None = None,
+    ):
         self.hass = hass
         self.entry = entry
+        # Group definitions persist in their own delayed-save store, not
+        # in entry.data (see storage.py).
+        self._store = store if store is not None else GroupStore(hass)
+        # Wall-clock deadlines of running timers, resumed after a restart.
+        # Recording stops on unload so tearing the groups down does not
+        # erase them.
+        self._deadline_store = deadline_store if deadline_store is not None else DeadlineStore(hass)
+        self._persist_deadlines = True
+        self._cancel_on_started = None
+        # True between async_initialize and EVENT_HOMEASSISTANT_STARTED
+        # when set up during HA startup (see async_initialize).
+        self._starting = False
         self._sensor_async_add_entities: AddEntitiesCallback | None = None
         self._deadline_entities: dict[str, Any] = {}
         self._text_async_add_entities: AddEntitiesCallback | None = None
@@ -53,8 +86,8 @@ class IntegrationManager:
         # Live per-domain targets-group entities: (group_name, domain) -> entity instance
         self._targets_group_entities: dict[tuple[str, str], Any] = {}
 
-        # Parse groups from config entry
-        groups_data = entry.data.get(CONF_GROUPS, {})
+        # Parse groups from the group store
+        groups_data = self._store.groups
         group_configs = parse_group_configs(groups_data)
 
         self.auto_off = AutoOffManager(
@@ -62,10 +95,19 @@ class IntegrationManager:
             group_configs,
             on_deadline_change=self._on_deadline_change,
             integration_manager=self,
+            on_expansion_change=self._on_expansion_change,
+            # 0 / empty (the defaults) leave the limiter off.
+            turn_off_rate=entry.data.get(CONF_TURN_OFF_RATE) or None,
+            domain_turn_off_rates=entry.data.get(CONF_DOMAIN_TURN_OFF_RATES) or None,
         )
         self._lock = asyncio.Lock()
         self._remove_listener = None
         self._groups_data: dict[str, dict] = dict(groups_data)
+        # Validated GroupConfig per group, next to the raw dicts in
+        # _groups_data. Filled once here and replaced only on writes
+        # (set_group / delete_group), so readers never re-validate.
+        # Groups whose stored dict fails validation are absent.
+        self._group_configs: dict[str, GroupConfig] = dict(group_configs)
         # Per-group memo of the last expanded-targets tuple. Used by the
         # periodic worker to detect when an originally-group target has
         # finally registered its members (HA startup race with Magic
@@ -73,8 +115,36 @@ class IntegrationManager:
         # so we can re-run _sync_group_entities and propagate the new
         # leaves into the per-domain target group entities.
         self._last_expanded_targets: dict[str, tuple[str, ...]] = {}
+        # Groups whose expansion changed (reported by the ExpansionGraph)
+        # and still has to be propagated. Every group starts pending so
+        # the first pass records its baseline; groups mid turn-off stay
+        # pending and are retried by the periodic worker.
+        self._pending_expansion: set[str] = set(groups_data)
+        self._expansion_lock = asyncio.Lock()
+        self._expansion_task: asyncio.Task | None = None
+        # Sweep sub-ticks run since the integration started (see
+        # _next_sweep_shard) and counters exposed through diagnostics.
+        self._sweep_ticks = 0
+        self._sweep_stats: dict[str, float] = {
+            "ticks": 0,
+            "skipped_ticks": 0,
+            "last_tick_seconds": 0.0,
+            "max_tick_seconds": 0.0,
+        }
+
+    @property
+    def sweep_stats(self) -> dict[str, float]:
+        """Periodic sweep counters: ticks run, ticks skipped, tick durations."""
+        return dict(self._sweep_stats, shards=SWEEP_SHARDS)
+
+    @property
+    def groups_data(self) -> dict[str, dict]:
+        """Stored config dict of every group, keyed by group name (read-only view)."""
+        return self._groups_data
 
     def _on_deadline_change(self, group_name: str, deadline_iso: str | None) -> None:
+        if self._persist_deadlines:
+            self._deadline_store.async_set(group_name, deadline_iso)
         deadline_entity = self._deadline_entities.get(group_name)
         if not deadline_entity:
             return
@@ -99,8 +169,7 @@ class IntegrationManager:
         if async_add_entities is None:
             return
         new_entities = []
-        for group_name, config_dict in self._groups_data.items():
-            config = GroupConfig.model_validate(config_dict)
+        for group_name, config in self._group_configs.items():
             if platform == "binary_sensor":
                 if group_name in self._sensors_group_entities:
                     continue
@@ -174,7 +243,7 @@ class IntegrationManager:
         missing callbacks mean we skip emission and will retry on
         register_platform_callback.
         """
-        config = GroupConfig.model_validate(config_dict)
+        config = self._group_configs.get(group_name) or GroupConfig.model_validate(config_dict)
 
         # Sensors-group
         sensors_cb = self._platform_callbacks.get("binary_sensor")
@@ -199,7 +268,7 @@ class IntegrationManager:
         # Targets-groups per domain. Expand any group-like targets to
         # their leaves first: auto_off must drive the actual end devices,
         # not the AND-semantic UI groups they often pass through.
-        expanded_targets = expand_group_targets(self.hass, list(config.targets))
+        expanded_targets = self.auto_off.expansion.expand(group_name, list(config.targets))
         desired = split_targets_by_domain(expanded_targets)
         current_domains = {
             domain for (gname, domain) in self._targets_group_entities if gname == group_name
@@ -277,130 +346,195 @@ class IntegrationManager:
 
     async def async_initialize(self):
         """Initialize the integration manager."""
+        # Deadlines persisted before the restart; snapshot them before the
+        # new groups start reporting their own.
+        saved_deadlines = self._deadline_store.snapshot()
+
+        # Startup barrier: while Home Assistant is still starting, entities
+        # register in waves. Members only collect their baselines until
+        # it has started; then every group is evaluated once, in one
+        # batch, followed by one expansion pass (_async_on_started).
+        starting = self.hass.state is not CoreState.running
+        if starting:
+            self._starting = True
+            self.auto_off.hold_evaluations()
+
         # Initialize groups (awaits unload of any old groups)
         await self.auto_off.async_init_groups()
 
+        if starting or saved_deadlines:
+
+            async def _on_started(hass) -> None:
+                self._cancel_on_started = None
+                await self._async_on_started(saved_deadlines)
+
+            # Runs right away when Home Assistant is already running.
+            self._cancel_on_started = async_at_started(self.hass, _on_started)
+
         poll_interval = self.entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
         self._remove_listener = async_track_time_interval(
-            self.hass, self._periodic_worker, timedelta(seconds=poll_interval)
+            self.hass, self._periodic_worker, timedelta(seconds=poll_interval / SWEEP_SHARDS)
         )
         _LOGGER.info("IntegrationManager initialized with poll_interval %ds", poll_interval)
 
+    async def _async_on_started(self, saved_deadlines: dict) -> None:
+        """Leave the startup barrier: resume persisted deadlines, evaluate
+        every group in one batch and run one expansion pass."""
+        if saved_deadlines:
+            await self.auto_off.async_restore_deadlines(saved_deadlines)
+        await self.auto_off.async_release_evaluations()
+        self._starting = False
+        await self._reexpand_group_targets()
+
     async def _periodic_worker(self, now):
-        """Periodic worker: advance group state machines, refresh
-        deadline sensors, and re-expand group-like targets whose
-        membership only became visible after the original
-        _sync_group_entities ran (HA startup race / area composition
-        change)."""
+        """Periodic worker sub-tick for one sweep shard: consistency-sweep
+        the shard's groups that saw events since their last sweep (all of
+        them on a full sweep, when deadline sensors are refreshed too),
+        and re-expand group-like targets whose membership only became
+        visible after the original _sync_group_entities ran (HA startup
+        race / area composition change).
+
+        A sub-tick that finds the previous one still running is skipped
+        and counted in ``sweep_stats``; the shard is not advanced, so
+        the next sub-tick picks up the same groups.
+        """
+        if self._starting:
+            return
         if self._lock.locked():
-            _LOGGER.warning("IntegrationManager worker already running, skipping this tick")
+            self._sweep_stats["skipped_ticks"] += 1
+            _LOGGER.warning(
+                "IntegrationManager worker already running, skipping this tick (%d skipped so far)",
+                self._sweep_stats["skipped_ticks"],
+            )
             return
         async with self._lock:
-            await self.auto_off.periodic_worker()
-            for group_name in self._deadline_entities:
-                self._update_deadline_sensor_for_group(group_name)
-            await self._reexpand_group_targets()
-
-    async def _reexpand_group_targets(self) -> None:
-        """Re-run target expansion for every group; if a group's leaf
-        set changed since the last tick, re-sync downstream state so
-        both our per-domain target group entities AND the in-process
-        SensorGroup.self._targets list catch up. No-op when expansion
-        is stable across ticks.
+            started = time.monotonic()
+            shard, full = self._next_sweep_shard()
+            await self.auto_off.periodic_worker(full=full, shard=shard, shards=SWEEP_SHARDS)
+            if full:
+                for group_name in self._deadline_entities:
+                    if sweep_slot(group_name, SWEEP_SHARDS) == shard:
+                        self._update_deadline_sensor_for_group(group_name)
+            await self._reexpand_group_targets(shard=shard, shards=SWEEP_SHARDS)
+            elapsed = time.monotonic() - started
+            self._sweep_stats["ticks"] += 1
+            self._sweep_stats["last_tick_seconds"] = elapsed
+            self._sweep_stats["max_tick_seconds"] = max(self._sweep_stats["max_tick_seconds"], elapsed)
+
+    def _next_sweep_shard(self) -> tuple[int, bool]:
+        """Advance to the next sub-tick; return its ``(shard, full)``.
+
+        SWEEP_SHARDS consecutive sub-ticks form a round that visits every
+        group once; the round ending every CONSISTENCY_SWEEP_SEC is a
+        full sweep.
+        """
+        shard = self._sweep_ticks % SWEEP_SHARDS
+        sweep_round = self._sweep_ticks // SWEEP_SHARDS + 1
+        self._sweep_ticks += 1
+        if not CONSISTENCY_SWEEP_SEC:
+            return shard, False
+        poll_interval = self.entry.data.get(CONF_POLL_INTERVAL, DEFAULT_POLL_INTERVAL)
+        every = max(1, round(CONSISTENCY_SWEEP_SEC / poll_interval))
+        return shard, sweep_round % every == 0
+
+    def _on_expansion_change(self, group_name: str, expanded: tuple[str, ...]) -> None:
+        """ExpansionGraph callback: a group's leaves changed; propagate soon."""
+        self._pending_expansion.add(group_name)
+        if self._starting:
+            return  # the startup expansion pass picks it up
+        if self._expansion_task is None or self._expansion_task.done():
+            self._expansion_task = self.hass.async_create_task(self._reexpand_group_targets())
+
+    async def _reexpand_group_targets(self, shard: int = 0, shards: int = 1) -> None:
+        """Propagate pending expansion changes (of ``shard``); if a
+        group's leaf set changed since it was last propagated, re-sync
+        downstream state so both our per-domain target group entities
+        AND the in-process SensorGroup.self._targets list catch up.
+
+        Only groups flagged by the ExpansionGraph (plus every group once
+        at startup) are visited; expansions come from the graph's cache,
+        so nothing walks ``hass.states`` here.
 
         Groups currently in their turn-off phase
-        (``SensorGroup._turn_off_lock.locked()``) are skipped on this
-        pass: rebuilding ``SensorGroup`` from under an active
-        ensure-loop would clobber the in-flight retries. The next
-        periodic tick will re-evaluate them.
+        (``SensorGroup.turning_off``) are skipped on this pass and stay
+        pending: rebuilding ``SensorGroup`` from under an active
+        ensure-loop would clobber the in-flight retries. The periodic
+        worker retries them.
         """
-        for group_name, config_dict in list(self._groups_data.items()):
-            group_obj = self.auto_off._groups.get(group_name)
-            if (
-                group_obj is not None
-                and getattr(group_obj, "_turn_off_lock", None) is not None
-                and group_obj._turn_off_lock.locked()
-            ):
-                _LOGGER.debug(
-                    "Re-expansion skipped for '%s': turn-off phase in progress",
-                    group_name,
-                )
-                continue
+        async with self._expansion_lock:
+            for group_name in sorted(self._pending_expansion):
+                if sweep_slot(group_name, shards) == shard:
+                    await self._reexpand_group(group_name)
 
-            raw_targets = list(config_dict.get("targets", []))
-            expanded = tuple(expand_group_targets(self.hass, raw_targets))
-            previous = self._last_expanded_targets.get(group_name)
-            if previous == expanded:
-                continue
-            self._last_expanded_targets[group_name] = expanded
-            first_observation = previous is None
-            if first_observation:
-                _LOGGER.debug(
-                    "Initial expansion baseline for group '%s': %s",
-                    group_name,
-                    list(expanded),
-                )
-            else:
-                _LOGGER.info(
-                    "Target expansion changed for group '%s': %s -> %s",
-                    group_name,
-                    list(previous),
-                    list(expanded),
-                )
+    async def _reexpand_group(self, group_name: str) -> None:
+        config_dict = self._groups_data.get(group_name)
+        if config_dict is None:
+            self._pending_expansion.discard(group_name)
+            return
+        group_obj = self.auto_off._groups.get(group_name)
+        if group_obj is not None and group_obj.turning_off:
+            _LOGGER.debug(
+                "Re-expansion skipped for '%s': turn-off phase in progress",
+                group_name,
+            )
+            return
 
-            # 1) Refresh per-domain target group entities so the UI
-            #    reflects the new leaves.
-            try:
-                await self._sync_group_entities(group_name, config_dict, is_new=False)
-            except Exception as exc:  # noqa: BLE001
-                _LOGGER.warning(
-                    "Re-sync after target expansion change failed for '%s': %s",
-                    group_name,
-                    exc,
-                )
+        self._pending_expansion.discard(group_name)
+        raw_targets = list(config_dict.get("targets", []))
+        expanded = tuple(self.auto_off.expansion.expand(group_name, raw_targets))
+        previous = self._last_expanded_targets.get(group_name)
+        if previous == expanded:
+            return
+        self._last_expanded_targets[group_name] = expanded
+        first_observation = previous is None
+        if first_observation:
+            _LOGGER.debug(
+                "Initial expansion baseline for group '%s': %s",
+                group_name,
+                list(expanded),
+            )
+        else:
+            _LOGGER.info(
+                "Target expansion changed for group '%s': %s -> %s",
+                group_name,
+                list(previous),
+                list(expanded),
+            )
 
-            # 2) Rebuild SensorGroup.self._targets so the ensure-loop
-            #    iterates real leaves. We skip the no-op first-observation
-            #    case where the in-memory SensorGroup was already built
-            #    from the same raw config and matches our baseline.
-            if first_observation:
-                continue
-            try:
-                await self._rebuild_sensor_group_for_targets_change(group_name)
-            except Exception as exc:  # noqa: BLE001
-                _LOGGER.warning(
-                    "SensorGroup rebuild after target expansion change failed for '%s': %s",
-                    group_name,
-                    exc,
-                )
+        # 1) Refresh per-domain target group entities so the UI
+        #    reflects the new leaves.
+        try:
+            await self._sync_group_entities(group_name, config_dict, is_new=False)
+        except Exception as exc:  # noqa: BLE001
+            _LOGGER.warning(
+                "Re-sync after target expansion change failed for '%s': %s",
+                group_name,
+                exc,
+            )
 
-    async def _rebuild_sensor_group_for_targets_change(self, group_name: str) -> None:
-        """Rebuild a single SensorGroup so its self._targets reflects the
-        currently-observable expansion. Re-running the full
-        ``async_init_groups`` would also work but rebuilds every group;
-        we only need to touch the one whose composition changed."""
-        from .auto_off import SensorGroup
-
-        existing = self.auto_off._groups.get(group_name)
-        if existing is None:
+        # 2) Rebuild SensorGroup.self._targets so the ensure-loop
+        #    iterates real leaves. We skip the no-op first-observation
+        #    case where the in-memory SensorGroup was already built
+        #    from the same raw config and matches our baseline.
+        if first_observation:
             return
         try:
-            await existing.async_unload()
+            await self._rebuild_sensor_group_for_targets_change(group_name)
         except Exception as exc:  # noqa: BLE001
             _LOGGER.warning(
-                "Unload before targets-expansion rebuild failed for '%s': %s",
+                "SensorGroup rebuild after target expansion change failed for '%s': %s",
                 group_name,
                 exc,
             )
 
-        new_group = SensorGroup(
-            self.hass,
-            group_name,
-            self.auto_off.config[group_name],
-            on_deadline_change=self.auto_off._on_deadline_change,
-            manager=self,
-        )
-        self.auto_off._groups[group_name] = new_group
+    async def _rebuild_sensor_group_for_targets_change(self, group_name: str) -> None:
+        """Update a single SensorGroup so its self._targets reflects the
+        currently-observable expansion. ``async_set_group`` re-expands
+        the unchanged config in place, so only the leaves that appeared
+        or disappeared are subscribed / released."""
+        if group_name not in self.auto_off._groups:
+            return
+        await self.auto_off.async_set_group(group_name, self.auto_off.config[group_name])
 
     def _update_deadline_sensor_for_group(self, group_name: str) -> None:
         """Update deadline sensor for a specific group."""
@@ -416,17 +550,32 @@ class IntegrationManager:
             else:
                 deadline_entity.update_deadline(deadline_str)
 
-    async def set_group(self, group_name: str, config_dict: dict, is_new: bool) -> None:
-        """Create or update a group."""
+    async def set_group(
+        self,
+        group_name: str,
+        config_dict: dict,
+        is_new: bool,
+        *,
+        group_config: GroupConfig | None = None,
+    ) -> None:
+        """Create or update a group.
+
+        ``group_config`` is the already-validated form of ``config_dict``
+        when the caller has one (service handlers); otherwise the dict is
+        validated here.
+        """
         try:
-            group_config = GroupConfig.model_validate(config_dict)
+            if group_config is None:
+                group_config = GroupConfig.model_validate(config_dict)
 
-            # Update internal state
+            # Update internal state; the store saves on its own schedule.
             self._groups_data[group_name] = config_dict
+            self._group_configs[group_name] = group_config
+            self._store.async_set_group(group_name, config_dict)
 
-            # Update AutoOffManager (awaits unload of old groups)
-            self.auto_off.config[group_name] = group_config
-            await self.auto_off.async_init_groups()
+            # Rebuild only this group; other groups keep their live
+            # timers and subscriptions.
+            await self.auto_off.async_set_group(group_name, group_config)
 
             # Trigger immediate state check for new group
             if is_new:
@@ -470,46 +619,70 @@ class IntegrationManager:
             raise
 
     def get_group_config(self, group_name: str) -> GroupConfig | None:
-        """Return the active GroupConfig for a group, or None if absent."""
-        config_dict = self._groups_data.get(group_name)
-        if config_dict is None:
-            return None
-        try:
-            return GroupConfig.model_validate(config_dict)
-        except Exception as exc:  # noqa: BLE001 — defensive; manager must not crash
-            _LOGGER.warning("Invalid stored config for group '%s': %s", group_name, exc)
-            return None
+        """Return the active GroupConfig for a group, or None if absent.
+
+        Served from the validated cache; invalid stored configs were
+        reported by ``parse_group_configs`` at load time and are absent.
+        """
+        return self._group_configs.get(group_name)
 
     async def update_group_config(self, group_name: str, config_dict: dict) -> None:
         """Update group config from text entity edit or set_group service."""
         await self.set_group(group_name, config_dict, is_new=False)
 
-        # Also update config entry
-        current_groups = dict(self.entry.data.get(CONF_GROUPS, {}))
-        current_groups[group_name] = config_dict
-        new_data = dict(self.entry.data)
-        new_data[CONF_GROUPS] = current_groups
-        self.hass.config_entries.async_update_entry(self.entry, data=new_data)
-
         # Refresh UI attributes on the deadline sensor.
         deadline_entity = self._deadline_entities.get(group_name)
         if deadline_entity is not None:
             deadline_entity.async_write_ha_state()
 
+    async def apply_groups(
+        self,
+        changed: dict[str, dict],
+        deleted: list[str],
+        configs: dict[str, GroupConfig] | None = None,
+    ) -> list[str]:
+        """Apply a bulk change produced by the ``apply_groups`` service.
+
+        The caller has already validated every config. The group store
+        coalesces the per-group writes into one delayed save. Deletions
+        run first, then only the groups in ``changed`` are created or
+        updated; every other group is left untouched. ``configs`` carries
+        the validated form of each entry in ``changed``. A failing group
+        is logged and skipped so the rest of the batch still lands.
+        Returns the names that failed.
+        """
+        configs = configs or {}
+        failed: list[str] = []
+        for group_name in deleted:
+            try:
+                await self.delete_group(group_name)
+            except Exception:  # noqa: BLE001 - logged by delete_group
+                failed.append(group_name)
+        for group_name, config_dict in changed.items():
+            try:
+                await self.set_group(
+                    group_name,
+                    config_dict,
+                    is_new=group_name not in self._groups_data,
+                    group_config=configs.get(group_name),
+                )
+            except Exception:  # noqa: BLE001 - logged by set_group
+                failed.append(group_name)
+        return failed
+
     async def delete_group(self, group_name: str) -> None:
         """Delete a group."""
         try:
             # Remove from internal state
             if group_name in self._groups_data:
                 del self._groups_data[group_name]
+            self._group_configs.pop(group_name, None)
+            self._store.async_delete_group(group_name)
 
-            # Remove from AutoOffManager
-            if group_name in self.auto_off.config:
-                # Unload the group first
-                if group_name in self.auto_off._groups:
-                    await self.auto_off._groups[group_name].async_unload()
-                    del self.auto_off._groups[group_name]
-                del self.auto_off.config[group_name]
+            # Remove from AutoOffManager (unloads this group only)
+            await self.auto_off.async_remove_group(group_name)
+            self._last_expanded_targets.pop(group_name, None)
+            self._pending_expansion.discard(group_name)
 
             # Remove deadline entity
             if group_name in self._deadline_entities:
@@ -557,9 +730,18 @@ class IntegrationManager:
 
     async def async_unload(self):
         """Unload the integration manager."""
+        self._persist_deadlines = False
+        if self._cancel_on_started is not None:
+            self._cancel_on_started()
+            self._cancel_on_started = None
         if self._remove_listener:
             self._remove_listener()
             self._remove_listener = None
+        if self._expansion_task is not None and not self._expansion_task.done():
+            self._expansion_task.cancel()
+        self._expansion_task = None
         await self.auto_off.async_unload()
+        await self._store.async_flush()
+        await self._deadline_store.async_flush()
         self._deadline_entities.clear()
         self._text_entities.clear()
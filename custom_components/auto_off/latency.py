@@ -0,0 +1,87 @@
+"""Per-target turn-off latency statistics.
+
+The ensure-off loop used to give every leaf the same
+``ENSURE_INTERVAL_SEC`` before deciding it was stuck and retrying it.
+Devices differ by two orders of magnitude: a Zigbee bulb confirms
+``off`` in a few hundred milliseconds, a cloud-polled switch may take
+twenty seconds. Each :class:`~.auto_off.Target` therefore keeps a
+:class:`TurnOffLatency`: the time from a ``turn_off`` request to the
+state event that reports the entity off, over a rolling window of the
+most recent turn-offs. A leaf counts as stuck once it has been waiting
+longer than its p95 times ``LATENCY_STUCK_FACTOR``, so fast devices
+are retried quickly and slow ones are not retried before they had a
+fair chance to answer.
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Any
+
+# Turn-offs remembered per target.
+LATENCY_SAMPLES = 32
+# Below this many samples the fixed default timeout is used.
+LATENCY_MIN_SAMPLES = 3
+# Stuck threshold as a multiple of the observed p95.
+LATENCY_STUCK_FACTOR = 3.0
+# Floor for the stuck threshold so sub-second p95s do not turn event
+# delivery jitter into retries.
+LATENCY_MIN_STUCK_SEC = 1.0
+
+
+class TurnOffLatency:
+    """Rolling time-to-off samples of one target.
+
+    ``horizon`` bounds a valid sample: a confirmation arriving later
+    than that after the request is treated as an unrelated manual
+    turn-off and dropped.
+    """
+
+    def __init__(self, horizon: float, size: int = LATENCY_SAMPLES) -> None:
+        self._horizon = horizon
+        self._samples: deque[float] = deque(maxlen=size)
+        self._requested_at: float | None = None
+
+    def request(self, now: float) -> None:
+        """A turn-off was requested at ``now`` (monotonic seconds)."""
+        self._requested_at = now
+
+    def confirm(self, now: float) -> float | None:
+        """The target reported off at ``now``; return the recorded sample."""
+        requested_at, self._requested_at = self._requested_at, None
+        if requested_at is None:
+            return None
+        sample = now - requested_at
+        if sample < 0 or sample > self._horizon:
+            return None
+        self._samples.append(sample)
+        return sample
+
+    def percentile(self, q: float) -> float | None:
+        """Nearest-rank ``q`` percentile of the samples, None without any."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(q / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def stuck_after(self, default: float, ceiling: float) -> float:
+        """Seconds to wait for an off confirmation before retrying."""
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return default
+        p95 = self.percentile(95)
+        return min(max(p95 * LATENCY_STUCK_FACTOR, LATENCY_MIN_STUCK_SEC), ceiling)
+
+    @property
+    def samples(self) -> int:
+        return len(self._samples)
+
+    def stats(self, default: float, ceiling: float) -> dict[str, Any]:
+        return {
+            "samples": len(self._samples),
+            "p50": self.percentile(50),
+            "p95": self.percentile(95),
+            "max": max(self._samples, default=None),
+            "stuck_after": self.stuck_after(default, ceiling),
+        }
@@ -0,0 +1,117 @@
+"""Manager-wide rate limit for turn_off service calls.
+
+When many deadlines expire together (every group with the same delay
+after everyone went to bed) each group dispatches its turn-offs and
+ensure-loop retries at once, and the Zigbee / Z-Wave coordinators drop
+commands under the burst, which only causes more retries.
+:class:`TurnOffRateLimiter` spreads such bursts: every turn-off and
+retry call takes a token from one manager-wide bucket and, if a rate is
+configured for its domain, from that domain's bucket as well.
+
+Buckets hand out reservations: a caller that finds no token books the
+next one and sleeps until it is due, so waiting callers are served in
+arrival order without a queue object. A cancelled waiter returns its
+token.
+
+Tokens stand for radio commands, not service calls: a call addressing
+a group entity costs one token per member it switches, and calls to
+helper domains that never reach a radio (``UNMETERED_DOMAINS``) are
+free.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Any
+
+# Domains whose turn_off is handled inside Home Assistant (toggle
+# helpers, scenes, automations) and never becomes a radio command.
+UNMETERED_DOMAINS = frozenset({"automation", "input_boolean", "scene", "script", "timer"})
+
+
+class _TokenBucket:
+    """``rate`` tokens per second, holding at most ``burst``."""
+
+    def __init__(self, rate: float, burst: float) -> None:
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+
+    def reserve(self, now: float, count: int = 1) -> float:
+        """Take ``count`` tokens; return the seconds until they are available."""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= count
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, count: int = 1) -> None:
+        self._tokens = min(self.burst, self._tokens + count)
+
+
+class TurnOffRateLimiter:
+    """Token buckets shared by every group's turn-off calls.
+
+    ``rate`` (commands per second, None for unlimited) applies to all
+    calls together; ``domain_rates`` adds a tighter limit for single
+    domains, e.g. ``{"light": 5}`` for a slow Zigbee mesh.
+    """
+
+    def __init__(
+        self,
+        rate: float | None,
+        burst: float,
+        domain_rates: dict[str, float] | None = None,
+    ) -> None:
+        self._global = None if rate is None else _TokenBucket(rate, burst)
+        self._domains = {domain: _TokenBucket(limit, burst) for domain, limit in (domain_rates or {}).items()}
+        self._queued = 0
+        self._max_queued = 0
+        self._calls = 0
+        self._delayed = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+
+    async def acquire(self, domain: str, count: int = 1) -> float:
+        """Wait for ``count`` turn_off commands to ``domain``; return the seconds waited.
+
+        A batched call addressing several entities takes one token per
+        entity, since each still costs a radio command. Unmetered
+        domains and a zero ``count`` pass straight through.
+        """
+        if count <= 0 or domain in UNMETERED_DOMAINS:
+            return 0.0
+        now = time.monotonic()
+        buckets = [b for b in (self._global, self._domains.get(domain)) if b is not None]
+        wait = max((bucket.reserve(now, count) for bucket in buckets), default=0.0)
+        self._calls += 1
+        if wait <= 0:
+            return 0.0
+        self._delayed += 1
+        self._queued += 1
+        self._max_queued = max(self._max_queued, self._queued)
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            for bucket in buckets:
+                bucket.refund(count)
+            raise
+        finally:
+            self._queued -= 1
+        self._wait_total += wait
+        self._wait_max = max(self._wait_max, wait)
+        return wait
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "rate": None if self._global is None else self._global.rate,
+            "domain_rates": {domain: bucket.rate for domain, bucket in self._domains.items()},
+            "calls": self._calls,
+            "delayed": self._delayed,
+            "queued": self._queued,
+            "max_queued": self._max_queued,
+            "wait_seconds_total": self._wait_total,
+            "wait_seconds_max": self._wait_max,
+        }
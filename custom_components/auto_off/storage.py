@@ -0,0 +1,171 @@
+"""Persistent storage for auto_off group definitions and deadlines.
+
+Group configs used to live in ``entry.data[CONF_GROUPS]``, so every
+``set_group`` / ``delete_group`` / delay edit rewrote
+``.storage/core.config_entries`` — a file shared with every other
+integration. They now live in their own ``.storage/auto_off.groups``
+file written through ``Store.async_delay_save``: a burst of edits
+collapses into one write ``SAVE_DELAY`` seconds after the last one.
+
+Running deadlines are kept the same way in ``.storage/auto_off.deadlines``
+as wall-clock timestamps, so a restart resumes them instead of starting
+a fresh full delay.
+"""
+
+from __future__ import annotations
+
+import datetime
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import CONF_GROUPS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.groups"
+DEADLINES_STORAGE_KEY = f"{DOMAIN}.deadlines"
+SAVE_DELAY = 10
+
+
+class GroupStore:
+    """In-memory group definitions backed by a delayed-save ``Store``.
+
+    ``groups`` maps group name to the stored config dict (the same
+    shape ``entry.data[CONF_GROUPS]`` used to hold). Mutators update it
+    immediately and schedule a debounced save.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self.groups: dict[str, dict] = {}
+        self._dirty = False
+
+    async def async_load(self) -> bool:
+        """Load groups from disk. Returns False when no file exists yet."""
+        data = await self._store.async_load()
+        if data is None:
+            return False
+        self.groups = dict(data.get(CONF_GROUPS, {}))
+        return True
+
+    @callback
+    def async_set_group(self, group_name: str, config_dict: dict) -> None:
+        self.groups[group_name] = config_dict
+        self._schedule_save()
+
+    @callback
+    def async_delete_group(self, group_name: str) -> None:
+        if self.groups.pop(group_name, None) is not None:
+            self._schedule_save()
+
+    async def async_save(self) -> None:
+        """Write immediately, superseding any pending delayed save."""
+        self._dirty = False
+        await self._store.async_save(self._data_to_save())
+
+    async def async_flush(self) -> None:
+        """Write a pending delayed save now (entry unload)."""
+        if self._dirty:
+            await self.async_save()
+
+    async def async_remove(self) -> None:
+        """Delete the storage file (config entry removed)."""
+        await self._store.async_remove()
+
+    def _schedule_save(self) -> None:
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {CONF_GROUPS: self.groups}
+
+
+class DeadlineStore:
+    """Wall-clock deadline (ISO 8601) of every group with a running timer.
+
+    Fed by the groups' deadline-change notifications; Home Assistant
+    writes the pending delayed save on shutdown.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        self._store: Store[dict[str, Any]] = Store(hass, STORAGE_VERSION, DEADLINES_STORAGE_KEY)
+        self.deadlines: dict[str, str] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        data = await self._store.async_load()
+        self.deadlines = dict((data or {}).get("deadlines", {}))
+
+    def snapshot(self) -> dict[str, datetime.datetime]:
+        """Parsed copy of the stored deadlines; unparsable entries are dropped."""
+        result: dict[str, datetime.datetime] = {}
+        for group_name, raw in self.deadlines.items():
+            try:
+                deadline = datetime.datetime.fromisoformat(raw)
+            except (TypeError, ValueError):
+                _LOGGER.warning("Ignoring stored deadline %r of group '%s'", raw, group_name)
+                continue
+            if deadline.tzinfo is not None:
+                result[group_name] = deadline
+        return result
+
+    @callback
+    def async_set(self, group_name: str, deadline_iso: str | None) -> None:
+        if deadline_iso is None:
+            if self.deadlines.pop(group_name, None) is None:
+                return
+        elif self.deadlines.get(group_name) == deadline_iso:
+            return
+        else:
+            self.deadlines[group_name] = deadline_iso
+        self._dirty = True
+        self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    async def async_flush(self) -> None:
+        if self._dirty:
+            self._dirty = False
+            await self._store.async_save(self._data_to_save())
+
+    async def async_remove(self) -> None:
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        return {"deadlines": self.deadlines}
+
+
+async def async_load_group_store(
+    hass: HomeAssistant, entry: ConfigEntry, *, version: int | None = None
+) -> GroupStore:
+    """Load the group store, importing groups still held in ``entry.data``.
+
+    Used by both ``async_migrate_entry`` (v4 → v5, passing ``version``)
+    and ``async_setup_entry``, so an entry that is set up before its
+    migration step ran still ends up with its groups in the store. The
+    store wins if both exist: it is only ever written after an import.
+    ``entry.data`` is stripped of the groups (and the version bumped)
+    in a single ``async_update_entry`` call.
+    """
+    store = GroupStore(hass)
+    has_file = await store.async_load()
+    legacy = entry.data.get(CONF_GROUPS)
+
+    if legacy is not None:
+        if not has_file:
+            store.groups = dict(legacy)
+            await store.async_save()
+            _LOGGER.info("Moved %d auto_off groups from the config entry to %s", len(legacy), STORAGE_KEY)
+        new_data = {k: v for k, v in entry.data.items() if k != CONF_GROUPS}
+        if version is None:
+            hass.config_entries.async_update_entry(entry, data=new_data)
+        else:
+            hass.config_entries.async_update_entry(entry, data=new_data, version=version)
+    elif version is not None:
+        hass.config_entries.async_update_entry(entry, version=version)
+    return store
@@ -1,11 +1,13 @@
 """Pytest fixtures for auto_off tests."""
 
 import asyncio
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant, State
+
+from custom_components.auto_off.auto_off import GroupConfig, SensorGroup
 
 collect_ignore = [
     "test_e2e_playwright.py",
@@ -32,9 +34,114 @@ def hass():
     hass.services = MagicMock()
     hass.config_entries = MagicMock()
     hass.async_create_task = MagicMock()
+    # Needed by helpers.storage.Store (group store).
+    hass.config = MagicMock()
+    hass.bus = MagicMock()
+    hass.state = CoreState.running
     return hass
 
 
+@pytest.fixture
+def states():
+    """entity_id -> State map backing ``states_hass.states.get``."""
+    return {}
+
+
+@pytest.fixture
+def states_hass(states):
+    """Plain mock hass whose state machine is the ``states`` dict."""
+    hass = MagicMock()
+    hass.loop = MagicMock()
+    hass.loop.time = MagicMock(return_value=1000.0)
+    hass.states.get = MagicMock(side_effect=lambda eid: states.get(eid))
+    return hass
+
+
+@pytest.fixture
+def set_state(states):
+    """Put ``entity_id`` into ``states`` with the given state string."""
+
+    def _set(entity_id, value, attributes=None):
+        states[entity_id] = State(entity_id, value, attributes)
+
+    return _set
+
+
+@pytest.fixture
+def state_event(states):
+    """A state_changed event carrying the current ``states`` entry."""
+
+    def _event(entity_id):
+        event = MagicMock()
+        event.data = {"entity_id": entity_id, "new_state": states[entity_id]}
+        return event
+
+    return _event
+
+
+@pytest.fixture
+def make_loop_hass(states):
+    """Build a hass mock backed by the running event loop.
+
+    ``call_soon`` / ``call_later`` / ``async_create_task`` actually run.
+    Call the factory inside the test: fixtures may run on another loop.
+    """
+
+    def _make():
+        loop = asyncio.get_running_loop()
+        hass = MagicMock()
+        hass.loop = loop
+        hass.async_create_task = loop.create_task
+        hass.services.async_call = AsyncMock()
+        hass.states.get = MagicMock(side_effect=lambda eid: states.get(eid))
+        return hass
+
+    return _make
+
+
+@pytest.fixture
+def make_group():
+    """Build a SensorGroup and start its members off the real bus."""
+
+    async def _make(hass, config: GroupConfig, group_id: str = "hall") -> SensorGroup:
+        group = SensorGroup(hass, group_id, config, manager=None)
+        for member in (*group._sensors, *group._targets):
+            member._dispatcher = MagicMock()
+            await member.start_tracking()
+        return group
+
+    return _make
+
+
+@pytest.fixture
+def template_cls(monkeypatch):
+    """Counting stand-in for ``Template``; renders to ``True``."""
+    cls = MagicMock(name="Template")
+    cls.return_value.async_render = MagicMock(return_value=True)
+    monkeypatch.setattr("custom_components.auto_off.auto_off.Template", cls)
+    return cls
+
+
+@pytest.fixture
+def track_result(monkeypatch):
+    """Stand-in for ``async_track_template_result``."""
+    track = MagicMock(name="async_track_template_result")
+    monkeypatch.setattr("custom_components.auto_off.auto_off.async_track_template_result", track)
+    return track
+
+
+@pytest.fixture
+def template_update():
+    """The ``updates`` list a template tracker passes for one result."""
+
+    def _update(result):
+        update = MagicMock()
+        update.result = result
+        return [update]
+
+    return _update
+
+
 @pytest.fixture
 def config_entry():
     """Create a mock config entry."""
@@ -0,0 +1,121 @@
+"""Tests for the bulk ``auto_off.apply_groups`` service.
+
+Many groups are validated up front and only groups whose stored config
+changed reach the manager; the config entry itself is never written.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.auto_off import SERVICE_APPLY_GROUPS_SCHEMA, _async_register_services
+
+
+def _group(name, target, delay=5):
+    return {
+        "group_name": name,
+        "targets": [target],
+        "sensors": ["binary_sensor.m"],
+        "sensor_templates": [],
+        "delay": delay,
+    }
+
+
+def _stored(item):
+    return {k: v for k, v in item.items() if k != "group_name"}
+
+
+@pytest.fixture
+def entry():
+    entry = MagicMock(spec=ConfigEntry)
+    entry.entry_id = "auto-off-entry"
+    entry.data = {"poll_interval": 15}
+    entry.options = {}
+    return entry
+
+
+@pytest.fixture
+async def apply_groups(hass, entry):
+    """Return (handler, manager) for auto_off.apply_groups."""
+    registered: dict[str, object] = {}
+    hass.services.async_register = MagicMock(
+        side_effect=lambda domain, name, handler, **kw: registered.__setitem__(name, handler)
+    )
+    manager = MagicMock()
+    manager.groups_data = {
+        "kitchen": _stored(_group("kitchen", "light.kitchen")),
+        "hall": _stored(_group("hall", "light.hall")),
+    }
+    manager.apply_groups = AsyncMock(return_value=[])
+    hass.data = {"auto_off": manager}
+    await _async_register_services(hass, entry)
+
+    async def _call(**data):
+        call = MagicMock()
+        call.data = SERVICE_APPLY_GROUPS_SCHEMA(data)
+        return await registered["apply_groups"](call)
+
+    return _call, manager
+
+
+class TestApplyGroups:
+    async def test_only_changed_groups_reach_manager(self, hass, entry, apply_groups):
+        call, manager = apply_groups
+
+        result = await call(
+            groups=[
+                _group("kitchen", "light.kitchen"),  # unchanged
+                _group("hall", "light.hall", delay=9),  # updated
+                _group("office", "light.office"),  # created
+            ]
+        )
+
+        assert result["created"] == ["office"]
+        assert result["updated"] == ["hall"]
+        assert result["unchanged"] == 1
+        manager.apply_groups.assert_awaited_once()
+        changed, deleted = manager.apply_groups.await_args.args
+        assert set(changed) == {"hall", "office"}
+        assert deleted == []
+
+    async def test_one_manager_call_no_entry_write(self, hass, entry, apply_groups):
+        call, manager = apply_groups
+
+        await call(groups=[_group(f"g{i}", f"light.g{i}") for i in range(50)], delete=["hall"])
+
+        manager.apply_groups.assert_awaited_once()
+        changed, deleted = manager.apply_groups.await_args.args
+        assert len(changed) == 50
+        assert deleted == ["hall"]
+        hass.config_entries.async_update_entry.assert_not_called()
+
+    async def test_replace_deletes_unlisted_groups(self, hass, entry, apply_groups):
+        call, manager = apply_groups
+
+        result = await call(groups=[_group("kitchen", "light.kitchen")], replace=True)
+
+        assert result["deleted"] == ["hall"]
+        _, deleted = manager.apply_groups.await_args.args
+        assert deleted == ["hall"]
+
+    async def test_invalid_group_rejects_whole_batch(self, hass, entry, apply_groups):
+        call, manager = apply_groups
+        bad = _group("bad", "light.bad")
+        bad["sensors"] = []
+
+        with pytest.raises(ServiceValidationError):
+            await call(groups=[_group("office", "light.office"), bad])
+
+        manager.apply_groups.assert_not_awaited()
+
+    async def test_no_changes_skips_write(self, hass, entry, apply_groups):
+        call, manager = apply_groups
+
+        result = await call(groups=[_group("kitchen", "light.kitchen")], delete=["missing"])
+
+        assert result["unchanged"] == 1
+        manager.apply_groups.assert_not_awaited()
@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock
 
-from custom_components.auto_off.auto_off import GroupConfig, SensorGroup
+from custom_components.auto_off.auto_off import TURN_OFF_CONCURRENCY, GroupConfig, SensorGroup
+from custom_components.auto_off.turn_off_batch import TurnOffAggregator
 
 
 class TestTurnOffRoutingThroughGroups:
@@ -55,14 +57,110 @@ class TestTurnOffRoutingThroughGroups:
         group = SensorGroup(hass, "k", config, manager=manager)
         group._ensure_off_loop = AsyncMock()
 
-        # Replace Target.turn_off with a spy
-        target_spy = AsyncMock()
-        for target in group._targets:
-            target.turn_off = target_spy
+        await group._turn_off_targets()
+
+        # No group entity: the target is turned off by the per-domain
+        # fallback call.
+        hass.services.async_call.assert_awaited_once_with(
+            "scene", "turn_off", {"entity_id": ["scene.evening"]}, blocking=True
+        )
+
+    async def test_fallback_sends_one_call_per_domain(self, hass):
+        hass.services.async_call = AsyncMock()
+        manager = MagicMock()
+        manager.get_group_member_group_entity_ids.return_value = []
+        config = GroupConfig(
+            targets=["input_boolean.a", "input_boolean.b", "input_boolean.c", "scene.evening"],
+            sensors=["binary_sensor.m"],
+            sensor_templates=[],
+            delay=0,
+        )
+        group = SensorGroup(hass, "k", config, manager=manager)
+        group._ensure_off_loop = AsyncMock()
+
+        await group._turn_off_targets()
+
+        calls = {c.args[0]: c.args[2]["entity_id"] for c in hass.services.async_call.await_args_list}
+        assert calls == {
+            "input_boolean": ["input_boolean.a", "input_boolean.b", "input_boolean.c"],
+            "scene": ["scene.evening"],
+        }
+
+    async def test_aggregated_fallback_is_one_call_per_domain(self, make_loop_hass, set_state):
+        loop_hass = make_loop_hass()
+        targets = [f"input_boolean.b{i}" for i in range(TURN_OFF_CONCURRENCY * 5)]
+        for entity_id in targets:
+            set_state(entity_id, "on")
+        manager = MagicMock()
+        manager.get_group_member_group_entity_ids.return_value = []
+        config = GroupConfig(targets=targets, sensors=["binary_sensor.m"], delay=0)
+        aggregator = TurnOffAggregator(loop_hass, 0.01)
+        group = SensorGroup(loop_hass, "k", config, manager=manager, aggregator=aggregator)
+        group._ensure_off_loop = AsyncMock()
+
+        await group._turn_off_targets()
+
+        loop_hass.services.async_call.assert_awaited_once_with(
+            "input_boolean", "turn_off", {"entity_id": targets}, blocking=True
+        )
+
+    async def test_aggregated_retry_takes_no_slot(self, make_loop_hass, set_state):
+        loop_hass = make_loop_hass()
+        set_state("input_boolean.a", "on")
+        config = GroupConfig(targets=["input_boolean.a"], sensors=["binary_sensor.m"], delay=0)
+        group = SensorGroup(loop_hass, "k", config, manager=None, aggregator=TurnOffAggregator(loop_hass, 0))
+        for _ in range(TURN_OFF_CONCURRENCY):
+            await group._turn_off_slots.acquire()
+
+        await asyncio.wait_for(group._retry_turn_off(group._targets[0]), 1)
+
+        loop_hass.services.async_call.assert_awaited_once()
+
+    async def test_failed_batch_falls_back_to_single_calls(self, hass):
+        async def _call(domain, service, data, blocking):
+            if isinstance(data["entity_id"], list):
+                raise RuntimeError("one entity is broken")
+
+        hass.services.async_call = AsyncMock(side_effect=_call)
+        manager = MagicMock()
+        manager.get_group_member_group_entity_ids.return_value = []
+        config = GroupConfig(
+            targets=["input_boolean.a", "input_boolean.b"],
+            sensors=["binary_sensor.m"],
+            sensor_templates=[],
+            delay=0,
+        )
+        group = SensorGroup(hass, "k", config, manager=manager)
+        group._ensure_off_loop = AsyncMock()
 
         await group._turn_off_targets()
 
-        # No group service call was dispatched
-        assert hass.services.async_call.await_count == 0
-        # The per-target fallback was invoked
-        assert target_spy.await_count == 1
+        singles = [c.args[2]["entity_id"] for c in hass.services.async_call.await_args_list[1:]]
+        assert sorted(singles) == ["input_boolean.a", "input_boolean.b"]
+
+    async def test_group_and_fallback_calls_run_concurrently(self, hass):
+        """A mixed-domain room waits for its slowest call, not their sum."""
+        started = []
+        release = asyncio.Event()
+
+        async def _slow(*_args, **_kwargs):
+            started.append(1)
+            if len(started) == 2:
+                release.set()
+            await release.wait()
+
+        hass.services.async_call = AsyncMock(side_effect=_slow)
+        manager = MagicMock()
+        manager.get_group_member_group_entity_ids.return_value = ["light.auto_off_k_targets_light"]
+        config = GroupConfig(
+            targets=["light.a", "scene.evening"],
+            sensors=["binary_sensor.m"],
+            sensor_templates=[],
+            delay=0,
+        )
+        group = SensorGroup(hass, "k", config, manager=manager)
+        group._ensure_off_loop = AsyncMock()
+
+        await asyncio.wait_for(group._turn_off_targets(), 1)
+
+        assert len(started) == 2
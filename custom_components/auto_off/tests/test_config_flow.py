@@ -3,9 +3,15 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import voluptuous as vol
 
-from custom_components.auto_off.config_flow import AutoOffConfigFlow
-from custom_components.auto_off.const import CONF_GROUPS, CONF_POLL_INTERVAL
+from custom_components.auto_off.config_flow import AutoOffConfigFlow, format_domain_rates, parse_domain_rates
+from custom_components.auto_off.const import (
+    CONF_DOMAIN_TURN_OFF_RATES,
+    CONF_GROUPS,
+    CONF_POLL_INTERVAL,
+    CONF_TURN_OFF_RATE,
+)
 
 
 class TestAutoOffConfigFlow:
@@ -47,7 +53,8 @@ class TestAutoOffConfigFlow:
         call_kwargs = mock_create.call_args[1]
         assert call_kwargs["title"] == "Auto Off"
         assert call_kwargs["data"][CONF_POLL_INTERVAL] == 30
-        assert call_kwargs["data"][CONF_GROUPS] == {}
+        # Groups live in the dedicated group store, not in entry data.
+        assert CONF_GROUPS not in call_kwargs["data"]
 
     @pytest.mark.asyncio
     async def test_step_user_default_poll_interval(self, flow):
@@ -62,6 +69,26 @@ class TestAutoOffConfigFlow:
 
         call_kwargs = mock_create.call_args[1]
         assert call_kwargs["data"][CONF_POLL_INTERVAL] == 15  # default
+        # The turn-off rate limit starts off.
+        assert call_kwargs["data"][CONF_TURN_OFF_RATE] == 0
+        assert call_kwargs["data"][CONF_DOMAIN_TURN_OFF_RATES] == {}
+
+
+class TestDomainRates:
+    """The per-domain rates option is a ``domain: rate`` text field."""
+
+    def test_parse_round_trips(self):
+        rates = parse_domain_rates(" light: 5, switch:2.5 ,")
+        assert rates == {"light": 5.0, "switch": 2.5}
+        assert parse_domain_rates(format_domain_rates(rates)) == rates
+
+    def test_empty_text_is_no_limit(self):
+        assert parse_domain_rates("") == {}
+
+    @pytest.mark.parametrize("text", ["light", "light: fast", "light: 0", ": 5"])
+    def test_rejects_malformed_entries(self, text):
+        with pytest.raises(vol.Invalid):
+            parse_domain_rates(text)
 
 
 class TestAutoOffOptionsFlow:
@@ -0,0 +1,121 @@
+"""Tests for deadlines persisted across Home Assistant restarts.
+
+Running deadlines are recorded as wall-clock timestamps in a
+delayed-save store. On startup every saved deadline is resumed in one
+batched pass; those that expired while HA was down turn their targets
+off right away instead of waiting another full ``delay``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig
+from custom_components.auto_off.integration_manager import IntegrationManager
+from custom_components.auto_off.storage import DeadlineStore
+
+
+_CONFIG = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=30)
+
+
+class TestDeadlineStore:
+    async def test_records_and_clears_deadlines(self, hass):
+        with patch("homeassistant.helpers.storage.Store.async_delay_save", MagicMock()) as delay_save:
+            store = DeadlineStore(hass)
+            store.async_set("hall", "2026-01-01T10:00:00+01:00")
+            store.async_set("hall", "2026-01-01T10:00:00+01:00")  # unchanged: no save
+            store.async_set("kitchen", "2026-01-01T11:00:00+01:00")
+            store.async_set("kitchen", None)
+
+        assert store.deadlines == {"hall": "2026-01-01T10:00:00+01:00"}
+        assert delay_save.call_count == 3
+        assert store.snapshot() == {"hall": datetime.datetime.fromisoformat("2026-01-01T10:00:00+01:00")}
+
+    def test_snapshot_drops_unparsable_entries(self, hass):
+        store = DeadlineStore(hass)
+        store.deadlines = {"bad": "soon", "naive": "2026-01-01T10:00:00"}
+        assert store.snapshot() == {}
+
+
+class TestResumeDeadline:
+    async def test_future_deadline_is_resumed(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "off")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _CONFIG)
+
+        assert await group.async_resume_deadline(1060.0) is True
+        assert group._timer_deadline == 1060.0
+
+    async def test_expired_deadline_turns_off_now(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "off")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _CONFIG)
+        group._turn_off_targets = AsyncMock()
+
+        assert await group.async_resume_deadline(900.0) is True
+        await asyncio.sleep(0)
+
+        group._turn_off_targets.assert_awaited_once()
+
+    async def test_active_sensor_discards_saved_deadline(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _CONFIG)
+
+        assert await group.async_resume_deadline(1060.0) is False
+        assert group._timer is None
+
+    async def test_startup_deadline_is_replaced_activity_deadline_kept(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "off")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _CONFIG)
+
+        await group._set_deadline_from_delay("startup", lost_timer=True)
+        assert await group.async_resume_deadline(1060.0) is True
+        assert group._timer_deadline == 1060.0
+
+        await group._set_deadline_from_delay("sensors turning OFF")
+        assert await group.async_resume_deadline(1060.0) is False
+        assert group._timer_deadline == 1000.0 + 30 * 60
+
+
+class TestRestorePass:
+    async def test_manager_resumes_all_saved_groups_in_one_pass(self, hass):
+        manager = AutoOffManager(hass, {})
+        hall, kitchen = MagicMock(group_id="hall"), MagicMock(group_id="kitchen")
+        hall.async_resume_deadline = AsyncMock(return_value=True)
+        kitchen.async_resume_deadline = AsyncMock(return_value=True)
+        manager._groups = {"hall": hall, "kitchen": kitchen}
+        now = datetime.datetime.now(datetime.UTC)
+
+        resumed = await manager.async_restore_deadlines(
+            {
+                "hall": now - datetime.timedelta(minutes=5),
+                "kitchen": now + datetime.timedelta(minutes=1),
+                "gone": now,
+            }
+        )
+
+        assert resumed == 2
+        assert hall.async_resume_deadline.await_args.args[0] < hass.loop.time()
+        assert kitchen.async_resume_deadline.await_args.args[0] > hass.loop.time()
+
+    async def test_unload_keeps_persisted_deadlines(self, hass):
+        entry = MagicMock()
+        entry.data = {"poll_interval": 15}
+        deadline_store = MagicMock()
+        manager = IntegrationManager(hass, entry, deadline_store=deadline_store)
+        deadline_store.async_flush = AsyncMock()
+
+        manager._on_deadline_change("hall", "2026-01-01T10:00:00+01:00")
+        deadline_store.async_set.assert_called_once_with("hall", "2026-01-01T10:00:00+01:00")
+
+        manager.auto_off = MagicMock(async_unload=AsyncMock())
+        manager._store = MagicMock(async_flush=AsyncMock())
+        await manager.async_unload()
+        manager._on_deadline_change("hall", None)
+
+        deadline_store.async_set.assert_called_once()
+        deadline_store.async_flush.assert_awaited_once()
@@ -0,0 +1,109 @@
+"""Tests for the manager-wide ``DeadlineScheduler``.
+
+Every group's deadline lives in one heap behind a single armed loop
+timer. Reschedules and cancels only bump a version; stale heap entries
+are skipped when the timer fires.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.auto_off.auto_off import DeadlineScheduler, GroupConfig, SensorGroup
+
+
+@pytest.fixture
+def clock():
+    return {"now": 1000.0}
+
+
+@pytest.fixture
+def loop_hass(clock):
+    hass = MagicMock()
+    hass.loop = MagicMock()
+    hass.loop.time = MagicMock(side_effect=lambda: clock["now"])
+    hass.loop.call_at = MagicMock(side_effect=lambda when, cb: MagicMock(name=f"handle@{when}"))
+    return hass
+
+
+def _fire(scheduler, clock, at):
+    clock["now"] = at
+    scheduler._fire()
+
+
+class TestDeadlineScheduler:
+    def test_one_timer_armed_for_earliest_deadline(self, loop_hass):
+        scheduler = DeadlineScheduler(loop_hass)
+
+        scheduler.schedule("a", 1300.0, MagicMock())
+        scheduler.schedule("b", 1100.0, MagicMock())
+        scheduler.schedule("c", 1200.0, MagicMock())
+
+        armed = [c.args[0] for c in loop_hass.loop.call_at.call_args_list]
+        assert armed == [1300.0, 1100.0]
+        assert scheduler.stats["armed_at"] == 1100.0
+
+    def test_extending_deadline_does_not_rearm(self, loop_hass):
+        scheduler = DeadlineScheduler(loop_hass)
+        scheduler.schedule("a", 1100.0, MagicMock())
+
+        scheduler.schedule("a", 1400.0, MagicMock())
+        scheduler.schedule("a", 1500.0, MagicMock())
+
+        assert loop_hass.loop.call_at.call_count == 1
+
+    def test_fire_dispatches_due_groups_and_rearms(self, loop_hass, clock):
+        scheduler = DeadlineScheduler(loop_hass)
+        a, b, c = MagicMock(), MagicMock(), MagicMock()
+        scheduler.schedule("a", 1100.0, a)
+        scheduler.schedule("b", 1100.0, b)
+        scheduler.schedule("c", 1500.0, c)
+
+        _fire(scheduler, clock, 1100.0)
+
+        a.assert_called_once()
+        b.assert_called_once()
+        c.assert_not_called()
+        assert loop_hass.loop.call_at.call_args.args[0] == 1500.0
+
+    def test_stale_entries_are_skipped(self, loop_hass, clock):
+        scheduler = DeadlineScheduler(loop_hass)
+        first, moved, cancelled = MagicMock(), MagicMock(), MagicMock()
+        scheduler.schedule("a", 1100.0, first)
+        scheduler.schedule("a", 1300.0, moved)
+        handle = scheduler.schedule("b", 1100.0, cancelled)
+        handle.cancel()
+
+        _fire(scheduler, clock, 1100.0)
+
+        first.assert_not_called()
+        cancelled.assert_not_called()
+        assert loop_hass.loop.call_at.call_args.args[0] == 1300.0
+
+        _fire(scheduler, clock, 1300.0)
+        moved.assert_called_once()
+        assert scheduler.stats["scheduled"] == 0
+
+    def test_heap_compacts_under_reschedule_churn(self, loop_hass):
+        scheduler = DeadlineScheduler(loop_hass)
+        for i in range(1000):
+            scheduler.schedule("a", 2000.0 + i, MagicMock())
+
+        assert scheduler.stats["heap_size"] <= 2 + 64 + 1
+
+
+class TestGroupUsesScheduler:
+    async def test_group_deadline_goes_through_scheduler(self, loop_hass):
+        scheduler = DeadlineScheduler(loop_hass)
+        config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=5)
+        group = SensorGroup(loop_hass, "hall", config, scheduler=scheduler)
+
+        group._start_deadline(force_deadline=1300.0)
+        assert group._timer_deadline == 1300.0
+        assert scheduler.stats["scheduled"] == 1
+
+        assert group._cancel_deadline() is True
+        assert scheduler.stats["scheduled"] == 0
+        loop_hass.loop.call_later.assert_not_called()
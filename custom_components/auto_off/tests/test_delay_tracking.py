@@ -0,0 +1,73 @@
+"""Tests for reactive delay tracking.
+
+A template ``delay`` is tracked with ``async_track_template_result``;
+``get_delay`` returns the cached value and a change moves a running
+deadline by the difference between the new and old delay.
+"""
+
+from __future__ import annotations
+
+import pytest
+from homeassistant.exceptions import TemplateError
+
+from custom_components.auto_off.auto_off import GroupConfig, SensorGroup
+
+
+@pytest.fixture
+def template_cls(template_cls):
+    template_cls.return_value.async_render.return_value = 10
+    return template_cls
+
+
+async def _group(hass):
+    config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay="{{ states('input_number.d') }}")
+    group = SensorGroup(hass, "g", config, manager=None)
+    await group._start_delay_tracking()
+    return group
+
+
+class TestDelayTracking:
+    async def test_get_delay_reads_cache(self, hass, template_cls, track_result):
+        group = await _group(hass)
+        render = group._delay_template.async_render
+        render.reset_mock()
+
+        assert await group.get_delay() == 600
+        render.assert_not_called()
+        track_result.assert_called_once()
+
+    async def test_change_updates_cache_without_deadline(self, hass, template_cls, track_result, template_update):
+        group = await _group(hass)
+
+        await group._handle_delay_result(None, template_update(3))
+
+        assert await group.get_delay() == 180
+        assert group._timer is None
+
+    async def test_running_deadline_moves_by_difference(self, hass, template_cls, track_result, template_update):
+        group = await _group(hass)
+        await group._set_deadline_from_delay("test")
+        assert group._timer_deadline == 1000.0 + 600
+
+        await group._handle_delay_result(None, template_update(15))
+
+        assert group._timer_deadline == 1000.0 + 900
+        assert hass.loop.call_later.call_args.args[0] == 900.0
+
+    async def test_render_error_keeps_previous_delay(self, hass, template_cls, track_result, template_update):
+        group = await _group(hass)
+        await group._set_deadline_from_delay("test")
+
+        await group._handle_delay_result(None, template_update(TemplateError("boom")))
+        await group._handle_delay_result(None, template_update("soon"))
+
+        assert await group.get_delay() == 600
+        assert group._timer_deadline == 1000.0 + 600
+
+    async def test_unload_stops_tracking(self, hass, template_cls, track_result):
+        group = await _group(hass)
+        remove = track_result.return_value.async_remove
+
+        await group.async_unload()
+
+        remove.assert_called_once()
@@ -65,6 +65,7 @@ async def hass_with_service(hass, entry_with_groups):
     manager = MagicMock()
     manager.set_group = AsyncMock()
     manager.delete_group = AsyncMock()
+    manager.groups_data = entry_with_groups.data["groups"]
     hass.data = {"auto_off": manager}
 
     await _async_register_services(hass, entry_with_groups)
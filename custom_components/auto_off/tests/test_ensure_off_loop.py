@@ -6,17 +6,17 @@ reaches ``off`` or sensors come back on. The loop is driven by two
 per-group seconds-scale settings:
 
 * ``ensure_window`` (default 60s) caps how long the loop runs.
-* ``ensure_interval`` (default 10s, must be > 0) is the pause between
-  retry passes.
+* ``ensure_interval`` (default 10s, must be > 0) is how long one pass
+  waits for the pending targets to confirm ``off`` before retrying the
+  ones that did not. A pass ends as soon as the last target confirms.
 
 The contract is documented in
 ``docs/superpowers/specs/2026-05-16-ensure-off-loop-design.md``. Each
 test below pins one observable property of that contract.
 
 Tests use the same ``MagicMock``-based ``hass`` fixture as the rest of
-the unit suite. The asyncio sleep used inside the loop is monkey-
-patched so we can step it forward deterministically without the real
-clock.
+the unit suite. Targets are stubbed: their ``async_wait_off`` answers
+from a scripted sequence, so no test waits on the real clock.
 """
 
 from __future__ import annotations
@@ -59,12 +59,16 @@ def _build_group(
     return group
 
 
-def _replace_targets_with_stubs(group, target_states):
+def _replace_targets_with_stubs(group, target_states, on_wait=None):
     """Replace ``group._targets`` with stubs whose ``is_on`` returns the
     next element of ``target_states[entity_id]`` each call.
 
-    Each stub also exposes an ``AsyncMock`` ``turn_off`` so tests can
-    assert on retry counts.
+    ``async_wait_off`` consumes the same sequence (confirmed when the
+    next element is ``False``) and records the timeout it was given;
+    ``on_wait(timeout)`` runs for every wait that times out. Stubs have
+    no latency history, so ``stuck_after`` is the 10s default. Each
+    stub also exposes an ``AsyncMock`` ``turn_off`` so tests can assert
+    on retry counts.
     """
     new_targets = []
     for target in group._targets:
@@ -77,6 +81,18 @@ def _replace_targets_with_stubs(group, target_states):
         stub = MagicMock()
         stub.entity_id = eid
         stub.is_on = _is_on
+        stub.waits = []
+
+        async def _wait_off(timeout, _is_on=_is_on, _waits=stub.waits):
+            _waits.append(timeout)
+            if await _is_on():
+                if on_wait is not None:
+                    on_wait(timeout)
+                return False
+            return True
+
+        stub.async_wait_off = _wait_off
+        stub.stuck_after = MagicMock(return_value=10)
         stub.turn_off = AsyncMock()
         new_targets.append(stub)
     group._targets = new_targets
@@ -110,48 +126,40 @@ class TestEnsureLoopHappyPath:
         )
         _stub_sensors(group, True)
 
-        sleep_calls: list[float] = []
-
-        async def _fast_sleep(delay):
-            sleep_calls.append(delay)
-
-        with patch("asyncio.sleep", _fast_sleep):
+        sleep = AsyncMock()
+        with patch("asyncio.sleep", sleep):
             await group._ensure_off_loop()
 
-        # One sleep happened (the loop slept once before checking).
-        assert sleep_calls == [10]
+        # One confirmation wait, bounded by the interval; no fixed sleep.
+        assert targets[0].waits == [10]
+        sleep.assert_not_awaited()
         # No retry was issued.
         targets[0].turn_off.assert_not_called()
 
 
 class TestEnsureLoopRetriesTarget:
-    """If a target is still on after the initial dispatch, the loop must
-    retry per-target until it goes off."""
+    """If a target does not confirm off, the loop must retry
+    per-target until it does."""
 
     async def test_single_retry_then_off(self, hass):
         group = _build_group(hass)
         targets = _replace_targets_with_stubs(
             group,
-            # First check: on (needs retry). Second check: off.
+            # First wait: still on (needs retry). Second wait: off.
             {"light.kitchen": [True, False]},
         )
         _stub_sensors(group, True)
 
-        sleep_calls: list[float] = []
-
-        async def _fast_sleep(delay):
-            sleep_calls.append(delay)
+        await group._ensure_off_loop()
 
-        with patch("asyncio.sleep", _fast_sleep):
-            await group._ensure_off_loop()
-
-        # Loop slept twice (one per check pass that found work).
-        assert sleep_calls == [10, 10]
+        # One wait per pass that found work.
+        assert len(targets[0].waits) == 2
         # Retry happened exactly once.
         targets[0].turn_off.assert_awaited_once()
 
     async def test_retries_only_still_on_targets(self, hass):
-        """A group with two targets retries only the one still on."""
+        """A group with two targets retries, and waits again for, only
+        the one still on."""
         group = _build_group(hass, targets=("light.a", "light.b"))
         targets = _replace_targets_with_stubs(
             group,
@@ -162,15 +170,53 @@ class TestEnsureLoopRetriesTarget:
         )
         _stub_sensors(group, True)
 
-        async def _fast_sleep(delay):
-            return None
-
-        with patch("asyncio.sleep", _fast_sleep):
-            await group._ensure_off_loop()
+        await group._ensure_off_loop()
 
         targets[0].turn_off.assert_not_called()
+        assert len(targets[0].waits) == 1
         targets[1].turn_off.assert_awaited_once()
 
+    async def test_retries_are_dispatched_concurrently(self, hass):
+        group = _build_group(hass, targets=("light.a", "switch.b"))
+        targets = _replace_targets_with_stubs(
+            group, {"light.a": [True, False], "switch.b": [True, False]}
+        )
+        _stub_sensors(group, True)
+        in_flight = []
+        release = asyncio.Event()
+
+        async def _slow_turn_off():
+            in_flight.append(1)
+            if len(in_flight) == 2:
+                release.set()
+            await release.wait()
+
+        for target in targets:
+            target.turn_off = AsyncMock(side_effect=_slow_turn_off)
+
+        await asyncio.wait_for(group._ensure_off_loop(), 1)
+
+        assert len(in_flight) == 2
+
+
+class TestEnsureLoopLatency:
+    """Each target waits for its own learned stuck threshold."""
+
+    async def test_fast_target_retried_on_its_own_timeout(self, hass):
+        group = _build_group(hass, targets=("light.bulb", "switch.cloud"))
+        targets = _replace_targets_with_stubs(
+            group, {"light.bulb": [True, False], "switch.cloud": [False]}
+        )
+        targets[0].stuck_after.return_value = 0.6
+        targets[1].stuck_after.return_value = 45
+        _stub_sensors(group, True)
+
+        await group._ensure_off_loop()
+
+        assert targets[0].waits == [0.6, 0.6]
+        assert targets[1].waits == [45]
+        targets[0].turn_off.assert_awaited_once()
+
 
 class TestEnsureLoopAbortsOnSensorReclaim:
     """When sensors come back on, the loop must stand down without
@@ -187,11 +233,7 @@ class TestEnsureLoopAbortsOnSensorReclaim:
         # all_sensors_off is False from the very first check.
         _stub_sensors(group, False)
 
-        async def _fast_sleep(delay):
-            return None
-
-        with patch("asyncio.sleep", _fast_sleep):
-            await group._ensure_off_loop()
+        await group._ensure_off_loop()
 
         # No retry: sensor guard fired before the still_on check ran a
         # turn_off.
@@ -204,26 +246,26 @@ class TestEnsureLoopWindowExpires:
 
     async def test_six_retries_for_60s_window_10s_interval(self, hass):
         # Defaults are ENSURE_WINDOW_SEC=60 / ENSURE_INTERVAL_SEC=10.
+        # Advance a virtual clock by every timed-out wait so the
+        # while-loop exits after 6 passes.
+        fake_time = {"now": 0.0}
+
+        def _fake_monotonic():
+            return fake_time["now"]
+
+        def _advance(timeout):
+            fake_time["now"] += timeout
+
         group = _build_group(hass)
         targets = _replace_targets_with_stubs(
             group,
             # Always on; loop must keep retrying until the window is up.
             {"light.kitchen": [True]},
+            on_wait=_advance,
         )
         _stub_sensors(group, True)
 
-        # Advance a virtual clock so the while-loop exits after 6 passes.
-        fake_time = {"now": 0.0}
-
-        def _fake_monotonic():
-            return fake_time["now"]
-
-        async def _fast_sleep(delay):
-            fake_time["now"] += delay
-
-        with patch("asyncio.sleep", _fast_sleep), patch(
-            "time.monotonic", _fake_monotonic
-        ):
+        with patch("time.monotonic", _fake_monotonic):
             await group._ensure_off_loop()
 
         # Window = 60s, interval = 10s → at most 6 passes that hit retry.
@@ -241,12 +283,19 @@ class TestEnsureLoopCancellation:
             group, {"light.kitchen": [True]}
         )
         _stub_sensors(group, True)
+        never = asyncio.Event()
+
+        async def _pending_wait(timeout):
+            await never.wait()
 
-        # Start the loop as a real task; wait until it's parked in sleep.
+        targets[0].async_wait_off = _pending_wait
+
+        # Start the loop as a real task; wait until it's parked waiting
+        # for the off confirmation.
         task = asyncio.create_task(group._ensure_off_loop())
         group._ensure_task = task
 
-        # Give the event loop a tick so the task hits asyncio.sleep().
+        # Give the event loop a tick so the task reaches the wait.
         await asyncio.sleep(0)
 
         # Simulate _start_deadline asking for cancellation.
@@ -256,10 +305,8 @@ class TestEnsureLoopCancellation:
         except asyncio.CancelledError:
             pass
 
-        # The task is done; no further retries happened beyond what may
-        # have already been issued before cancellation. Specifically,
-        # turn_off is called at most once.
-        assert targets[0].turn_off.await_count <= 1
+        # The task is done; no retry was issued while it waited.
+        targets[0].turn_off.assert_not_called()
 
 
 class TestEnsureLoopIntegration:
@@ -0,0 +1,92 @@
+"""Tests for per-group event coalescing.
+
+With a ``GroupEvaluationCoalescer`` attached, a member state change only
+marks its group dirty; one drain later evaluates each dirty group once.
+A burst of 30 bulb events therefore costs one ``check_and_set_deadline``
+instead of 30 evaluations queued on ``SensorGroup._lock``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock
+
+from custom_components.auto_off.auto_off import (
+    GroupConfig,
+    GroupEvaluationCoalescer,
+    SensorGroup,
+)
+
+
+def _group(hass, coalescer, group_id="room", n_targets=30):
+    config = GroupConfig(
+        targets=[f"light.bulb_{i}" for i in range(n_targets)],
+        sensors=["binary_sensor.m"],
+    )
+    group = SensorGroup(hass, group_id, config, manager=None, coalescer=coalescer)
+    group.check_and_set_deadline = AsyncMock()
+    return group
+
+
+class TestCoalescing:
+    async def test_burst_collapses_into_one_evaluation(self, make_loop_hass):
+        loop_hass = make_loop_hass()
+        coalescer = GroupEvaluationCoalescer(loop_hass, window=0)
+        group = _group(loop_hass, coalescer)
+
+        for target in group._targets:
+            await group._on_target_state_change(target, True, False)
+        group.check_and_set_deadline.assert_not_awaited()
+
+        await asyncio.sleep(0.01)
+
+        group.check_and_set_deadline.assert_awaited_once()
+
+    async def test_window_delays_drain(self, make_loop_hass):
+        loop_hass = make_loop_hass()
+        coalescer = GroupEvaluationCoalescer(loop_hass, window=0.02)
+        group = _group(loop_hass, coalescer)
+
+        await group._on_target_state_change(group._targets[0], True, False)
+        await asyncio.sleep(0)
+        group.check_and_set_deadline.assert_not_awaited()
+
+        await asyncio.sleep(0.05)
+        group.check_and_set_deadline.assert_awaited_once()
+
+    async def test_each_dirty_group_evaluated_once(self, make_loop_hass):
+        loop_hass = make_loop_hass()
+        coalescer = GroupEvaluationCoalescer(loop_hass, window=0)
+        a = _group(loop_hass, coalescer, "a", n_targets=2)
+        b = _group(loop_hass, coalescer, "b", n_targets=2)
+
+        for group in (a, b, a, b):
+            await group._on_sensor_state_change(group._sensors[0], True, False)
+        await asyncio.sleep(0.01)
+
+        a.check_and_set_deadline.assert_awaited_once()
+        b.check_and_set_deadline.assert_awaited_once()
+
+    async def test_failing_group_does_not_block_others(self, make_loop_hass):
+        loop_hass = make_loop_hass()
+        coalescer = GroupEvaluationCoalescer(loop_hass, window=0)
+        bad = _group(loop_hass, coalescer, "bad", n_targets=1)
+        good = _group(loop_hass, coalescer, "good", n_targets=1)
+        bad.check_and_set_deadline = AsyncMock(side_effect=RuntimeError("boom"))
+
+        coalescer.mark_dirty(bad)
+        coalescer.mark_dirty(good)
+        await asyncio.sleep(0.01)
+
+        good.check_and_set_deadline.assert_awaited_once()
+
+    async def test_discarded_group_is_not_evaluated(self, make_loop_hass):
+        loop_hass = make_loop_hass()
+        coalescer = GroupEvaluationCoalescer(loop_hass, window=0)
+        group = _group(loop_hass, coalescer, n_targets=1)
+
+        coalescer.mark_dirty(group)
+        coalescer.discard(group)
+        await asyncio.sleep(0.01)
+
+        group.check_and_set_deadline.assert_not_awaited()
@@ -0,0 +1,99 @@
+"""Tests for the generation-gated periodic sweep.
+
+Member events evaluate their group directly, so a regular periodic tick
+only rescans groups whose event generation moved since their last
+sweep. Idle groups are left alone until the low-frequency full sweep.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig
+from custom_components.auto_off.integration_manager import IntegrationManager
+
+
+_CONFIG = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=5)
+
+
+class TestGroupSweep:
+    async def test_idle_group_is_skipped_after_first_sweep(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "off")
+        group = await make_group(states_hass, _CONFIG)
+        group.check_and_set_deadline = AsyncMock(wraps=group.check_and_set_deadline)
+
+        assert await group.async_sweep() is True
+        assert await group.async_sweep() is False
+        assert group.check_and_set_deadline.await_count == 1
+
+    async def test_member_event_marks_group_for_next_sweep(self, states_hass, set_state, state_event, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "off")
+        group = await make_group(states_hass, _CONFIG)
+        await group.async_sweep()
+
+        set_state("light.a", "on")
+        await group._targets[0]._handle_my_changes(state_event("light.a"))
+
+        assert await group.async_sweep() is True
+
+    async def test_full_sweep_rescans_idle_group(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "off")
+        group = await make_group(states_hass, _CONFIG)
+        await group.async_sweep()
+
+        # Sensor dropped to "off" without an event reaching the group.
+        set_state("binary_sensor.m", "off")
+        assert await group.async_sweep() is False
+        assert group.sensors_on_count == 1
+
+        assert await group.async_sweep(full=True) is True
+        assert group.sensors_on_count == 0
+
+    async def test_ignored_unavailable_event_rescans(self, states_hass, set_state, state_event, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _CONFIG)
+        await group.async_sweep()
+        assert group._timer_deadline is None
+
+        # The event path ignores the state, so the counter still says on.
+        set_state("binary_sensor.m", "unavailable")
+        await group._sensors[0]._handle_entity_change(state_event("binary_sensor.m"))
+        assert group.sensors_on_count == 1
+
+        assert await group.async_sweep() is True
+        assert group.sensors_on_count == 0
+        assert group._timer_deadline == 1000.0 + 300
+
+
+class TestManagerSweep:
+    async def test_periodic_worker_counts_swept_groups(self, hass):
+        manager = AutoOffManager(hass, {})
+        busy, idle = MagicMock(), MagicMock()
+        busy.async_sweep = AsyncMock(return_value=True)
+        idle.async_sweep = AsyncMock(return_value=False)
+        manager._groups = {"busy": busy, "idle": idle}
+
+        assert await manager.periodic_worker() == 1
+        idle.async_sweep.assert_awaited_once_with(full=False)
+
+    async def test_full_sweep_every_consistency_interval(self, hass):
+        entry = MagicMock()
+        entry.data = {"poll_interval": 60}
+        manager = IntegrationManager(hass, entry)
+        manager.auto_off = MagicMock()
+        manager.auto_off.periodic_worker = AsyncMock()
+        manager._reexpand_group_targets = AsyncMock()
+
+        with (
+            patch("custom_components.auto_off.integration_manager.CONSISTENCY_SWEEP_SEC", 180),
+            patch("custom_components.auto_off.integration_manager.SWEEP_SHARDS", 1),
+        ):
+            for _ in range(6):
+                await manager._periodic_worker(None)
+
+        fulls = [c.kwargs["full"] for c in manager.auto_off.periodic_worker.await_args_list]
+        assert fulls == [False, False, True, False, False, True]
@@ -0,0 +1,171 @@
+"""Tests for the cached, event-driven ``ExpansionGraph``.
+
+A group's expansion is walked once; afterwards ``hass.states`` is only
+consulted for nodes never seen before. A membership change of an
+intermediate group re-expands only the auto_off groups that pass
+through it and reports those whose leaves changed. Shared
+sub-expansions are memoized across groups.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.auto_off.expansion import ExpansionGraph
+from custom_components.auto_off.group_entities import expand_group_targets
+
+
+@pytest.fixture
+def dispatcher():
+    dispatcher = MagicMock()
+    dispatcher.async_subscribe = MagicMock(side_effect=lambda *a: MagicMock(name=f"unsub_{a[0]}"))
+    return dispatcher
+
+
+class TestExpansionGraph:
+    def test_repeat_expansion_does_not_touch_states(self, states_hass, dispatcher, set_state):
+        set_state("light.floor", "on", {"entity_id": ["light.a", "light.b"]})
+        graph = ExpansionGraph(states_hass, dispatcher)
+
+        assert graph.expand("hall", ["light.floor"]) == ["light.a", "light.b"]
+        states_hass.states.get.reset_mock()
+
+        assert graph.expand("hall", ["light.floor"]) == ["light.a", "light.b"]
+        states_hass.states.get.assert_not_called()
+
+    def test_groups_and_unloaded_nodes_are_subscribed_once(self, states_hass, dispatcher, set_state):
+        set_state("light.floor", "on", {"entity_id": ["light.a", "light.b"]})
+        set_state("light.a", "on")
+        graph = ExpansionGraph(states_hass, dispatcher)
+
+        graph.expand("hall", ["light.floor"])
+        graph.expand("kitchen", ["light.floor", "light.c"])
+
+        # light.a is a loaded leaf: its target route already sees its events.
+        subscribed = [c.args[0] for c in dispatcher.async_subscribe.call_args_list]
+        assert sorted(subscribed) == ["light.b", "light.c", "light.floor"]
+        assert graph.dependents("light.floor") == {"hall", "kitchen"}
+        assert graph.dependents("light.a") == {"hall", "kitchen"}
+
+    async def test_unloaded_node_loading_as_leaf_drops_route(self, states_hass, dispatcher, set_state, state_event):
+        graph = ExpansionGraph(states_hass, dispatcher)
+        graph.expand("hall", ["light.late"])
+        unsub = graph._unsubs["light.late"]
+
+        set_state("light.late", "on")
+        await graph._handle_node_change(state_event("light.late"))
+
+        unsub.assert_called_once()
+        assert "light.late" not in graph._unsubs
+        assert graph.expanded("hall") == ("light.late",)
+
+    async def test_membership_event_reexpands_only_dependents(self, states_hass, dispatcher, set_state, state_event):
+        set_state("light.floor", "on", {"entity_id": ["light.a"]})
+        changed = []
+        graph = ExpansionGraph(states_hass, dispatcher, on_change=lambda g, leaves: changed.append((g, leaves)))
+        graph.expand("hall", ["light.floor"])
+        graph.expand("office", ["light.o"])
+
+        set_state("light.floor", "on", {"entity_id": ["light.a", "light.b"]})
+        await graph._handle_node_change(state_event("light.floor"))
+
+        assert changed == [("hall", ("light.a", "light.b"))]
+        assert graph.expanded("office") == ("light.o",)
+
+    async def test_late_registered_group_expands(self, states_hass, dispatcher, set_state, state_event):
+        changed = []
+        graph = ExpansionGraph(states_hass, dispatcher, on_change=lambda g, leaves: changed.append(g))
+        # Not in hass.states yet: kept as a leaf.
+        assert graph.expand("hall", ["light.house_all"]) == ["light.house_all"]
+
+        set_state("light.house_all", "on", {"entity_id": ["light.a"]})
+        await graph._handle_node_change(state_event("light.house_all"))
+
+        assert changed == ["hall"]
+        assert graph.expanded("hall") == ("light.a",)
+
+    async def test_restored_placeholder_expands_once_loaded(self, states_hass, dispatcher, set_state, state_event):
+        # At startup a not-yet-loaded group only has its restored state.
+        set_state("light.area", "unavailable", {"restored": True})
+        changed = []
+        graph = ExpansionGraph(states_hass, dispatcher, on_change=lambda g, leaves: changed.append(g))
+        assert graph.expand("room", ["light.area"]) == ["light.area"]
+        assert "light.area" in graph._unsubs
+
+        set_state("light.area", "on", {"entity_id": ["light.a", "light.b"]})
+        await graph._handle_node_change(state_event("light.area"))
+
+        assert changed == ["room"]
+        assert graph.expanded("room") == ("light.a", "light.b")
+
+    async def test_plain_state_change_is_ignored(self, states_hass, dispatcher, set_state, state_event):
+        set_state("light.floor", "on", {"entity_id": ["light.a"]})
+        changed = []
+        graph = ExpansionGraph(states_hass, dispatcher, on_change=lambda g, leaves: changed.append(g))
+        graph.expand("hall", ["light.floor"])
+
+        set_state("light.a", "off")
+        await graph._handle_node_change(state_event("light.a"))
+        set_state("light.floor", "on", {"entity_id": ["light.a"]})
+        await graph._handle_node_change(state_event("light.floor"))
+
+        assert changed == []
+
+    def test_remove_unsubscribes_unshared_nodes(self, states_hass, dispatcher, set_state):
+        set_state("light.floor", "on", {"entity_id": ["light.a"]})
+        graph = ExpansionGraph(states_hass, dispatcher)
+        graph.expand("hall", ["light.floor", "light.h"])
+        graph.expand("kitchen", ["light.floor"])
+        unsubs = {c.args[0]: r for c, r in zip(dispatcher.async_subscribe.call_args_list, graph._unsubs.values())}
+
+        graph.remove("hall")
+
+        unsubs["light.h"].assert_called_once()
+        unsubs["light.floor"].assert_not_called()
+        assert graph.dependents("light.floor") == {"kitchen"}
+
+
+class TestSharedSubExpansion:
+    def test_shared_subtree_resolved_once(self, states_hass, dispatcher, set_state):
+        set_state("light.floor_1", "on", {"entity_id": ["light.a", "light.b"]})
+        set_state("light.house", "on", {"entity_id": ["light.floor_1", "light.c"]})
+        graph = ExpansionGraph(states_hass, dispatcher)
+        graph._subtree = MagicMock(wraps=graph._subtree)
+
+        graph.expand("room", ["light.floor_1"])
+        graph.expand("house", ["light.house"])
+
+        walked = [c.args[0] for c in graph._subtree.call_args_list]
+        assert walked.count("light.a") == 1
+        assert graph.expanded("house") == ("light.a", "light.b", "light.c")
+
+    async def test_membership_event_invalidates_memo(self, states_hass, dispatcher, set_state, state_event):
+        set_state("light.floor_1", "on", {"entity_id": ["light.a"]})
+        set_state("light.house", "on", {"entity_id": ["light.floor_1"]})
+        graph = ExpansionGraph(states_hass, dispatcher)
+        graph.expand("room", ["light.floor_1"])
+        graph.expand("house", ["light.house"])
+
+        set_state("light.floor_1", "on", {"entity_id": ["light.a", "light.b"]})
+        await graph._handle_node_change(state_event("light.floor_1"))
+
+        assert graph.expanded("room") == ("light.a", "light.b")
+        assert graph.expanded("house") == ("light.a", "light.b")
+
+    @pytest.mark.parametrize(
+        "topology",
+        [
+            {"light.x": ["light.b", "light.c"], "light.b": ["light.c", "light.a"], "light.c": ["light.d"]},
+            {"light.x": ["light.y"], "light.y": ["light.x", "light.a"]},
+            {"light.x": ["light.y", "light.z"], "light.y": ["light.a", "light.z"], "light.z": ["light.y", "light.b"]},
+        ],
+    )
+    def test_matches_plain_expansion(self, states_hass, dispatcher, topology, set_state):
+        for entity_id, members in topology.items():
+            set_state(entity_id, "on", {"entity_id": list(members)})
+        graph = ExpansionGraph(states_hass, dispatcher)
+
+        for root in topology:
+            assert graph.expand(root, [root, "light.a"]) == expand_group_targets(states_hass, [root, "light.a"])
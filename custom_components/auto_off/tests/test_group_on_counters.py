@@ -0,0 +1,77 @@
+"""Tests for the O(1) on-counters maintained by ``SensorGroup``.
+
+``sensors_on_count`` / ``targets_on_count`` follow every change of a
+member's last known good state, so ``check_and_set_deadline`` no longer
+scans every member on each event. The periodic safety sweep
+(``rescan=True``) recomputes them from live state and flags drift.
+"""
+
+from __future__ import annotations
+
+import logging
+from unittest.mock import MagicMock
+
+from custom_components.auto_off.auto_off import GroupConfig
+
+
+def _config(targets):
+    return GroupConfig(targets=list(targets), sensors=["binary_sensor.m"], delay=5)
+
+
+class TestOnCounters:
+    async def test_baseline_counts_members_already_on(self, states_hass, set_state, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "on")
+        set_state("light.b", "off")
+
+        group = await make_group(states_hass, _config(["light.a", "light.b"]), "floor")
+
+        assert group.sensors_on_count == 1
+        assert group.targets_on_count == 1
+
+    async def test_event_updates_counter_without_scanning_members(
+        self, states_hass, set_state, state_event, make_group
+    ):
+        leaves = [f"light.bulb_{i}" for i in range(50)]
+        for eid in leaves:
+            set_state(eid, "off")
+        set_state("binary_sensor.m", "off")
+        group = await make_group(states_hass, _config(leaves), "floor")
+        await group.check_and_set_deadline()  # first run: full rescan
+
+        set_state("light.bulb_7", "on")
+        states_hass.states.get.reset_mock()
+        group._set_deadline_from_delay = MagicMock(side_effect=lambda reason: _noop())
+        await group._targets[7]._handle_my_changes(state_event("light.bulb_7"))
+
+        assert group.targets_on_count == 1
+        # Only the bulb that changed was read; the other 49 leaves were not.
+        read = {c.args[0] for c in states_hass.states.get.call_args_list}
+        assert read == {"light.bulb_7"}
+        group._set_deadline_from_delay.assert_called_once_with("target turning ON")
+
+    async def test_rescan_corrects_and_flags_drift(self, states_hass, caplog, set_state, state_event, make_group):
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _config(["light.a"]), "floor")
+        await group.check_and_set_deadline()
+        assert group.sensors_on_count == 1
+
+        # The event path ignores ``unavailable``, so the counter still
+        # believes the sensor is on.
+        set_state("binary_sensor.m", "unavailable")
+        await group._sensors[0]._handle_entity_change(state_event("binary_sensor.m"))
+        assert group.sensors_on_count == 1
+
+        group._set_deadline_from_delay = MagicMock(side_effect=lambda reason: _noop())
+        with caplog.at_level(logging.WARNING, logger="custom_components.auto_off.auto_off"):
+            await group.check_and_set_deadline(rescan=True)
+
+        assert group.sensors_on_count == 0
+        assert group._sensors[0]._last_known_good_state is False
+        assert any("drift" in r.message for r in caplog.records)
+        group._set_deadline_from_delay.assert_called_once_with("sensors turning OFF")
+
+
+async def _noop():
+    return None
@@ -0,0 +1,91 @@
+"""Tests that set/delete touch only the affected ``SensorGroup``.
+
+``AutoOffManager.async_set_group`` / ``async_remove_group`` update or
+unload one group; every other group keeps its object (and with it its
+live timer, ensure-loop and subscriptions).
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig
+
+
+def _config(target: str) -> GroupConfig:
+    return GroupConfig(targets=[target], sensors=["binary_sensor.m"], delay=5)
+
+
+@pytest.fixture
+def manager(hass, monkeypatch):
+    def _fake_group(group_id, group_config):
+        group = MagicMock(name=f"group_{group_id}")
+        group._config = group_config
+        group.async_unload = AsyncMock()
+        group.async_reconfigure = AsyncMock()
+        group.async_start = AsyncMock(return_value=0.0)
+        group.turning_off = False
+        return group
+
+    mgr = AutoOffManager(hass, {"a": _config("light.a"), "b": _config("light.b")})
+    monkeypatch.setattr(mgr, "_new_group", MagicMock(side_effect=_fake_group))
+    return mgr
+
+
+class TestRebuildScope:
+    async def test_set_group_updates_only_that_group_in_place(self, manager):
+        await manager.async_init_groups()
+        a, b = manager._groups["a"], manager._groups["b"]
+        manager._new_group.reset_mock()
+
+        new_config = _config("light.a2")
+        assert await manager.async_set_group("a", new_config) is a
+
+        a.async_reconfigure.assert_awaited_once_with(new_config)
+        a.async_unload.assert_not_awaited()
+        b.async_reconfigure.assert_not_awaited()
+        b.async_unload.assert_not_awaited()
+        assert manager.config["a"] is new_config
+        manager._new_group.assert_not_called()
+
+    async def test_group_mid_turn_off_is_rebuilt(self, manager):
+        await manager.async_init_groups()
+        a, b = manager._groups["a"], manager._groups["b"]
+        a.turning_off = True
+        manager._new_group.reset_mock()
+
+        new_config = _config("light.a2")
+        new_a = await manager.async_set_group("a", new_config)
+
+        a.async_reconfigure.assert_not_awaited()
+        a.async_unload.assert_awaited_once()
+        b.async_unload.assert_not_awaited()
+        assert manager._groups["a"] is new_a
+        manager._new_group.assert_called_once_with("a", new_config)
+
+    async def test_set_group_adds_new_group(self, manager):
+        await manager.async_init_groups()
+        existing = dict(manager._groups)
+
+        await manager.async_set_group("c", _config("light.c"))
+
+        assert set(manager._groups) == {"a", "b", "c"}
+        for group in existing.values():
+            group.async_unload.assert_not_awaited()
+
+    async def test_remove_group_leaves_others(self, manager):
+        await manager.async_init_groups()
+        a, b = manager._groups["a"], manager._groups["b"]
+
+        await manager.async_remove_group("a")
+
+        a.async_unload.assert_awaited_once()
+        b.async_unload.assert_not_awaited()
+        assert set(manager._groups) == {"b"}
+        assert set(manager.config) == {"b"}
+
+    async def test_remove_unknown_group_is_noop(self, manager):
+        await manager.async_remove_group("missing")
+        assert set(manager.config) == {"a", "b"}
@@ -0,0 +1,105 @@
+"""Tests for ``SensorGroup.async_reconfigure``.
+
+A new ``GroupConfig`` is applied as a diff: members present in both
+configs keep their objects and baselines, added members start tracking,
+removed ones stop and release their share of the on-counters, and a
+delay change moves the running deadline instead of dropping it.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import MagicMock
+
+from custom_components.auto_off.auto_off import GroupConfig
+
+
+def _config(targets, sensors=("binary_sensor.m",), delay=5):
+    return GroupConfig(targets=list(targets), sensors=list(sensors), delay=delay)
+
+
+def _track_privately(monkeypatch):
+    track = MagicMock(return_value=MagicMock(name="unsub"))
+    monkeypatch.setattr("custom_components.auto_off.auto_off.async_track_state_change_event", track)
+    return track
+
+
+class TestReconfigure:
+    async def test_unchanged_members_keep_objects(self, states_hass, monkeypatch, set_state, make_group):
+        _track_privately(monkeypatch)
+        for eid in ("light.a", "light.b"):
+            set_state(eid, "off")
+        set_state("binary_sensor.m", "on")
+        group = await make_group(states_hass, _config(["light.a", "light.b"]))
+        await group.check_and_set_deadline()
+        sensor, (a, b) = group._sensors[0], group._targets
+
+        await group.async_reconfigure(_config(["light.a", "light.b"], delay=9))
+
+        assert group._sensors == [sensor]
+        assert group._targets == [a, b]
+        assert a._unsub is not None and b._unsub is not None
+
+    async def test_member_diff_adds_and_removes(self, states_hass, monkeypatch, set_state, make_group):
+        track = _track_privately(monkeypatch)
+        set_state("binary_sensor.m", "on")
+        set_state("light.a", "on")
+        set_state("light.b", "off")
+        set_state("light.c", "on")
+        group = await make_group(states_hass, _config(["light.a", "light.b"]))
+        await group.check_and_set_deadline()
+        a, b = group._targets
+        assert group.targets_on_count == 1
+        track.reset_mock()
+
+        await group.async_reconfigure(_config(["light.b", "light.c"]))
+
+        assert [t.entity_id for t in group._targets] == ["light.b", "light.c"]
+        assert group._targets[0] is b
+        assert a._unsub is None
+        assert group.targets_on_count == 1  # light.a released, light.c added
+        # Only the new leaf subscribed.
+        assert [c.args[1] for c in track.call_args_list] == [["light.c"]]
+
+    async def test_delay_change_moves_running_deadline(self, states_hass, monkeypatch, set_state, make_group):
+        _track_privately(monkeypatch)
+        set_state("binary_sensor.m", "off")
+        set_state("light.a", "on")
+        group = await make_group(states_hass, _config(["light.a"], delay=5))
+        await group.check_and_set_deadline()
+        await group._set_deadline_from_delay("test")
+        assert group._timer_deadline == 1000.0 + 300
+
+        await group.async_reconfigure(_config(["light.a"], delay=2))
+
+        assert group._timer is not None
+        assert group._timer_deadline == 1000.0 + 120
+        assert await group.get_delay() == 120
+
+    async def test_removed_sensor_releases_counter(self, states_hass, monkeypatch, set_state, make_group):
+        _track_privately(monkeypatch)
+        set_state("binary_sensor.m", "on")
+        set_state("binary_sensor.n", "off")
+        set_state("light.a", "off")
+        group = await make_group(states_hass, _config(["light.a"], sensors=["binary_sensor.m", "binary_sensor.n"]))
+        await group.check_and_set_deadline()
+        assert group.sensors_on_count == 1
+
+        await group.async_reconfigure(_config(["light.a"], sensors=["binary_sensor.n"]))
+
+        assert [s.raw for s in group._sensors] == ["binary_sensor.n"]
+        assert group.sensors_on_count == 0
+
+    async def test_duplicate_sensor_drops_every_copy(self, states_hass, set_state, make_group, monkeypatch):
+        _track_privately(monkeypatch)
+        set_state("binary_sensor.m", "on")
+        set_state("binary_sensor.n", "off")
+        set_state("light.a", "off")
+        group = await make_group(states_hass, _config(["light.a"], sensors=["binary_sensor.m", "binary_sensor.m"]))
+        await group.check_and_set_deadline()
+        first, second = group._sensors
+        assert group.sensors_on_count == 2
+
+        await group.async_reconfigure(_config(["light.a"], sensors=["binary_sensor.n"]))
+
+        assert first._unsub is None and second._unsub is None
+        assert group.sensors_on_count == 0
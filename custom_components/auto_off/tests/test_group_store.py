@@ -0,0 +1,74 @@
+"""Tests for the delayed-save group store.
+
+Group edits update the in-memory dict immediately and only schedule a
+debounced ``Store`` write; nothing touches the config entry.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from custom_components.auto_off.storage import SAVE_DELAY, GroupStore, async_load_group_store
+
+
+@pytest.fixture
+def store_io():
+    with (
+        patch("homeassistant.helpers.storage.Store.async_load", AsyncMock(return_value=None)) as load,
+        patch("homeassistant.helpers.storage.Store.async_save", AsyncMock()) as save,
+        patch("homeassistant.helpers.storage.Store.async_delay_save", MagicMock()) as delay_save,
+    ):
+        yield load, save, delay_save
+
+
+class TestGroupStore:
+    async def test_edits_schedule_delayed_save_only(self, hass, store_io):
+        _, save, delay_save = store_io
+        store = GroupStore(hass)
+
+        store.async_set_group("a", {"targets": ["light.a"]})
+        store.async_set_group("b", {"targets": ["light.b"]})
+        store.async_delete_group("a")
+
+        assert store.groups == {"b": {"targets": ["light.b"]}}
+        save.assert_not_awaited()
+        assert delay_save.call_count == 3
+        data_func, delay = delay_save.call_args.args
+        assert delay == SAVE_DELAY
+        assert data_func() == {"groups": {"b": {"targets": ["light.b"]}}}
+
+    async def test_flush_writes_pending_changes_once(self, hass, store_io):
+        _, save, _ = store_io
+        store = GroupStore(hass)
+
+        await store.async_flush()
+        save.assert_not_awaited()
+
+        store.async_set_group("a", {"targets": ["light.a"]})
+        await store.async_flush()
+        await store.async_flush()
+        save.assert_awaited_once_with({"groups": {"a": {"targets": ["light.a"]}}})
+
+    async def test_setup_imports_legacy_entry_groups(self, hass, store_io):
+        _, save, _ = store_io
+        entry = MagicMock()
+        entry.data = {"poll_interval": 15, "groups": {"a": {"targets": ["light.a"]}}}
+
+        store = await async_load_group_store(hass, entry)
+
+        assert store.groups == {"a": {"targets": ["light.a"]}}
+        save.assert_awaited_once()
+        hass.config_entries.async_update_entry.assert_called_once_with(entry, data={"poll_interval": 15})
+
+    async def test_setup_without_legacy_groups_leaves_entry_alone(self, hass, store_io):
+        load, _, _ = store_io
+        load.return_value = {"groups": {"a": {"targets": ["light.a"]}}}
+        entry = MagicMock()
+        entry.data = {"poll_interval": 15}
+
+        store = await async_load_group_store(hass, entry)
+
+        assert store.groups == {"a": {"targets": ["light.a"]}}
+        hass.config_entries.async_update_entry.assert_not_called()
@@ -9,6 +9,15 @@ from custom_components.auto_off.integration_manager import (
     IntegrationManager,
     parse_group_configs,
 )
+from custom_components.auto_off.storage import GroupStore
+
+
+def _store(hass, groups: dict) -> GroupStore:
+    """GroupStore pre-loaded with ``groups`` (as if read from disk)."""
+    store = GroupStore(hass)
+    store.groups = dict(groups)
+    store._store.async_delay_save = MagicMock()  # no disk / timers in unit tests
+    return store
 
 
 class TestParseGroupConfigs:
@@ -62,6 +71,8 @@ class TestIntegrationManager:
             manager.auto_off.config = {}
             manager.auto_off._groups = {}
             manager.auto_off.async_init_groups = AsyncMock()
+            manager.auto_off.async_set_group = AsyncMock()
+            manager.auto_off.async_remove_group = AsyncMock()
             manager.auto_off.async_unload = AsyncMock()
             return manager
 
@@ -74,7 +85,10 @@ class TestIntegrationManager:
 
         assert "new_group" in manager._groups_data
         assert manager._groups_data["new_group"] == sample_group_config_dict
-        manager.auto_off.async_init_groups.assert_awaited_once()
+        # Only the new group is built; no full rebuild.
+        manager.auto_off.async_init_groups.assert_not_awaited()
+        manager.auto_off.async_set_group.assert_awaited_once()
+        assert manager.auto_off.async_set_group.await_args.args[0] == "new_group"
         manager._text_async_add_entities.assert_called_once()
         # Exactly one deadline sensor is created, no config sensor.
         manager._sensor_async_add_entities.assert_called_once()
@@ -97,10 +111,6 @@ class TestIntegrationManager:
     async def test_delete_group(self, manager):
         """Test delete_group removes a group."""
         manager._groups_data["to_delete"] = {"sensors": [], "targets": [], "delay": 0}
-        manager.auto_off.config["to_delete"] = MagicMock()
-        mock_group = MagicMock()
-        mock_group.async_unload = AsyncMock()
-        manager.auto_off._groups["to_delete"] = mock_group
 
         with (
             patch("custom_components.auto_off.integration_manager.er.async_get") as mock_er,
@@ -113,8 +123,8 @@ class TestIntegrationManager:
             await manager.delete_group("to_delete")
 
         assert "to_delete" not in manager._groups_data
-        assert "to_delete" not in manager.auto_off.config
-        mock_group.async_unload.assert_called_once()
+        manager.auto_off.async_remove_group.assert_awaited_once_with("to_delete")
+        manager.auto_off.async_init_groups.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_async_initialize(self, manager, hass):
@@ -149,6 +159,24 @@ class TestIntegrationManager:
         assert len(mock_add_entities.call_args[0][0]) == 1
 
 
+class TestTurnOffRateOptions:
+    """The config entry's rate options reach the manager's limiter."""
+
+    def test_defaults_leave_limiter_off(self, hass, config_entry):
+        config_entry.data = {"poll_interval": 15, "turn_off_rate": 0, "domain_turn_off_rates": {}}
+        mgr = IntegrationManager(hass, config_entry, store=_store(hass, {}))
+
+        assert mgr.auto_off.rate_limiter is None
+
+    def test_rates_build_limiter(self, hass, config_entry):
+        config_entry.data = {"poll_interval": 15, "turn_off_rate": 10, "domain_turn_off_rates": {"light": 2}}
+        mgr = IntegrationManager(hass, config_entry, store=_store(hass, {}))
+
+        stats = mgr.auto_off.rate_limiter.stats
+        assert stats["rate"] == 10
+        assert stats["domain_rates"] == {"light": 2}
+
+
 class TestGetGroupConfig:
     """`get_group_config` is observed by deadline sensor attributes; it must
     round-trip whatever was installed through the public `set_group` API."""
@@ -163,17 +191,18 @@ class TestGetGroupConfig:
             "delay": 5,
         }
 
-        # `set_group` delegates to AutoOffManager.async_init_groups to build
-        # the actual SensorGroup. In a unit test we simulate that step: when
-        # init runs, pretend a SensorGroup was created with this config.
-        async def fake_init_groups():
+        # `set_group` delegates to AutoOffManager.async_set_group to build
+        # the actual SensorGroup. In a unit test we simulate that step:
+        # pretend a SensorGroup was created with this config.
+        async def fake_set_group(group_name, group_config):
             group = MagicMock()
-            group._config = GroupConfig.model_validate(installed_config)
+            group._config = group_config
             group.check_and_set_deadline = AsyncMock()
             group._get_human_deadline = MagicMock(return_value="None")
-            mgr.auto_off._groups["kitchen"] = group
+            mgr.auto_off._groups[group_name] = group
+            return group
 
-        mgr.auto_off.async_init_groups = AsyncMock(side_effect=fake_init_groups)
+        mgr.auto_off.async_set_group = AsyncMock(side_effect=fake_set_group)
 
         # Stub platform entity factories so set_group doesn't touch real HA
         # entity plumbing. This keeps the focus of the test on the
@@ -202,25 +231,23 @@ class TestGetGroupConfig:
 
 class TestUpdateGroupConfigWritesState:
     async def test_async_write_ha_state_called_after_update(self, hass, config_entry):
-        config_entry.data = {
-            "poll_interval": 15,
-            "groups": {
-                "kitchen": {
-                    "targets": ["light.kitchen"],
-                    "sensors": ["binary_sensor.motion"],
-                    "delay": 5,
-                }
-            },
+        groups = {
+            "kitchen": {
+                "targets": ["light.kitchen"],
+                "sensors": ["binary_sensor.motion"],
+                "delay": 5,
+            }
         }
-        mgr = IntegrationManager(hass, config_entry)
+        store = _store(hass, groups)
+        mgr = IntegrationManager(hass, config_entry, store)
 
         mock_entity = MagicMock()
         mock_entity.async_write_ha_state = MagicMock()
         mgr._deadline_entities["kitchen"] = mock_entity
 
-        # Stub out auto_off.async_init_groups so set_group doesn't actually
+        # Stub out auto_off.async_set_group so set_group doesn't actually
         # try to build SensorGroup with a real hass.
-        mgr.auto_off.async_init_groups = AsyncMock()
+        mgr.auto_off.async_set_group = AsyncMock()
 
         await mgr.update_group_config(
             "kitchen",
@@ -232,6 +259,9 @@ class TestUpdateGroupConfigWritesState:
         )
 
         mock_entity.async_write_ha_state.assert_called()
+        # Persisted through the group store, not the config entry.
+        assert store.groups["kitchen"]["targets"] == ["light.kitchen", "light.extra"]
+        hass.config_entries.async_update_entry.assert_not_called()
 
 
 class TestGetGroupMemberGroupEntityIds:
@@ -270,18 +300,15 @@ class TestGetGroupMemberGroupEntityIds:
 class TestGroupEntityHelpers:
     async def test_get_group_config_returns_parsed(self, hass, config_entry):
         """get_group_config materialises stored dict as GroupConfig."""
-        config_entry.data = {
-            "poll_interval": 15,
-            "groups": {
-                "k": {
-                    "targets": ["light.a", "switch.b"],
-                    "sensors": ["binary_sensor.m"],
-                    "sensor_templates": [],
-                    "delay": 5,
-                }
-            },
+        groups = {
+            "k": {
+                "targets": ["light.a", "switch.b"],
+                "sensors": ["binary_sensor.m"],
+                "sensor_templates": [],
+                "delay": 5,
+            }
         }
-        manager = IntegrationManager(hass, config_entry)
+        manager = IntegrationManager(hass, config_entry, _store(hass, groups))
         cfg = manager.get_group_config("k")
         assert cfg is not None
         assert cfg.targets == ["light.a", "switch.b"]
@@ -293,25 +320,62 @@ class TestGroupEntityHelpers:
         assert manager.get_group_config("nope") is None
 
     async def test_get_group_targets_by_domain_buckets(self, hass, config_entry):
-        config_entry.data = {
-            "poll_interval": 15,
-            "groups": {
-                "k": {
-                    "targets": [
-                        "light.a",
-                        "switch.b",
-                        "light.c",
-                        "scene.evening",  # non-groupable, dropped
-                    ],
-                    "sensors": ["binary_sensor.m"],
-                    "sensor_templates": [],
-                    "delay": 0,
-                }
-            },
+        groups = {
+            "k": {
+                "targets": [
+                    "light.a",
+                    "switch.b",
+                    "light.c",
+                    "scene.evening",  # non-groupable, dropped
+                ],
+                "sensors": ["binary_sensor.m"],
+                "sensor_templates": [],
+                "delay": 0,
+            }
         }
-        manager = IntegrationManager(hass, config_entry)
+        manager = IntegrationManager(hass, config_entry, _store(hass, groups))
         result = manager.get_group_targets_by_domain("k")
         assert result == {
             "light": ["light.a", "light.c"],
             "switch": ["switch.b"],
         }
+
+
+class TestGroupConfigCache:
+    """Validated GroupConfig objects are cached per group; readers and
+    platform registration never re-validate the stored dicts."""
+
+    def _groups(self, n):
+        return {
+            f"g{i}": {"targets": [f"light.g{i}"], "sensors": ["binary_sensor.m"], "delay": 1}
+            for i in range(n)
+        }
+
+    async def test_startup_validates_each_group_once(self, hass, config_entry):
+        store = _store(hass, self._groups(20))
+        with patch.object(GroupConfig, "model_validate", wraps=GroupConfig.model_validate) as validate:
+            manager = IntegrationManager(hass, config_entry, store)
+            for platform in ("binary_sensor", "light", "switch", "fan", "cover"):
+                manager.register_platform_callback(platform, MagicMock())
+            for i in range(20):
+                manager.get_group_config(f"g{i}")
+
+        assert validate.call_count == 20
+
+    async def test_cache_replaced_on_set_and_dropped_on_delete(self, hass, config_entry):
+        manager = IntegrationManager(hass, config_entry, _store(hass, self._groups(1)))
+        manager.auto_off.async_set_group = AsyncMock()
+        manager.auto_off.async_remove_group = AsyncMock()
+        before = manager.get_group_config("g0")
+
+        await manager.set_group("g0", {"targets": ["light.x"], "sensors": ["binary_sensor.m"]}, is_new=False)
+        after = manager.get_group_config("g0")
+        assert after is not before
+        assert after.targets == ["light.x"]
+
+        with (
+            patch("custom_components.auto_off.integration_manager.er.async_get"),
+            patch("custom_components.auto_off.integration_manager.dr.async_get"),
+        ):
+            await manager.delete_group("g0")
+        assert manager.get_group_config("g0") is None
@@ -0,0 +1,58 @@
+"""Tests for tracked member setup.
+
+Building a group no longer spawns fire-and-forget tracking tasks:
+``SensorGroup.async_start`` starts every member as one gathered batch,
+and ``AutoOffManager.async_init_groups`` returns only once every group
+is tracking, recording how long it took.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.core import State
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig, SensorGroup
+
+
+def _config(*targets):
+    return GroupConfig(targets=list(targets), sensors=["binary_sensor.m"], delay=5)
+
+
+class TestGroupStart:
+    async def test_construction_does_not_start_tracking(self, hass):
+        group = SensorGroup(hass, "hall", _config("light.a"))
+
+        assert all(member._unsub is None for member in (*group._sensors, *group._targets))
+
+    async def test_start_tracks_every_member_and_times_it(self, hass):
+        hass.states.get = MagicMock(return_value=State("light.a", "off"))
+        group = SensorGroup(hass, "hall", _config("light.a", "light.b"), dispatcher=MagicMock())
+
+        seconds = await group.async_start()
+
+        assert all(member._unsub is not None for member in (*group._sensors, *group._targets))
+        assert group.setup_seconds == seconds >= 0
+
+    async def test_failing_member_does_not_stop_the_rest(self, hass):
+        hass.states.get = MagicMock(return_value=State("light.a", "off"))
+        group = SensorGroup(hass, "hall", _config("light.a", "light.b"), dispatcher=MagicMock())
+        group._targets[0].start_tracking = AsyncMock(side_effect=RuntimeError("boom"))
+
+        await group.async_start()
+
+        assert group._targets[1]._unsub is not None
+
+
+class TestManagerSetup:
+    async def test_init_groups_returns_when_live(self, hass):
+        hass.states.get = MagicMock(return_value=State("light.a", "off"))
+        manager = AutoOffManager(hass, {"hall": _config("light.a"), "office": _config("light.o")})
+
+        await manager.async_init_groups()
+
+        for group in manager._groups.values():
+            assert group.setup_seconds is not None
+        assert manager.setup_stats["groups"] == 2
+        assert manager.setup_stats["members"] == 4
+        await manager.async_unload()
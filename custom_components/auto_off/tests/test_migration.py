@@ -8,7 +8,7 @@ because the data shape is already compatible with v3.  Unknown/ancient entries
 from __future__ import annotations
 
 import logging
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock, patch
 
 
 class TestAsyncMigrateEntry:
@@ -43,15 +43,33 @@ class TestAsyncMigrateEntry:
         assert any("reinstall" in record.message.lower() for record in caplog.records)
 
     async def test_current_version_entry_passes(self, hass):
-        """An entry already at version 4 is considered up to date."""
+        """An entry already at version 6 is considered up to date."""
         from custom_components.auto_off import async_migrate_entry
 
         entry = MagicMock()
-        entry.version = 4
-        entry.data = {"groups": {}}
+        entry.version = 6
+        entry.data = {"poll_interval": 15, "turn_off_rate": 0, "domain_turn_off_rates": {}}
 
         result = await async_migrate_entry(hass, entry)
         assert result is True
+        hass.config_entries.async_update_entry.assert_not_called()
+
+    async def test_v5_entry_gets_unlimited_rate_options(self, hass):
+        """v5 → v6 adds the turn-off rate options with the defaults that
+        leave the limiter off."""
+        from custom_components.auto_off import async_migrate_entry
+
+        entry = MagicMock()
+        entry.version = 5
+        entry.data = {"poll_interval": 30}
+
+        assert await async_migrate_entry(hass, entry) is True
+
+        hass.config_entries.async_update_entry.assert_called_once_with(
+            entry,
+            data={"poll_interval": 30, "turn_off_rate": 0, "domain_turn_off_rates": {}},
+            version=6,
+        )
 
     async def test_v3_entry_drops_ensure_off_fields(self, hass, caplog):
         """v3 stored configs may contain stale ``ensure_window`` and
@@ -95,3 +113,45 @@ class TestAsyncMigrateEntry:
         assert groups["kitchen"]["delay"] == 5
         # Untouched group unchanged
         assert groups["office"]["delay"] == 10
+
+    async def test_v4_entry_moves_groups_to_store(self, hass):
+        """v4 → v5 moves ``entry.data["groups"]`` into the dedicated group
+        store and strips it from the config entry in one update."""
+        from custom_components.auto_off import async_migrate_entry
+
+        groups = {"kitchen": {"sensors": ["binary_sensor.m"], "targets": ["light.k"], "delay": 5}}
+        entry = MagicMock()
+        entry.version = 4
+        entry.data = {"poll_interval": 15, "groups": groups}
+
+        with (
+            patch("homeassistant.helpers.storage.Store.async_load", AsyncMock(return_value=None)),
+            patch("homeassistant.helpers.storage.Store.async_save", AsyncMock()) as save,
+        ):
+            result = await async_migrate_entry(hass, entry)
+
+        assert result is True
+        save.assert_awaited_once_with({"groups": groups})
+        hass.config_entries.async_update_entry.assert_called_once_with(
+            entry, data={"poll_interval": 15}, version=5
+        )
+
+    async def test_v4_entry_keeps_existing_store(self, hass):
+        """If the store already holds groups (imported at setup), the
+        stale copy in entry data is dropped without overwriting it."""
+        from custom_components.auto_off import async_migrate_entry
+
+        entry = MagicMock()
+        entry.version = 4
+        entry.data = {"poll_interval": 15, "groups": {"old": {}}}
+
+        with (
+            patch("homeassistant.helpers.storage.Store.async_load", AsyncMock(return_value={"groups": {}})),
+            patch("homeassistant.helpers.storage.Store.async_save", AsyncMock()) as save,
+        ):
+            assert await async_migrate_entry(hass, entry) is True
+
+        save.assert_not_awaited()
+        hass.config_entries.async_update_entry.assert_called_once_with(
+            entry, data={"poll_interval": 15}, version=5
+        )
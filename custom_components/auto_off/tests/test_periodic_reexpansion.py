@@ -6,12 +6,13 @@ in ``hass.states`` when ``_sync_group_entities`` first runs, it is
 kept as a single leaf and the per-domain target group entity ends up
 holding the group itself instead of its real members.
 
-The fix: on every periodic tick, re-run expansion for every group.
-If the expanded leaves changed since the last tick, re-run
-``_sync_group_entities`` for that group so the per-domain target
-group catches up to the now-registered members. The same loop also
-covers runtime composition changes (new device added to a Magic
-Areas area, helper group edited via the UI).
+The fix: every group is expanded once at startup, and afterwards the
+``ExpansionGraph`` flags a group whenever a node of its expansion
+changes membership. The next pass re-runs ``_sync_group_entities`` for
+flagged groups whose leaves changed, so the per-domain target group
+catches up to the now-registered members. The same path also covers
+runtime composition changes (new device added to a Magic Areas area,
+helper group edited via the UI).
 """
 
 from __future__ import annotations
@@ -21,7 +22,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from custom_components.auto_off.integration_manager import IntegrationManager
+from custom_components.auto_off.expansion import ExpansionGraph
+from custom_components.auto_off.integration_manager import SWEEP_SHARDS, IntegrationManager
 
 
 def _manager_with_one_group(hass, group_name: str, targets: list[str]):
@@ -40,14 +42,22 @@ def _manager_with_one_group(hass, group_name: str, targets: list[str]):
 
     manager = IntegrationManager(hass, entry)
     manager._groups_data = {group_name: {"targets": targets, "sensors": ["binary_sensor.m"]}}
+    manager._pending_expansion = {group_name}
     # Stub out the side effects we are not testing here.
     manager._sync_group_entities = AsyncMock()
     manager.auto_off = MagicMock()
     manager.auto_off.periodic_worker = AsyncMock()
     manager.auto_off._groups = {}
+    manager.auto_off.expansion = ExpansionGraph(hass, MagicMock())
     return manager
 
 
+async def _sweep_round(manager):
+    """Run one periodic sub-tick per sweep shard, visiting every group once."""
+    for _ in range(SWEEP_SHARDS):
+        await manager._periodic_worker(None)
+
+
 class TestPeriodicReexpansion:
     async def test_resync_when_expansion_changes(self):
         """If a target that used to be a single leaf (because the group
@@ -78,7 +88,7 @@ class TestPeriodicReexpansion:
         # The internal _last_expanded baseline is empty before the first
         # tick, so any non-empty expansion should trigger a re-sync.
 
-        await manager._periodic_worker(None)
+        await _sweep_round(manager)
 
         manager._sync_group_entities.assert_awaited_once()
         args, kwargs = manager._sync_group_entities.call_args
@@ -101,9 +111,9 @@ class TestPeriodicReexpansion:
         hass.states.get = MagicMock(side_effect=_states_get)
         manager = _manager_with_one_group(hass, "kitchen", ["light.house_all"])
 
-        await manager._periodic_worker(None)
+        await _sweep_round(manager)
         manager._sync_group_entities.reset_mock()
         # Second tick - expansion result identical, no re-sync expected.
-        await manager._periodic_worker(None)
+        await _sweep_round(manager)
 
         manager._sync_group_entities.assert_not_awaited()
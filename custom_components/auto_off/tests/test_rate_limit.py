@@ -0,0 +1,115 @@
+"""Tests for the manager-wide turn_off rate limiter.
+
+Every turn-off and retry call draws a token from one manager-wide
+bucket (and from its domain's bucket when one is configured), so a
+mass expiry is spread over time instead of hitting the radios at once.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import State
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig, SensorGroup, Target
+from custom_components.auto_off.rate_limit import TurnOffRateLimiter
+
+
+@pytest.fixture
+def clock():
+    """Frozen monotonic clock and recorded sleeps."""
+    sleeps: list[float] = []
+
+    async def _sleep(delay):
+        sleeps.append(delay)
+
+    with patch("time.monotonic", return_value=100.0), patch("asyncio.sleep", _sleep):
+        yield sleeps
+
+
+class TestTurnOffRateLimiter:
+    async def test_burst_then_spaced_by_rate(self, clock):
+        limiter = TurnOffRateLimiter(rate=10, burst=2)
+
+        waits = [await limiter.acquire("light") for _ in range(4)]
+
+        assert waits == [0.0, 0.0, pytest.approx(0.1), pytest.approx(0.2)]
+        assert limiter.stats["delayed"] == 2
+        assert limiter.stats["wait_seconds_max"] == pytest.approx(0.2)
+
+    async def test_domain_rate_only_limits_its_domain(self, clock):
+        limiter = TurnOffRateLimiter(rate=None, burst=1, domain_rates={"light": 2})
+
+        assert await limiter.acquire("light") == 0.0
+        assert await limiter.acquire("light") == pytest.approx(0.5)
+        assert await limiter.acquire("switch") == 0.0
+        assert limiter.stats["domain_rates"] == {"light": 2}
+
+    async def test_unmetered_domains_take_no_token(self, clock):
+        limiter = TurnOffRateLimiter(rate=1, burst=1)
+
+        for _ in range(3):
+            assert await limiter.acquire("input_boolean") == 0.0
+        assert await limiter.acquire("scene", 5) == 0.0
+        assert await limiter.acquire("light") == 0.0
+        assert limiter.stats["calls"] == 1
+
+    async def test_queue_depth_and_refund_on_cancel(self):
+        limiter = TurnOffRateLimiter(rate=1, burst=1)
+        await limiter.acquire("light")
+
+        waiter = asyncio.create_task(limiter.acquire("light"))
+        await asyncio.sleep(0)
+        assert limiter.stats["queued"] == 1
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        assert limiter.stats["queued"] == 0
+        assert limiter.stats["max_queued"] == 1
+        # The cancelled reservation was returned: the next caller waits
+        # for one token, not two.
+        assert limiter._global.reserve(limiter._global._updated) <= 1.0
+
+
+class TestLimiterWiring:
+    async def test_target_turn_off_waits_for_a_token(self):
+        hass = MagicMock()
+        hass.states.get = MagicMock(return_value=State("light.a", "on"))
+        hass.services.async_call = AsyncMock()
+        limiter = MagicMock(acquire=AsyncMock(return_value=0.0))
+        target = Target(hass, "light.a", AsyncMock(), rate_limiter=limiter)
+
+        await target.turn_off()
+
+        limiter.acquire.assert_awaited_once_with("light")
+        hass.services.async_call.assert_awaited_once()
+
+    def test_manager_shares_one_limiter(self, hass):
+        config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=5)
+        manager = AutoOffManager(hass, {}, domain_turn_off_rates={"light": 5})
+
+        group = manager._new_group("hall", config)
+
+        assert group._rate_limiter is manager.rate_limiter
+        assert group._targets[0]._rate_limiter is manager.rate_limiter
+
+    def test_limiter_can_be_disabled(self, hass):
+        assert AutoOffManager(hass, {}, turn_off_rate=None).rate_limiter is None
+
+    def test_limiter_is_off_by_default(self, hass):
+        assert AutoOffManager(hass, {}).rate_limiter is None
+
+    async def test_group_entity_is_charged_per_member(self):
+        hass = MagicMock()
+        hass.states.get = MagicMock(side_effect=lambda eid: State(eid, "on"))
+        hass.services.async_call = AsyncMock()
+        limiter = MagicMock(acquire=AsyncMock(return_value=0.0))
+        config = GroupConfig(targets=["light.a", "light.b", "switch.c"], sensors=["binary_sensor.m"], delay=5)
+        group = SensorGroup(hass, "hall", config, manager=None, rate_limiter=limiter)
+
+        await group._turn_off_group_entity("light.hall_lights")
+
+        limiter.acquire.assert_awaited_once_with("light", 2)
@@ -0,0 +1,100 @@
+"""Tests for the startup barrier.
+
+While Home Assistant is starting, member events only update baselines
+and on-counters. Once it has started, every group is evaluated once in
+a single batch and one expansion pass runs; periodic ticks and
+expansion changes seen in between are deferred to that pass.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from homeassistant.core import CoreState
+
+from custom_components.auto_off.auto_off import AutoOffManager, GroupConfig
+from custom_components.auto_off.integration_manager import IntegrationManager
+
+
+@pytest.fixture
+def barrier_hass(hass, states):
+    hass.states.get = MagicMock(side_effect=lambda eid: states.get(eid))
+    return hass
+
+
+class TestHeldEvaluations:
+    async def test_events_update_baselines_only_until_release(self, barrier_hass, set_state, state_event):
+        set_state("binary_sensor.m", "off")
+        set_state("light.a", "off")
+        config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=5)
+        manager = AutoOffManager(barrier_hass, {"hall": config}, coalesce_window=None)
+        manager.hold_evaluations()
+        await manager.async_init_groups()
+        group = manager._groups["hall"]
+        target = group._targets[0]
+        group.check_and_set_deadline = AsyncMock(wraps=group.check_and_set_deadline)
+
+        set_state("light.a", "on")
+        await target._handle_my_changes(state_event("light.a"))
+
+        group.check_and_set_deadline.assert_not_awaited()
+        assert group.targets_on_count == 1
+
+        await manager.async_release_evaluations()
+
+        group.check_and_set_deadline.assert_awaited_once()
+        assert group._evaluation_held is False
+        await manager.async_unload()
+
+
+class TestStartupPass:
+    def _manager(self, hass):
+        entry = MagicMock()
+        entry.data = {"poll_interval": 15}
+        manager = IntegrationManager(hass, entry)
+        manager.auto_off = MagicMock()
+        manager.auto_off.async_init_groups = AsyncMock()
+        manager.auto_off.async_release_evaluations = AsyncMock()
+        manager.auto_off.periodic_worker = AsyncMock()
+        manager._reexpand_group_targets = AsyncMock()
+        return manager
+
+    async def test_defers_work_until_started(self, hass):
+        hass.state = CoreState.starting
+        manager = self._manager(hass)
+
+        with (
+            patch("custom_components.auto_off.integration_manager.async_track_time_interval"),
+            patch("custom_components.auto_off.integration_manager.async_at_started") as at_started,
+        ):
+            await manager.async_initialize()
+
+        manager.auto_off.hold_evaluations.assert_called_once()
+        at_started.assert_called_once()
+
+        await manager._periodic_worker(None)
+        manager._on_expansion_change("hall", ("light.a",))
+        manager.auto_off.periodic_worker.assert_not_awaited()
+        hass.async_create_task.assert_not_called()
+
+        on_started = at_started.call_args.args[1]
+        await on_started(hass)
+
+        manager.auto_off.async_release_evaluations.assert_awaited_once()
+        manager._reexpand_group_targets.assert_awaited_once_with()
+        assert "hall" in manager._pending_expansion
+        await manager._periodic_worker(None)
+        manager.auto_off.periodic_worker.assert_awaited_once()
+
+    async def test_no_barrier_when_already_running(self, hass):
+        manager = self._manager(hass)
+
+        with (
+            patch("custom_components.auto_off.integration_manager.async_track_time_interval"),
+            patch("custom_components.auto_off.integration_manager.async_at_started") as at_started,
+        ):
+            await manager.async_initialize()
+
+        manager.auto_off.hold_evaluations.assert_not_called()
+        at_started.assert_not_called()
@@ -0,0 +1,123 @@
+"""Tests for the manager-wide ``StateChangeDispatcher``.
+
+Every ``Sensor`` / ``Target`` built by ``AutoOffManager`` registers a
+route in one shared ``entity_id -> [(group, role)]`` index instead of
+installing its own ``async_track_state_change_event`` subscription.
+These tests pin the observable contract: one bus listener for the
+union of tracked ids, events routed only to interested groups, and the
+index shrinking incrementally as members stop tracking.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from homeassistant.core import State
+
+from custom_components.auto_off.auto_off import GroupConfig, SensorGroup
+from custom_components.auto_off.dispatcher import (
+    ROLE_SENSOR,
+    ROLE_TARGET,
+    StateChangeDispatcher,
+)
+
+
+@pytest.fixture
+def bus_hass():
+    """hass mock whose bus records listeners and whose create_task runs
+    the routed coroutine so tests can await it."""
+    hass = MagicMock()
+    hass.loop = MagicMock()
+    hass.loop.time = MagicMock(return_value=1000.0)
+    hass.states.get = MagicMock(return_value=None)
+    hass.bus.async_listen = MagicMock(return_value=MagicMock(name="unsub_bus"))
+    hass.created = []
+    hass.async_create_task = MagicMock(side_effect=hass.created.append)
+    return hass
+
+
+def _event(entity_id: str, state: str = "on"):
+    event = MagicMock()
+    event.data = {"entity_id": entity_id, "new_state": State(entity_id, state)}
+    return event
+
+
+class TestDispatcherIndex:
+    def test_single_bus_listener_for_many_subscriptions(self, bus_hass):
+        dispatcher = StateChangeDispatcher(bus_hass)
+        dispatcher.async_subscribe("light.a", "g1", ROLE_TARGET, AsyncMock())
+        dispatcher.async_subscribe("light.a", "g2", ROLE_TARGET, AsyncMock())
+        dispatcher.async_subscribe("binary_sensor.m", "g1", ROLE_SENSOR, AsyncMock())
+
+        bus_hass.bus.async_listen.assert_called_once()
+        assert dispatcher.entity_ids == {"light.a", "binary_sensor.m"}
+        assert dispatcher.routes_for("light.a") == [("g1", ROLE_TARGET), ("g2", ROLE_TARGET)]
+
+    def test_filter_rejects_untracked_entities(self, bus_hass):
+        dispatcher = StateChangeDispatcher(bus_hass)
+        dispatcher.async_subscribe("light.a", "g1", ROLE_TARGET, AsyncMock())
+        assert dispatcher._async_filter({"entity_id": "light.a"}) is True
+        assert dispatcher._async_filter({"entity_id": "light.other"}) is False
+
+    async def test_event_routed_only_to_interested_groups(self, bus_hass):
+        dispatcher = StateChangeDispatcher(bus_hass)
+        a1, a2, other = AsyncMock(), AsyncMock(), AsyncMock()
+        dispatcher.async_subscribe("light.a", "g1", ROLE_TARGET, a1)
+        dispatcher.async_subscribe("light.a", "g2", ROLE_TARGET, a2)
+        dispatcher.async_subscribe("light.b", "g3", ROLE_TARGET, other)
+
+        event = _event("light.a")
+        dispatcher._async_handle_event(event)
+        for coro in bus_hass.created:
+            await coro
+
+        a1.assert_awaited_once_with(event)
+        a2.assert_awaited_once_with(event)
+        other.assert_not_awaited()
+
+    def test_unsubscribe_shrinks_index_and_drops_listener(self, bus_hass):
+        dispatcher = StateChangeDispatcher(bus_hass)
+        unsub_bus = bus_hass.bus.async_listen.return_value
+        u1 = dispatcher.async_subscribe("light.a", "g1", ROLE_TARGET, AsyncMock())
+        u2 = dispatcher.async_subscribe("light.a", "g2", ROLE_TARGET, AsyncMock())
+
+        u1()
+        assert dispatcher.routes_for("light.a") == [("g2", ROLE_TARGET)]
+        unsub_bus.assert_not_called()
+
+        u2()
+        assert dispatcher.entity_ids == set()
+        unsub_bus.assert_called_once()
+
+    def test_remove_group_keeps_other_groups(self, bus_hass):
+        dispatcher = StateChangeDispatcher(bus_hass)
+        dispatcher.async_subscribe("light.a", "g1", ROLE_TARGET, AsyncMock())
+        dispatcher.async_subscribe("light.a", "g2", ROLE_TARGET, AsyncMock())
+        dispatcher.async_subscribe("binary_sensor.m", "g1", ROLE_SENSOR, AsyncMock())
+
+        dispatcher.async_remove_group("g1")
+
+        assert dispatcher.entity_ids == {"light.a"}
+        assert dispatcher.routes_for("light.a") == [("g2", ROLE_TARGET)]
+
+
+class TestSensorGroupUsesDispatcher:
+    async def test_members_register_routes_and_release_on_unload(self, bus_hass, monkeypatch):
+        private = MagicMock()
+        monkeypatch.setattr(
+            "custom_components.auto_off.auto_off.async_track_state_change_event",
+            private,
+        )
+        dispatcher = StateChangeDispatcher(bus_hass)
+        config = GroupConfig(targets=["light.k"], sensors=["binary_sensor.m"])
+        group = SensorGroup(bus_hass, "kitchen", config, manager=None, dispatcher=dispatcher)
+        for member in (*group._sensors, *group._targets):
+            await member.start_tracking()
+
+        private.assert_not_called()
+        assert dispatcher.routes_for("binary_sensor.m") == [("kitchen", ROLE_SENSOR)]
+        assert dispatcher.routes_for("light.k") == [("kitchen", ROLE_TARGET)]
+
+        await group.async_unload()
+        assert dispatcher.entity_ids == set()
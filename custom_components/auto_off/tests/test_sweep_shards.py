@@ -0,0 +1,121 @@
+"""Tests for the sharded periodic sweep.
+
+Each group has a stable slot among ``SWEEP_SHARDS``; every periodic
+sub-tick only visits one slot, so a round of sub-ticks covers every
+group once and no single tick processes them all. Sub-ticks that find
+the previous one still running are counted as skipped. Within a tick
+groups are swept concurrently up to a limit, each under a timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.auto_off.auto_off import AutoOffManager, sweep_slot
+from custom_components.auto_off.diagnostics import async_get_config_entry_diagnostics
+from custom_components.auto_off.integration_manager import SWEEP_SHARDS, IntegrationManager
+
+
+def _manager(hass):
+    entry = MagicMock()
+    entry.data = {"poll_interval": 60}
+    manager = IntegrationManager(hass, entry)
+    manager.auto_off = MagicMock()
+    manager.auto_off.periodic_worker = AsyncMock()
+    manager._reexpand_group_targets = AsyncMock()
+    return manager
+
+
+class TestSweepSlots:
+    def test_slot_is_stable_and_in_range(self):
+        for group_id in ("kitchen", "hall", "f1_bath"):
+            slot = sweep_slot(group_id, 4)
+            assert 0 <= slot < 4
+            assert sweep_slot(group_id, 4) == slot
+        assert sweep_slot("kitchen", 1) == 0
+
+    def test_groups_spread_over_shards(self):
+        slots = {sweep_slot(f"group_{i}", 4) for i in range(40)}
+        assert slots == {0, 1, 2, 3}
+
+    async def test_worker_visits_only_its_shard(self, hass):
+        manager = AutoOffManager(hass, {})
+        groups = {f"group_{i}": MagicMock(async_sweep=AsyncMock(return_value=True)) for i in range(20)}
+        manager._groups = dict(groups)
+
+        visited = 0
+        for shard in range(4):
+            visited += await manager.periodic_worker(shard=shard, shards=4)
+            for group_id, group in groups.items():
+                if sweep_slot(group_id, 4) == shard:
+                    group.async_sweep.assert_awaited_once()
+        assert visited == 20
+
+
+class TestShardedTicks:
+    async def test_round_cycles_through_shards(self, hass):
+        manager = _manager(hass)
+
+        for _ in range(SWEEP_SHARDS * 2):
+            await manager._periodic_worker(None)
+
+        shards = [c.kwargs["shard"] for c in manager.auto_off.periodic_worker.await_args_list]
+        assert shards == list(range(SWEEP_SHARDS)) * 2
+
+    async def test_skipped_tick_is_counted_and_shard_kept(self, hass):
+        manager = _manager(hass)
+        await manager._lock.acquire()
+        await manager._periodic_worker(None)
+        manager._lock.release()
+        await manager._periodic_worker(None)
+
+        stats = manager.sweep_stats
+        assert stats["skipped_ticks"] == 1
+        assert stats["ticks"] == 1
+        assert manager.auto_off.periodic_worker.await_args.kwargs["shard"] == 0
+
+    async def test_diagnostics_expose_sweep_stats(self, hass):
+        manager = _manager(hass)
+        await manager._periodic_worker(None)
+        hass.data = {"auto_off": manager}
+
+        result = await async_get_config_entry_diagnostics(hass, MagicMock())
+
+        assert result["sweep"]["ticks"] == 1
+        assert result["sweep"]["shards"] == SWEEP_SHARDS
+
+
+class TestSweepConcurrency:
+    async def test_groups_swept_concurrently_up_to_limit(self, hass):
+        manager = AutoOffManager(hass, {}, sweep_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def _slow_sweep(full=False):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return True
+
+        manager._groups = {f"g{i}": MagicMock(async_sweep=_slow_sweep) for i in range(5)}
+
+        assert await manager.periodic_worker() == 5
+        assert peak == 2
+
+    async def test_failing_and_stuck_groups_are_isolated(self, hass):
+        manager = AutoOffManager(hass, {}, sweep_timeout=0.01)
+        stuck_release = asyncio.Event()
+
+        async def _stuck(full=False):
+            await stuck_release.wait()
+
+        failing = MagicMock(group_id="failing", async_sweep=AsyncMock(side_effect=RuntimeError("boom")))
+        stuck = MagicMock(group_id="stuck", async_sweep=_stuck)
+        healthy = MagicMock(group_id="healthy", async_sweep=AsyncMock(return_value=True))
+        manager._groups = {"failing": failing, "stuck": stuck, "healthy": healthy}
+
+        assert await manager.periodic_worker() == 1
+        healthy.async_sweep.assert_awaited_once()
@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
 from unittest.mock import AsyncMock, MagicMock
 
 import pytest
+from homeassistant.core import State
 
 from custom_components.auto_off.auto_off import Target
 
@@ -71,3 +73,33 @@ class TestTargetTurnOff:
         target_hass.services.async_call.assert_called_once_with(
             "light", "turn_off", {"entity_id": "light.kitchen"}, blocking=True
         )
+
+
+class TestTargetWaitOff:
+    """`async_wait_off` is resolved by the tracker, not by polling."""
+
+    async def test_returns_immediately_when_already_off(self, target_hass):
+        target_hass.states.get = MagicMock(return_value=State("light.kitchen", "off"))
+        t = Target(target_hass, "light.kitchen", AsyncMock())
+        assert await t.async_wait_off(10) is True
+
+    async def test_resolved_by_off_event(self, target_hass):
+        states = {"light.kitchen": State("light.kitchen", "on")}
+        target_hass.states.get = MagicMock(side_effect=states.get)
+        t = Target(target_hass, "light.kitchen", AsyncMock())
+        t._remember_state(True)
+
+        waiting = asyncio.create_task(t.async_wait_off(10))
+        await asyncio.sleep(0)
+        states["light.kitchen"] = State("light.kitchen", "off")
+        event = MagicMock()
+        event.data = {"entity_id": "light.kitchen", "new_state": states["light.kitchen"]}
+        await t._handle_my_changes(event)
+
+        assert await asyncio.wait_for(waiting, 1) is True
+        assert t._off_waiters == []
+
+    async def test_timeout_rereads_state(self, target_hass):
+        target_hass.states.get = MagicMock(return_value=State("light.kitchen", "on"))
+        t = Target(target_hass, "light.kitchen", AsyncMock())
+        assert await t.async_wait_off(0) is False
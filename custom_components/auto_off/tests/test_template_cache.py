@@ -0,0 +1,70 @@
+"""Tests for compiled-template caching.
+
+A template ``Sensor`` and a template ``delay`` each build their
+``Template`` once, when the group is configured. Template sensors take
+their value from the ``TrackTemplateResult`` handed to the tracker
+callback instead of rendering the template a second time.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock
+
+from homeassistant.exceptions import TemplateError
+
+from custom_components.auto_off.auto_off import GroupConfig, Sensor, SensorGroup
+
+
+class TestSensorTemplateCache:
+    async def test_template_built_once(self, hass, template_cls, track_result):
+        sensor = Sensor(hass, "{{ is_state('x', 'on') }}", "template", AsyncMock())
+        await sensor.start_tracking()
+        for _ in range(5):
+            await sensor.is_on()
+
+        template_cls.assert_called_once()
+        assert track_result.call_args.args[1][0].template is sensor._template
+
+    async def test_tracker_result_used_without_render(self, hass, template_cls, track_result, template_update):
+        callback = AsyncMock()
+        sensor = Sensor(hass, "{{ x }}", "template", callback)
+        await sensor.start_tracking()
+        render = sensor._template.async_render
+        render.reset_mock()
+
+        await sensor._handle_template_result(None, template_update(False))
+
+        render.assert_not_called()
+        callback.assert_awaited_once_with(sensor, True, False)
+        assert await sensor.is_on() is False
+        render.assert_not_called()
+
+    async def test_template_error_result_is_off(self, hass, template_cls, track_result, template_update):
+        callback = AsyncMock()
+        sensor = Sensor(hass, "{{ x }}", "template", callback)
+        await sensor.start_tracking()
+
+        await sensor._handle_template_result(None, template_update(TemplateError("boom")))
+
+        callback.assert_awaited_once_with(sensor, True, False)
+
+
+class TestDelayTemplateCache:
+    async def test_int_delay_skips_template_engine(self, hass, template_cls):
+        config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=3)
+        group = SensorGroup(hass, "g", config, manager=None)
+        template_cls.reset_mock()
+
+        assert await group.get_delay() == 180
+        template_cls.assert_not_called()
+
+    async def test_template_delay_compiled_once(self, hass, template_cls):
+        template_cls.return_value.async_render = MagicMock(return_value=2)
+        group = SensorGroup(
+            hass, "g", GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay="{{ 2 }}"), manager=None
+        )
+        built = template_cls.call_count
+
+        for _ in range(3):
+            assert await group.get_delay() == 120
+        assert template_cls.call_count == built
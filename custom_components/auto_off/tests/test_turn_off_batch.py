@@ -0,0 +1,188 @@
+"""Tests for cross-group batching of turn_off calls.
+
+Intents arriving within the aggregation window are sent as one
+``<domain>.turn_off`` per domain with de-duplicated entity ids; every
+caller sees the outcome of the call that carried its entity.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from custom_components.auto_off.auto_off import GroupConfig, SensorGroup
+from custom_components.auto_off.turn_off_batch import TurnOffAggregator
+
+
+class TestTurnOffAggregator:
+    async def test_one_call_per_domain_with_deduplicated_leaves(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        aggregator = TurnOffAggregator(batch_hass, 0.01)
+
+        await asyncio.gather(
+            aggregator.turn_off("light.a"),
+            aggregator.turn_off("light.b"),
+            aggregator.turn_off("light.a"),
+            aggregator.turn_off("switch.c"),
+        )
+
+        calls = {c.args[0]: c.args[2]["entity_id"] for c in batch_hass.services.async_call.await_args_list}
+        assert calls == {"light": ["light.a", "light.b"], "switch": ["switch.c"]}
+        assert aggregator.stats["deduplicated"] == 1
+        assert aggregator.stats["calls"] == 2
+
+    async def test_failure_is_raised_to_every_caller(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        batch_hass.services.async_call = AsyncMock(side_effect=RuntimeError("boom"))
+        aggregator = TurnOffAggregator(batch_hass, 0)
+
+        results = await asyncio.gather(
+            aggregator.turn_off("light.a"),
+            aggregator.turn_off("light.b"),
+            return_exceptions=True,
+        )
+
+        assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+        assert aggregator.stats["failed"] == 2
+
+    async def test_failed_batch_is_resolved_per_entity(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+
+        async def _call(domain, service, data, blocking):
+            if data["entity_id"] != "light.b":
+                raise RuntimeError("boom")
+
+        batch_hass.services.async_call = AsyncMock(side_effect=_call)
+        aggregator = TurnOffAggregator(batch_hass, 0)
+
+        results = await asyncio.gather(
+            aggregator.turn_off("light.a"),
+            aggregator.turn_off("light.b"),
+            return_exceptions=True,
+        )
+
+        assert isinstance(results[0], RuntimeError)
+        assert results[1] is None
+        assert aggregator.stats["failed"] == 1
+
+    async def test_cancelled_caller_does_not_withdraw_shared_intent(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        aggregator = TurnOffAggregator(batch_hass, 0.01)
+        sent = []
+
+        first = asyncio.create_task(aggregator.turn_off("light.a", on_sent=lambda: sent.append("first")))
+        second = asyncio.create_task(aggregator.turn_off("light.a", on_sent=lambda: sent.append("second")))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        await second
+        batch_hass.services.async_call.assert_awaited_once()
+        assert sent == ["first", "second"]
+
+    async def test_caller_cancelled_in_window_withdraws_intent(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        aggregator = TurnOffAggregator(batch_hass, 0.01)
+        sent = []
+
+        caller = asyncio.create_task(aggregator.turn_off("light.a", on_sent=lambda: sent.append("a")))
+        await asyncio.sleep(0)
+        caller.cancel()
+        await asyncio.gather(caller, return_exceptions=True)
+        await asyncio.sleep(0.02)
+
+        batch_hass.services.async_call.assert_not_awaited()
+        assert sent == []
+        assert aggregator.stats["pending"] == 0
+        assert aggregator.stats["withdrawn"] == 1
+
+    async def test_caller_cancelled_during_rate_limit_wait_is_not_sent(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        released = asyncio.Event()
+
+        async def _acquire(domain, count):
+            await released.wait()
+            return 0.0
+
+        limiter = MagicMock(acquire=AsyncMock(side_effect=_acquire))
+        aggregator = TurnOffAggregator(batch_hass, 0, rate_limiter=limiter)
+
+        kept = asyncio.create_task(aggregator.turn_off("light.a"))
+        dropped = asyncio.create_task(aggregator.turn_off("light.b"))
+        await asyncio.sleep(0.01)
+        dropped.cancel()
+        await asyncio.gather(dropped, return_exceptions=True)
+        released.set()
+        await kept
+
+        calls = [c.args[2]["entity_id"] for c in batch_hass.services.async_call.await_args_list]
+        assert calls == [["light.a"]]
+
+    async def test_non_blocking_intents_get_their_own_call(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        aggregator = TurnOffAggregator(batch_hass, 0.01)
+
+        await asyncio.gather(
+            aggregator.turn_off("light.auto_off_hall_targets_light", blocking=False),
+            aggregator.turn_off("light.a"),
+        )
+
+        calls = batch_hass.services.async_call.await_args_list
+        calls = sorted((c.args[2]["entity_id"], c.kwargs["blocking"]) for c in calls)
+        assert calls == [(["light.a"], True), (["light.auto_off_hall_targets_light"], False)]
+
+    async def test_batch_takes_one_token_per_entity(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        limiter = MagicMock(acquire=AsyncMock(return_value=0.0))
+        aggregator = TurnOffAggregator(batch_hass, 0, rate_limiter=limiter)
+
+        await asyncio.gather(aggregator.turn_off("light.a"), aggregator.turn_off("light.b"))
+
+        limiter.acquire.assert_awaited_once_with("light", 2)
+
+    async def test_group_entity_intent_is_charged_per_member(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        limiter = MagicMock(acquire=AsyncMock(return_value=0.0))
+        aggregator = TurnOffAggregator(batch_hass, 0, rate_limiter=limiter)
+
+        await asyncio.gather(aggregator.turn_off("light.hall", cost=3), aggregator.turn_off("light.b"))
+
+        limiter.acquire.assert_awaited_once_with("light", 4)
+
+
+class TestGroupsShareBatches:
+    async def test_group_entity_is_batched_non_blocking(self, make_loop_hass):
+        batch_hass = make_loop_hass()
+        manager = MagicMock()
+        manager.get_group_member_group_entity_ids.return_value = ["light.auto_off_k_targets_light"]
+        config = GroupConfig(targets=["light.a"], sensors=["binary_sensor.m"], delay=0)
+        group = SensorGroup(batch_hass, "k", config, manager=manager, aggregator=TurnOffAggregator(batch_hass, 0))
+        group._ensure_off_loop = AsyncMock()
+
+        await group._turn_off_targets()
+
+        batch_hass.services.async_call.assert_awaited_once_with(
+            "light", "turn_off", {"entity_id": ["light.auto_off_k_targets_light"]}, blocking=False
+        )
+
+    async def test_groups_expiring_together_share_one_call(self, make_loop_hass, set_state):
+        batch_hass = make_loop_hass()
+        for entity_id in ("light.a", "light.shared"):
+            set_state(entity_id, "on")
+        aggregator = TurnOffAggregator(batch_hass, 0.01)
+        groups = [
+            SensorGroup(
+                batch_hass,
+                group_id,
+                GroupConfig(targets=targets, sensors=["binary_sensor.m"], delay=0),
+                aggregator=aggregator,
+            )
+            for group_id, targets in (("hall", ["light.a", "light.shared"]), ("stairs", ["light.shared"]))
+        ]
+        for group in groups:
+            group._ensure_off_loop = AsyncMock()
+
+        await asyncio.gather(*(group._turn_off_targets() for group in groups))
+
+        batch_hass.services.async_call.assert_awaited_once_with(
+            "light", "turn_off", {"entity_id": ["light.a", "light.shared"]}, blocking=True
+        )
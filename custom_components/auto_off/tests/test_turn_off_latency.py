@@ -0,0 +1,96 @@
+"""Tests for the per-target turn-off latency model.
+
+``Target`` times each turn-off from request to the off event and keeps
+a rolling window of samples; the ensure loop treats a target as stuck
+after its p95 times ``LATENCY_STUCK_FACTOR`` instead of a fixed
+interval.
+"""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from homeassistant.core import State
+
+from custom_components.auto_off.auto_off import ENSURE_INTERVAL_SEC, ENSURE_WINDOW_SEC, Target
+from custom_components.auto_off.latency import (
+    LATENCY_MIN_STUCK_SEC,
+    LATENCY_SAMPLES,
+    LATENCY_STUCK_FACTOR,
+    TurnOffLatency,
+)
+
+
+class TestTurnOffLatency:
+    def test_default_until_enough_samples(self):
+        latency = TurnOffLatency(horizon=60)
+        latency.request(0.0)
+        latency.confirm(0.2)
+
+        assert latency.stuck_after(10, 60) == 10
+
+    def test_stuck_after_scales_p95(self):
+        latency = TurnOffLatency(horizon=60)
+        for sample in (4.0, 5.0, 6.0, 20.0):
+            latency.request(100.0)
+            latency.confirm(100.0 + sample)
+
+        assert latency.percentile(95) == 20.0
+        assert latency.stuck_after(10, 60) == min(20.0 * LATENCY_STUCK_FACTOR, 60)
+
+    def test_fast_device_is_floored(self):
+        latency = TurnOffLatency(horizon=60)
+        for _ in range(5):
+            latency.request(0.0)
+            latency.confirm(0.1)
+
+        assert latency.stuck_after(10, 60) == LATENCY_MIN_STUCK_SEC
+
+    def test_window_is_rolling(self):
+        latency = TurnOffLatency(horizon=60)
+        for i in range(LATENCY_SAMPLES + 5):
+            latency.request(0.0)
+            latency.confirm(float(i % 3))
+
+        assert latency.samples == LATENCY_SAMPLES
+
+    def test_unrequested_or_stale_confirmation_is_ignored(self):
+        latency = TurnOffLatency(horizon=60)
+        assert latency.confirm(5.0) is None
+        latency.request(0.0)
+        assert latency.confirm(600.0) is None
+        assert latency.samples == 0
+
+
+class TestTargetLatency:
+    async def test_turn_off_event_records_sample(self):
+        states = {"light.kitchen": State("light.kitchen", "on")}
+        hass = MagicMock()
+        hass.states.get = MagicMock(side_effect=states.get)
+        hass.services.async_call = AsyncMock()
+        target = Target(hass, "light.kitchen", AsyncMock())
+        target._remember_state(True)
+
+        with patch("time.monotonic", return_value=50.0):
+            await target.turn_off()
+        states["light.kitchen"] = State("light.kitchen", "off")
+        event = MagicMock()
+        event.data = {"entity_id": "light.kitchen", "new_state": states["light.kitchen"]}
+        with patch("time.monotonic", return_value=50.4):
+            await target._handle_my_changes(event)
+
+        assert target.latency.samples == 1
+        assert abs(target.latency.percentile(95) - 0.4) < 1e-9
+        # One sample is not enough to move off the default.
+        assert target.stuck_after() == ENSURE_INTERVAL_SEC
+
+    def test_off_target_is_not_timed(self):
+        target = Target(MagicMock(), "light.kitchen", AsyncMock())
+        target._remember_state(False)
+
+        target.note_turn_off_requested()
+        target._remember_state(True)
+        target._remember_state(False)
+
+        assert target.latency.samples == 0
+        assert target.latency.stats(ENSURE_INTERVAL_SEC, ENSURE_WINDOW_SEC)["stuck_after"] == ENSURE_INTERVAL_SEC
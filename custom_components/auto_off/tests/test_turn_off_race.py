@@ -123,3 +123,66 @@ class TestTurnOffRace:
             "_turn_off_lock so external consumers can detect the phase"
         )
         assert not lock_attr.locked()
+
+
+class TestTurnOffInterruption:
+    async def test_sensor_on_aborts_turn_off_phase_immediately(self, hass_for_group):
+        """Presence returning mid-phase cancels the phase task at once
+        and evaluates the group as soon as it has unwound."""
+        group = _build_group(hass_for_group, targets=["light.kitchen"])
+        for target in group._targets:
+            target.turn_off = AsyncMock()
+        ensure_started = asyncio.Event()
+
+        async def _blocked_ensure():
+            ensure_started.set()
+            await asyncio.Event().wait()
+
+        group._ensure_off_loop = _blocked_ensure
+        group.check_and_set_deadline = AsyncMock()
+
+        group._launch_turn_off()
+        task = group._ensure_task
+        await ensure_started.wait()
+
+        await group._on_sensor_state_change(group._sensors[0], False, True)
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        await asyncio.sleep(0)
+
+        assert group._ensure_task is None
+        assert not group._turn_off_lock.locked()
+        group.check_and_set_deadline.assert_awaited()
+
+    async def test_skipped_evaluation_runs_when_phase_ends(self, hass_for_group):
+        group = _build_group(hass_for_group, targets=["light.kitchen"])
+        ensure_release = asyncio.Event()
+
+        async def _slow_ensure():
+            await ensure_release.wait()
+
+        group._ensure_off_loop = _slow_ensure
+        group._handle_deadline_logic = AsyncMock()
+        group._is_first_run = MagicMock(return_value=False)
+
+        turn_off_task = asyncio.create_task(group._turn_off_targets())
+        await asyncio.sleep(0)
+        await group.check_and_set_deadline()
+        group._handle_deadline_logic.assert_not_awaited()
+
+        ensure_release.set()
+        await turn_off_task
+        await asyncio.sleep(0)
+
+        group._handle_deadline_logic.assert_awaited_once()
+        assert group._reevaluate_pending is False
+
+    async def test_no_evaluation_without_skipped_event(self, hass_for_group):
+        group = _build_group(hass_for_group, targets=["light.kitchen"])
+        group._ensure_off_loop = AsyncMock()
+        group.check_and_set_deadline = AsyncMock()
+
+        await group._turn_off_targets()
+        await asyncio.sleep(0)
+
+        group.check_and_set_deadline.assert_not_awaited()
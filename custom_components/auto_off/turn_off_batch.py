@@ -0,0 +1,246 @@
+"""Cross-group batching of turn_off service calls.
+
+Groups that expire together (same delay, same moment the house went
+quiet) each used to send their own ``<domain>.turn_off`` per group
+entity or per leaf, and a leaf shared by two groups got two calls.
+:class:`TurnOffAggregator` collects every turn-off intent for
+``window`` seconds after the first one, drops duplicate entity ids and
+issues one ``<domain>.turn_off`` per domain with the list of entity
+ids. Each caller awaits its own intent and sees the outcome of the
+batched call that carried it, so ``Target.turn_off`` and the group
+dispatch keep their error handling unchanged.
+
+:func:`async_turn_off_entities` is the multi-entity call itself, also
+used directly by groups that turn off their fallback targets without an
+aggregator. Only when the batched call raises is every entity retried
+with its own call, so one broken entity does not fail the others.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .rate_limit import TurnOffRateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+
+async def async_turn_off_entities(
+    hass: HomeAssistant, domain: str, entity_ids: list[str], blocking: bool = True
+) -> dict[str, Exception | None]:
+    """Turn ``entity_ids`` off with one ``<domain>.turn_off`` call.
+
+    Returns each entity's outcome: None on success, otherwise the
+    exception of the call that covered it. If the batched call fails,
+    the entities are retried one call each so a single bad entity only
+    fails itself. With ``blocking`` False the calls only wait until
+    Home Assistant accepted them, not until the devices answered.
+    """
+    try:
+        await hass.services.async_call(domain, "turn_off", {"entity_id": entity_ids}, blocking=blocking)
+    except Exception as exc:  # noqa: BLE001 - resolved per entity below
+        if len(entity_ids) == 1:
+            return {entity_ids[0]: exc}
+        _LOGGER.warning(
+            "Batched %s.turn_off for %d entities failed (%s), retrying one by one",
+            domain,
+            len(entity_ids),
+            exc,
+        )
+    else:
+        return dict.fromkeys(entity_ids)
+
+    async def _single(entity_id: str) -> None:
+        await hass.services.async_call(domain, "turn_off", {"entity_id": entity_id}, blocking=blocking)
+
+    results = await asyncio.gather(*(_single(entity_id) for entity_id in entity_ids), return_exceptions=True)
+    return {
+        entity_id: result if isinstance(result, Exception) else None for entity_id, result in zip(entity_ids, results)
+    }
+
+
+class _Intent:
+    """Pending turn_off of one entity, shared by every caller asking for it."""
+
+    __slots__ = ("cost", "future", "on_sent", "waiters")
+
+    def __init__(self, future: asyncio.Future[None], cost: int) -> None:
+        self.future = future
+        self.on_sent: list[Callable[[], None]] = []
+        # Callers awaiting the intent; the last one to be cancelled
+        # withdraws it.
+        self.waiters = 0
+        # Radio commands the call costs for this entity (members of a
+        # group entity), charged against the rate limiter.
+        self.cost = cost
+
+
+def _live(intents: dict[str, _Intent]) -> dict[str, _Intent]:
+    """Intents not withdrawn (or otherwise settled) yet."""
+    return {entity_id: intent for entity_id, intent in intents.items() if not intent.future.done()}
+
+
+class TurnOffAggregator:
+    """Batch turn_off intents of every group into one call per domain."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        window: float,
+        rate_limiter: TurnOffRateLimiter | None = None,
+    ) -> None:
+        self.hass = hass
+        self.window = window
+        self._rate_limiter = rate_limiter
+        # (domain, blocking) -> entity_id -> intent, in arrival order.
+        self._pending: dict[tuple[str, bool], dict[str, _Intent]] = {}
+        self._handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._intents = 0
+        self._deduplicated = 0
+        self._calls = 0
+        self._failed = 0
+        self._withdrawn = 0
+        self._max_batch = 0
+
+    async def turn_off(
+        self,
+        entity_id: str,
+        on_sent: Callable[[], None] | None = None,
+        cost: int = 1,
+        blocking: bool = True,
+    ) -> None:
+        """Turn ``entity_id`` off in the next batch; raise if that call fails.
+
+        ``on_sent`` runs right before the batched call is issued (after
+        the window and any rate-limit wait), e.g. to start latency
+        timing. ``cost`` is the number of radio commands the entity
+        stands for, e.g. the member count of a group entity. A cancelled
+        caller withdraws the intent only if nobody else awaits it, so a
+        group whose turn-off phase is aborted (presence came back) does
+        not switch the entity off after all, while another group waiting
+        on the same entity still gets its call.
+
+        Intents with ``blocking`` False (group entities, whose members
+        report back through their own state events) are sent in a
+        separate non-blocking call per domain, so their callers do not
+        wait for every member device to answer.
+        """
+        key = (entity_id.split(".", 1)[0], blocking)
+        intents = self._pending.setdefault(key, {})
+        intent = intents.get(entity_id)
+        self._intents += 1
+        if intent is None:
+            intent = intents[entity_id] = _Intent(asyncio.get_running_loop().create_future(), cost)
+            self._schedule_flush()
+        else:
+            self._deduplicated += 1
+            intent.cost = max(intent.cost, cost)
+        if on_sent is not None:
+            intent.on_sent.append(on_sent)
+        intent.waiters += 1
+        try:
+            await asyncio.shield(intent.future)
+        finally:
+            intent.waiters -= 1
+            if not intent.waiters and not intent.future.done():
+                self._withdraw(key, entity_id, intent)
+
+    def _withdraw(self, key: tuple[str, bool], entity_id: str, intent: _Intent) -> None:
+        """Drop an intent nobody awaits any more, whether flushed or not."""
+        intent.future.cancel()
+        intents = self._pending.get(key)
+        if intents is not None and intents.get(entity_id) is intent:
+            del intents[entity_id]
+            if not intents:
+                del self._pending[key]
+        self._withdrawn += 1
+
+    def _schedule_flush(self) -> None:
+        if self._handle is not None:
+            return
+        if self.window > 0:
+            self._handle = self.hass.loop.call_later(self.window, self._flush)
+        else:
+            self._handle = self.hass.loop.call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._handle = None
+        batches, self._pending = self._pending, {}
+        for (domain, blocking), intents in batches.items():
+            task = self.hass.async_create_task(self._call(domain, intents, blocking))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _call(self, domain: str, intents: dict[str, _Intent], blocking: bool = True) -> None:
+        try:
+            if self._rate_limiter is not None:
+                cost = sum(intent.cost for intent in _live(intents).values())
+                await self._rate_limiter.acquire(domain, cost)
+            # Callers may have withdrawn during the window or the
+            # rate-limit wait; only what is still wanted is sent.
+            intents = _live(intents)
+            if not intents:
+                return
+            results = await self._send(domain, intents, blocking)
+        except asyncio.CancelledError:
+            for intent in intents.values():
+                intent.future.cancel()
+            raise
+        self._resolve(intents, results)
+
+    async def _send(self, domain: str, intents: dict[str, _Intent], blocking: bool) -> dict[str, Exception | None]:
+        for intent in intents.values():
+            for on_sent in intent.on_sent:
+                on_sent()
+        entity_ids = list(intents)
+        self._calls += 1
+        self._max_batch = max(self._max_batch, len(entity_ids))
+        _LOGGER.debug("Batched %s.turn_off for %d entities: %s", domain, len(entity_ids), entity_ids)
+        return await async_turn_off_entities(self.hass, domain, entity_ids, blocking)
+
+    def _resolve(self, intents: dict[str, _Intent], results: dict[str, Exception | None]) -> None:
+        for entity_id, intent in intents.items():
+            exc = results[entity_id]
+            if exc is not None:
+                self._failed += 1
+            if intent.future.done():
+                continue
+            if exc is None:
+                intent.future.set_result(None)
+            else:
+                intent.future.set_exception(exc)
+                # Every caller may have been cancelled meanwhile; do not
+                # let an unretrieved exception warn at collection.
+                intent.future.exception()
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        return {
+            "window": self.window,
+            "intents": self._intents,
+            "deduplicated": self._deduplicated,
+            "calls": self._calls,
+            "failed": self._failed,
+            "withdrawn": self._withdrawn,
+            "max_batch": self._max_batch,
+            "pending": sum(len(intents) for intents in self._pending.values()),
+        }
+
+    def shutdown(self) -> None:
+        """Drop pending intents and cancel in-flight batched calls."""
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        for intents in self._pending.values():
+            for intent in intents.values():
+                intent.future.cancel()
+        self._pending = {}
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()